@@ -0,0 +1,185 @@
+"""理论值解析器基准测试 - 核对预分类解析、批量解析与依次尝试全部策略的结果，并比较解析速度
+
+用法:
+    python benchmark_theory_parser.py [计划目录或文件通配符 ...] [--repeat N] [--fuzz N] [--seed S]
+
+语料为各计划文件D列的理论值（不带参数时为当前目录中的计划文件）加上各种支持格式的示例，
+核对结果时另外加入按--seed随机生成的字符串（参考分布范围批量解析同样核对，语料为E列和同一批随机字符串）。
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import time
+from typing import List, Tuple
+from spc_generator.parsers import ExcelPlanReader, TheoreticalValueParser, ReferenceRangeParser
+from spc_generator.models.tolerance import Tolerance, ToleranceType
+from spc_generator.utils.file_utils import FileUtils
+
+
+# 各种支持格式的示例（含不能解析的字符串）
+SAMPLE_THEORY_STRINGS = [
+    'OK', '/', '符合',
+    '基值:30.0；下限：29.947；上限：29.98', '30.0；下限：29.947；上限：29.98', '下限：29.947；上限：29.98',
+    '2-φ3.5±0.1', '2-120°±3°', '4-M8',
+    '≤Φ0.04', 'Φ0.04', 'φ0.025', '≥φ0.1', '≤φ0.01', '＜φ0.02',
+    '≤Pt3.2', '≤Ra0.8', '≤Ry6.3', '<Rpk0.2', '≤rz10',
+    '0.025mm', '5μm', '30°', '0.075', '.5', '0.008',
+    '≤0.8', '＜0.025', '<12',
+    'Ra0.8', 'Pt3.2', 'Ry6.3', 'Rpk0.2', 'ry2.5',
+    '47.322-47.331', '57.67-57.70', 'φ20.8-φ21.0', '9.97-10.03',
+    '27.4（-0.05/-0.1）', 'φ27.4(+0.1/-0.1)',
+    'φ3.5±0.1', '3.5±0.1', '30(±0.05)', '45°±0.5°',
+    '120°±3°', 'C0.3±0.2', 'C0.5max', 'c1max', 'R1.5±0.3',
+    'min25', 'MIN 30', 'max50', 'Max8', 'M8', 'M10×1.25',
+    '无锈蚀', '不允许有毛刺、裂纹、碰伤、锈蚀', '42CrMo', 'GB/T 1804-m',
+    '1e-3', '-0.5', '12.5-', 'abc', '约30', '0.02/100',
+]
+
+# 参考分布范围示例（含不能解析的字符串）
+SAMPLE_REFERENCE_STRINGS = [
+    '52.992-52.999', '52.992 - 52.999', '9.97~10.03', '0.5–0.8', '1—2', '-0.5-0.5', '+1-+2',
+    '.5-.8', '5.-6', '0-0.005', '10-10', '10-9', '1.2.3-4', '１-２', '1e-3-2', '30', '', '  ',
+]
+
+# 随机字符串的组成部分（数字写法、符号、单位和全角字符）
+FUZZ_ATOMS = [
+    '0', '1', '2', '5', '9', '12', '3.5', '0.0', '.', '.', '-', '+', '±', 'φ', 'Φ', '(', '（', '）', ')',
+    '/', '°', '≤', '<', '＜', '~', '–', '—', ' ', 'mm', 'μm', 'C', 'R', 'max', '１', '\n',
+]
+# 随机填入格式模板的数值（含多个小数点、全角数字等不是普通写法的数值）
+FUZZ_NUMBERS = ['0', '0.0', '1', '12.5', '.5', '5.', '1.2.3', '.', '00.50', '47.322', '0.001', '３']
+FUZZ_TEMPLATES = [
+    '{a}±{b}', 'φ{a}±{b}', '{a}°±{b}°', '{a}(±{b})', '{a}({s}{b}/{t}{c})', 'φ{a}（{s}{b}/{t}{c}）',
+    '{a}-{b}', 'φ{a}-φ{b}', '{a} - {b}', '≤{a}', '<φ{a}', '＜ {a}', '{a}mm', '{a}μm', '{a}度',
+    '{a}~{b}', '{s}{a}—{t}{b}', '{a}', '2-{a}±{b}',
+]
+
+
+def load_corpus(patterns: List[str]) -> Tuple[List[str], List[str]]:
+    """
+    读取计划文件中的理论值和参考分布范围，加上格式示例
+
+    Args:
+        patterns: 计划目录或文件通配符
+
+    Returns:
+        (理论值字符串列表, 参考范围字符串列表)（计划中的值按行保留重复）
+    """
+    reader = ExcelPlanReader()
+    corpus = []
+    references = []
+    for plan_file in FileUtils.find_plan_files(patterns):
+        tasks, _ = reader.read_plan_sheets(plan_file)
+        corpus.extend(task.theory for task in tasks if task.theory)
+        references.extend(task.reference_range for task in tasks if task.reference_range)
+        print(f"{plan_file}: {len(tasks)} 个任务")
+    corpus.extend(SAMPLE_THEORY_STRINGS)
+    references.extend(SAMPLE_REFERENCE_STRINGS)
+    return corpus, references
+
+
+def fuzz_corpus(count: int, seed: int) -> List[str]:
+    """
+    随机生成核对用的字符串（按格式模板填入随机数值，以及随机拼接的组成部分）
+
+    Args:
+        count: 随机拼接的字符串数
+        seed: 随机数种子（相同种子生成相同的语料）
+
+    Returns:
+        字符串列表
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for template in FUZZ_TEMPLATES:
+        for a in FUZZ_NUMBERS:
+            for b in FUZZ_NUMBERS:
+                corpus.append(template.format(
+                    a=a, b=b, c=rng.choice(FUZZ_NUMBERS), s=rng.choice(['', '+', '-']), t=rng.choice(['', '+', '-'])
+                ))
+    for _ in range(count):
+        corpus.append(''.join(rng.choice(FUZZ_ATOMS) for _ in range(rng.randint(1, 9))))
+    return corpus
+
+
+def parse_with_all_strategies(parser: TheoreticalValueParser, theory_str: str) -> Tolerance:
+    """不做预分类，按优先级依次尝试全部策略（用于核对结果和比较速度）"""
+    theory_str = str(theory_str).strip()
+    for strategy, _, _ in parser._strategies:
+        result = strategy(theory_str)
+        if result is not None:
+            return result
+    return Tolerance(1.0, 0.0, ToleranceType.UPPER_ONLY, theory_str)
+
+
+def measure(parse, corpus: List[str], repeat: int) -> float:
+    """解析语料repeat遍，返回每秒解析的字符串数"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for theory_str in corpus:
+                parse(theory_str)
+        elapsed = time.perf_counter() - start
+    return len(corpus) * repeat / elapsed
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="理论值解析器基准测试")
+    arg_parser.add_argument('plans', nargs='*', default=['.'], help="计划目录或文件通配符（默认当前目录）")
+    arg_parser.add_argument('--repeat', type=int, default=200, help="语料解析遍数（默认200）")
+    arg_parser.add_argument('--fuzz', type=int, default=30000, help="核对结果时加入的随机字符串数（默认30000）")
+    arg_parser.add_argument('--seed', type=int, default=0, help="随机字符串的种子（默认0）")
+    args = arg_parser.parse_args()
+
+    corpus, references = load_corpus(args.plans)
+    unique = sorted(set(corpus))
+    print(f"语料: {len(corpus)} 个理论值，{len(unique)} 种；{len(references)} 个参考分布范围")
+    fuzz = fuzz_corpus(args.fuzz, args.seed)
+
+    # 核对结果：预分类解析、批量解析与依次尝试全部策略相同
+    parser = TheoreticalValueParser()
+    mismatches = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for theory_str in sorted({theory_str for theory_str in unique + fuzz if theory_str.strip()}):
+            expected = parse_with_all_strategies(parser, theory_str)
+            actual = parser.parse(theory_str, use_cache=False)
+            if actual != expected:
+                mismatches.append((theory_str, expected, actual))
+        for theory_str, actual in TheoreticalValueParser().parse_all(corpus + fuzz).items():
+            expected = parse_with_all_strategies(parser, theory_str)
+            if actual != expected:
+                mismatches.append((theory_str, expected, actual))
+    for theory_str, expected, actual in mismatches:
+        print(f"结果不同: {theory_str!r}\n  依次尝试: {expected}\n  预分类/批量: {actual}")
+
+    # 核对结果：参考分布范围批量解析与逐个解析相同
+    ref_parser = ReferenceRangeParser()
+    ref_mismatches = 0
+    for range_str, actual in ReferenceRangeParser().parse_all(references + fuzz).items():
+        expected = ref_parser.parse(range_str, use_cache=False)
+        if actual != expected:
+            ref_mismatches += 1
+            print(f"参考范围结果不同: {range_str!r}\n  逐个解析: {expected}\n  批量解析: {actual}")
+    print(f"结果核对（含{len(fuzz)}个随机字符串，种子{args.seed}）: "
+          f"理论值 {len(mismatches)} 处不同，参考分布范围 {ref_mismatches} 处不同")
+
+    # 比较速度（不使用缓存）
+    sequential_rate = measure(lambda s: parse_with_all_strategies(parser, s), corpus, args.repeat)
+    dispatch_rate = measure(lambda s: parser.parse(s, use_cache=False), corpus, args.repeat)
+    cached_rate = measure(parser.parse, corpus, args.repeat)
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            TheoreticalValueParser().parse_all(corpus)
+        bulk_rate = len(corpus) * args.repeat / (time.perf_counter() - start)
+    print(f"依次尝试全部策略: {sequential_rate:12,.0f} 个/秒")
+    print(f"预分类解析:       {dispatch_rate:12,.0f} 个/秒 ({dispatch_rate / sequential_rate:.1f}x)")
+    print(f"预分类+LRU缓存:   {cached_rate:12,.0f} 个/秒")
+    print(f"批量解析整列:     {bulk_rate:12,.0f} 个/秒（每遍使用新的解析器，不使用缓存）")
+    return 1 if mismatches or ref_mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,7 +1,10 @@
 """SPC年度计划一键生成工具 - 运行入口"""
 
 # 这个文件作为入口点，方便用户运行
+import multiprocessing
 from spc_generator.main import main
 
 if __name__ == "__main__":
+    # 打包为exe时生成流水线的子进程需要
+    multiprocessing.freeze_support()
     main()
@@ -3,5 +3,6 @@
 from .control_limits_calculator import ControlLimitsCalculator
 from .cpk_calculator import CpkCalculator
 from .eight_rules_checker import EightRulesChecker
+from .incremental_candidate import IncrementalCandidate
 
-__all__ = ['ControlLimitsCalculator', 'CpkCalculator', 'EightRulesChecker']
+__all__ = ['ControlLimitsCalculator', 'CpkCalculator', 'EightRulesChecker', 'IncrementalCandidate']
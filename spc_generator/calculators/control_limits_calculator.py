@@ -45,12 +45,7 @@ class ControlLimitsCalculator:
             cl = 0.0
         
         # 2. 计算公差范围
-        if tolerance.usl is not None and tolerance.lsl is not None:
-            tolerance_range = tolerance.usl - tolerance.lsl
-        elif tolerance.usl is not None:
-            tolerance_range = tolerance.usl
-        else:
-            tolerance_range = cl - (tolerance.lsl or 0.0)
+        tolerance_range = self.calculate_tolerance_range(tolerance, cl)
         
         # 3. 基于目标CPK计算标准差
         sigma = tolerance_range / (6 * target_cpk) if target_cpk > 0 else 0.0
@@ -83,6 +78,24 @@ class ControlLimitsCalculator:
             r_bar=r_bar
         )
     
+    def calculate_tolerance_range(self, tolerance: Tolerance, cl: float) -> float:
+        """
+        计算用于推算标准差的公差范围
+        
+        Args:
+            tolerance: 公差信息
+            cl: 中心线
+            
+        Returns:
+            公差范围（单边上公差取USL，单边下公差取CL-LSL）
+        """
+        if tolerance.usl is not None and tolerance.lsl is not None:
+            return tolerance.usl - tolerance.lsl
+        elif tolerance.usl is not None:
+            return tolerance.usl
+        else:
+            return cl - (tolerance.lsl or 0.0)
+    
     def validate_control_limits(self, limits: ControlLimits) -> bool:
         """验证控制限是否合理"""
         if limits.ucl <= limits.lcl:
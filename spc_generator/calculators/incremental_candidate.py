@@ -0,0 +1,360 @@
+"""可增量更新的候选数据 - 局部修改后增量维护CPK和判异准则"""
+
+from typing import List, Optional
+from ..config.constants import D2_CONSTANT
+from ..models.tolerance import Tolerance
+from ..models.control_limits import ControlLimits
+from ..models.spc_data import SPCData
+from ..processors.resolution_processor import ResolutionProcessor
+
+
+class IncrementalCandidate:
+    """
+    可增量更新的候选数据
+
+    维护累计和、各子组极差、Rbar累加器、参考范围内点数和各判异准则的逐窗口状态。
+    修改单个子组后，CPK在O(1)内更新，判异准则只重算覆盖该子组的窗口（O(窗口长度)）。
+    计算口径与CpkCalculator.calculate_cpk_excel_method、
+    StandardGenerator._recalculate_x_r_values和EightRulesChecker.check_all_rules一致。
+    """
+
+    SUBGROUP_SIZE = 5
+    SUBGROUP_COUNT = 25
+
+    # 判异准则窗口定义: 准则 -> (窗口长度, 窗口起点数量)
+    # 准则2/3基于相邻点的差，窗口长度按差的个数计
+    _WINDOWS = {
+        'rule2': (5, 20),   # 连续6点 -> 5个差
+        'rule3': (13, 12),  # 连续14点 -> 13个差
+        'rule4': (15, 11),
+        'rule5': (8, 18),
+        'rule6': (9, 17),
+        'rule7': (3, 23),
+        'rule8': (5, 21),
+    }
+
+    def __init__(
+        self,
+        measurement_data: List[List[float]],
+        tolerance: Tolerance,
+        control_limits: ControlLimits,
+        ref_lower: Optional[float] = None,
+        ref_upper: Optional[float] = None
+    ):
+        """
+        Args:
+            measurement_data: 舍入后的测量数据矩阵 (5x25)
+            tolerance: 公差信息
+            control_limits: 控制限
+            ref_lower: 参考范围下限（可选）
+            ref_upper: 参考范围上限（可选）
+        """
+        self.tolerance = tolerance
+        self.control_limits = control_limits
+        self.ref_lower = ref_lower
+        self.ref_upper = ref_upper
+        self.resolution_processor = ResolutionProcessor()
+
+        # 按子组存储数据: subgroups[col] = [5个值]
+        self.subgroups = [
+            [measurement_data[row][col] for row in range(self.SUBGROUP_SIZE)]
+            for col in range(self.SUBGROUP_COUNT)
+        ]
+        self.refresh()
+
+    def refresh(self):
+        """全量重算所有累加器（用于初始化和消除浮点累积误差）"""
+        n = self.SUBGROUP_COUNT
+        self.subgroup_sums = [sum(sg) for sg in self.subgroups]
+        self.total_sum = sum(self.subgroup_sums)
+        self.x_values = [s / self.SUBGROUP_SIZE for s in self.subgroup_sums]
+        self.r_values = [max(sg) - min(sg) for sg in self.subgroups]
+        self.range_sum = sum(self.r_values)
+        self.in_range_counts = [self._count_in_range(sg) for sg in self.subgroups]
+        self.raw_in_range_count = sum(self.in_range_counts)
+        self.xbar_in_range_flags = [int(self._in_reference(x)) for x in self.x_values]
+        self.xbar_in_range_count = sum(self.xbar_in_range_flags)
+
+        # 点级判异状态
+        self.point_violations = [self._point_violation_count(i) for i in range(n)]
+        self._predicates = {}
+        self._build_predicates()
+
+        # 窗口级判异状态
+        self.window_violations = {}
+        for rule, (length, starts) in self._WINDOWS.items():
+            self.window_violations[rule] = [0] * starts
+            self._update_windows(rule, 0, starts - 1)
+
+        self.violation_count = sum(self.point_violations) + sum(
+            sum(counts) for counts in self.window_violations.values()
+        )
+
+    @property
+    def average(self) -> float:
+        """总平均值"""
+        return self.total_sum / (self.SUBGROUP_SIZE * self.SUBGROUP_COUNT)
+
+    @property
+    def rbar(self) -> float:
+        """平均极差"""
+        return self.range_sum / self.SUBGROUP_COUNT
+
+    @property
+    def sigma_within(self) -> float:
+        """组内标准差 Rbar/d2"""
+        return self.rbar / D2_CONSTANT if D2_CONSTANT > 0 else 0
+
+    @property
+    def cpk(self) -> float:
+        """CPK（组内标准差方法）"""
+        sigma_within = self.sigma_within
+        if sigma_within == 0 or sigma_within < 1e-10:
+            return 0.0
+
+        avg = self.average
+        usl, lsl = self.tolerance.usl, self.tolerance.lsl
+        if usl is not None and lsl is not None:
+            return min(abs(usl - avg), abs(avg - lsl)) / (3 * sigma_within)
+        elif usl is not None:
+            return abs(usl - avg) / (3 * sigma_within)
+        elif lsl is not None:
+            return abs(avg - lsl) / (3 * sigma_within)
+        return 0.0
+
+    def get_subgroup(self, col: int) -> List[float]:
+        """获取子组数据副本"""
+        return list(self.subgroups[col])
+
+    def set_subgroup(self, col: int, values: List[float]) -> List[float]:
+        """
+        替换一个子组的数据
+
+        Args:
+            col: 子组索引 (0-24)
+            values: 新的5个数据
+
+        Returns:
+            被替换的原数据（可用于撤销）
+        """
+        old_values = self.subgroups[col]
+        new_values = list(values)
+        self.subgroups[col] = new_values
+
+        # CPK相关累加器: O(1)
+        new_sum = sum(new_values)
+        self.total_sum += new_sum - self.subgroup_sums[col]
+        self.subgroup_sums[col] = new_sum
+
+        new_range = max(new_values) - min(new_values)
+        self.range_sum += new_range - self.r_values[col]
+        self.r_values[col] = new_range
+
+        new_in_range = self._count_in_range(new_values)
+        self.raw_in_range_count += new_in_range - self.in_range_counts[col]
+        self.in_range_counts[col] = new_in_range
+
+        x_value = new_sum / self.SUBGROUP_SIZE
+        self.x_values[col] = x_value
+        new_flag = int(self._in_reference(x_value))
+        self.xbar_in_range_count += new_flag - self.xbar_in_range_flags[col]
+        self.xbar_in_range_flags[col] = new_flag
+
+        # 判异准则: 只重算覆盖该点的窗口
+        self._update_rules_at(col)
+        return old_values
+
+    def set_value(self, row: int, col: int, value: float) -> float:
+        """
+        修改单个数据点
+
+        Returns:
+            原数据值
+        """
+        values = list(self.subgroups[col])
+        old_value = values[row]
+        values[row] = value
+        self.set_subgroup(col, values)
+        return old_value
+
+    def swap_subgroups(self, col_a: int, col_b: int):
+        """交换两个子组"""
+        values_a = self.subgroups[col_a]
+        values_b = self.subgroups[col_b]
+        self.set_subgroup(col_a, values_b)
+        self.set_subgroup(col_b, values_a)
+
+    def to_measurement_data(self) -> List[List[float]]:
+        """转换为5x25的测量数据矩阵"""
+        return [
+            [self.subgroups[col][row] for col in range(self.SUBGROUP_COUNT)]
+            for row in range(self.SUBGROUP_SIZE)
+        ]
+
+    def to_spc_data(self, measurement_data: Optional[List[List[float]]] = None) -> SPCData:
+        """
+        转换为SPCData对象
+
+        Args:
+            measurement_data: 舍入前的原始数据，默认与舍入后数据相同
+        """
+        rounded_measurement_data = self.to_measurement_data()
+        return SPCData(
+            measurement_data=measurement_data or rounded_measurement_data,
+            rounded_measurement_data=rounded_measurement_data,
+            x_values=list(self.x_values),
+            r_values=list(self.r_values),
+            actual_cpk=self.cpk,
+            rbar=self.rbar,
+            sigma_within=self.sigma_within,
+            max_decimal_places=self.resolution_processor.calculate_max_decimal_places(
+                rounded_measurement_data
+            ),
+            control_limits=self.control_limits
+        )
+
+    def _in_reference(self, value: float) -> bool:
+        if self.ref_lower is None or self.ref_upper is None:
+            return True
+        return self.ref_lower <= value <= self.ref_upper
+
+    def _count_in_range(self, values: List[float]) -> int:
+        if self.ref_lower is None or self.ref_upper is None:
+            return len(values)
+        return sum(1 for v in values if v is not None and self.ref_lower <= v <= self.ref_upper)
+
+    def _point_violation_count(self, i: int) -> int:
+        """准则1和R图的点级违规数"""
+        limits = self.control_limits
+        x = self.x_values[i]
+        r = self.r_values[i]
+        count = int(x > limits.ucl or x < limits.lcl)
+        count += int(r > limits.uclr)
+        count += int(r < limits.lclr)
+        count += int(r == 0)
+        return count
+
+    def _point_predicates(self, i: int) -> dict:
+        """单点谓词"""
+        limits = self.control_limits
+        x = self.x_values[i]
+        in_c = limits.lcl1 <= x <= limits.ucl1
+        return {
+            'in_c': int(in_c),
+            'out_c': int(not in_c),
+            'gt_cl': int(x > limits.cl),
+            'lt_cl': int(x < limits.cl),
+            'gt_b': int(x > limits.ucl2),
+            'lt_b': int(x < limits.lcl2),
+            'gt_c': int(x > limits.ucl1),
+            'lt_c': int(x < limits.lcl1),
+        }
+
+    def _pair_predicates(self, j: int) -> dict:
+        """相邻点 j, j+1 的谓词"""
+        diff = self.x_values[j] - self.x_values[j + 1]
+        return {
+            'inc': int(self.x_values[j] < self.x_values[j + 1]),
+            'dec': int(self.x_values[j] > self.x_values[j + 1]),
+            # 准则3: 窗口内第k个差，k为偶数时要求<0，k为奇数时要求>0
+            'alt_even': int(diff < 0) if j % 2 == 0 else int(diff > 0),
+            'alt_odd': int(diff < 0) if j % 2 == 1 else int(diff > 0),
+        }
+
+    def _build_predicates(self):
+        n = self.SUBGROUP_COUNT
+        for name in ('in_c', 'out_c', 'gt_cl', 'lt_cl', 'gt_b', 'lt_b', 'gt_c', 'lt_c'):
+            self._predicates[name] = [0] * n
+        for name in ('inc', 'dec', 'alt_even', 'alt_odd'):
+            self._predicates[name] = [0] * (n - 1)
+        for i in range(n):
+            for name, value in self._point_predicates(i).items():
+                self._predicates[name][i] = value
+        for j in range(n - 1):
+            for name, value in self._pair_predicates(j).items():
+                self._predicates[name][j] = value
+
+    def _update_rules_at(self, i: int):
+        """单点变化后更新判异状态"""
+        n = self.SUBGROUP_COUNT
+
+        new_point = self._point_violation_count(i)
+        self.violation_count += new_point - self.point_violations[i]
+        self.point_violations[i] = new_point
+
+        for name, value in self._point_predicates(i).items():
+            self._predicates[name][i] = value
+        for j in (i - 1, i):
+            if 0 <= j < n - 1:
+                for name, value in self._pair_predicates(j).items():
+                    self._predicates[name][j] = value
+
+        for rule, (length, starts) in self._WINDOWS.items():
+            if rule in ('rule2', 'rule3'):
+                # 受影响的差为 i-1 和 i
+                first, last = i - 1, i
+            else:
+                first, last = i, i
+            s_lo = max(0, first - length + 1)
+            s_hi = min(starts - 1, last)
+            if s_lo <= s_hi:
+                self.violation_count += self._update_windows(rule, s_lo, s_hi)
+
+    def _update_windows(self, rule: str, s_lo: int, s_hi: int) -> int:
+        """
+        重算起点在[s_lo, s_hi]内的窗口，用滑动计数保证O(窗口长度)
+
+        Returns:
+            违规数的变化量
+        """
+        length = self._WINDOWS[rule][0]
+        counts = self.window_violations[rule]
+        p = self._predicates
+
+        if rule == 'rule2':
+            inc = self._sliding_sums(p['inc'], length, s_lo, s_hi)
+            dec = self._sliding_sums(p['dec'], length, s_lo, s_hi)
+            new = [int(a == length) + int(b == length) for a, b in zip(inc, dec)]
+        elif rule == 'rule3':
+            even = self._sliding_sums(p['alt_even'], length, s_lo, s_hi)
+            odd = self._sliding_sums(p['alt_odd'], length, s_lo, s_hi)
+            new = [
+                int((even if s % 2 == 0 else odd)[s - s_lo] == length)
+                for s in range(s_lo, s_hi + 1)
+            ]
+        elif rule == 'rule4':
+            in_c = self._sliding_sums(p['in_c'], length, s_lo, s_hi)
+            new = [int(c == length) for c in in_c]
+        elif rule == 'rule5':
+            out_c = self._sliding_sums(p['out_c'], length, s_lo, s_hi)
+            above = self._sliding_sums(p['gt_cl'], length, s_lo, s_hi)
+            new = [int(o == length and 0 < a < length) for o, a in zip(out_c, above)]
+        elif rule == 'rule6':
+            above = self._sliding_sums(p['gt_cl'], length, s_lo, s_hi)
+            below = self._sliding_sums(p['lt_cl'], length, s_lo, s_hi)
+            new = [int(a == length) + int(b == length) for a, b in zip(above, below)]
+        elif rule == 'rule7':
+            above = self._sliding_sums(p['gt_b'], length, s_lo, s_hi)
+            below = self._sliding_sums(p['lt_b'], length, s_lo, s_hi)
+            new = [int(a >= 2) + int(b >= 2) for a, b in zip(above, below)]
+        else:  # rule8
+            above = self._sliding_sums(p['gt_c'], length, s_lo, s_hi)
+            below = self._sliding_sums(p['lt_c'], length, s_lo, s_hi)
+            new = [int(a >= 4) + int(b >= 4) for a, b in zip(above, below)]
+
+        delta = 0
+        for offset, value in enumerate(new):
+            s = s_lo + offset
+            delta += value - counts[s]
+            counts[s] = value
+        return delta
+
+    @staticmethod
+    def _sliding_sums(values: List[int], length: int, s_lo: int, s_hi: int) -> List[int]:
+        """计算起点在[s_lo, s_hi]内、长度为length的窗口和"""
+        current = sum(values[s_lo:s_lo + length])
+        sums = [current]
+        for s in range(s_lo + 1, s_hi + 1):
+            current += values[s + length - 1] - values[s - 1]
+            sums.append(current)
+        return sums
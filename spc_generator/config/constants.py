@@ -67,3 +67,72 @@ CELL_ADDRESSES = {
     'auditor': 'J51',
     'approver': 'Q51',
 }
+
+# 生成尝试次数预算
+REFERENCE_MAX_ATTEMPTS = 20000      # 参考范围模式尝试次数上限
+STANDARD_MAX_ATTEMPTS = 4000        # 标准模式尝试次数上限
+MIN_GENERATION_ATTEMPTS = 500       # 尝试次数下限
+GENERATION_SUCCESS_CONFIDENCE = 0.99  # 按接受概率推算预算时的目标成功率
+REDIRECT_CONFIDENCE = 0.95           # 参考范围模式改用标准模式时，候选概率置信上限的置信水平
+
+# 生成策略链（同一任务共用一个尝试次数预算）
+REFERENCE_STRATEGY_ORDER = ['reference', 'standard']  # 参考范围模式的策略顺序
+STANDARD_STRATEGY_ORDER = ['standard']                # 标准模式的策略顺序
+ANNEALING_STRATEGY_ORDER = ['annealing', 'standard']  # 参考范围模式使用模拟退火引擎时的策略顺序
+FALLBACK_STRATEGIES = ['standard']                    # 后备策略：前面的策略已有候选数据时不再运行
+GENERATION_STRATEGY_SHARES = {                        # 各策略可使用的剩余预算比例
+    'reference': 0.75,
+    'annealing': 0.75,
+    'standard': 1.0,
+}
+
+# 模拟退火搜索引擎
+ANNEALING_MOVES_PER_ATTEMPT = 20      # 一次尝试折算的局部调整步数（用于共用尝试次数预算）
+ANNEALING_MOVES_PER_RESTART = 20000   # 每轮退火的最大步数，未成功则重新生成起点
+ANNEALING_START_TEMPERATURE = 5.0     # 初始温度
+ANNEALING_END_TEMPERATURE = 0.05      # 每轮结束时的温度
+
+# 参考范围模式搜索引擎: 'auto'(难度为"高"时使用模拟退火) / 'sampling'(随机抽样) / 'annealing'(模拟退火)
+SEARCH_ENGINE_MAP = {'A': 'auto', 'S': 'sampling', 'T': 'annealing'}
+
+# 读取计划文件时，连续空行达到该数量即认为数据已经结束（格式设置到很远的空行不再读取）
+PLAN_MAX_BLANK_ROWS = 1000
+
+# 理论值解析结果LRU缓存的最大条数
+THEORY_PARSE_CACHE_SIZE = 4096
+
+# 计划解析缓存: 解析结果（任务、审批人、公差）以pickle保存在计划文件旁，按文件内容哈希和解析器版本失效
+USE_PLAN_CACHE = True
+PLAN_CACHE_SUFFIX = '.spccache'
+PLAN_PARSER_VERSION = 2  # 修改计划读取、理论值解析逻辑或Task/Tolerance字段时加1
+
+# 结果日志和计划文件检查点: 每个任务完成时结果追加到 {计划文件名}_结果日志.jsonl，
+# 选择更新计划文件时由后台线程按批写入 {计划文件名}_已更新.xlsx
+PLAN_JOURNAL_SUFFIX = '_结果日志.jsonl'
+PLAN_CHECKPOINT_BATCH_SIZE = 20   # 累计多少条结果保存一次检查点
+PLAN_CHECKPOINT_INTERVAL = 120    # 未保存的结果最多等待的秒数
+
+# 重新运行清单: 记录各计划行（B..H列、U列、月份标记）的哈希和生成的文件，
+# 再次运行时只重新生成修改过的行或输出文件已不存在的任务（每个任务一个文件时有效）
+USE_RERUN_MANIFEST = True
+RERUN_MANIFEST_SUFFIX = '.spcmanifest.json'
+RERUN_MANIFEST_SAVE_INTERVAL = 5  # 保存清单的最短间隔（秒），运行结束时保存全部记录
+
+# 输出文件写入方式: 'xml'(直接修改模板zip中的工作表和图表XML) / 'xlsxwriter'(按模板版式重新生成工作表和原生图表)
+# / 'openpyxl'(加载模板对象模型后保存)
+OUTPUT_WRITER = 'xml'
+OUTPUT_WRITER_MAP = {'X': 'xml', 'W': 'xlsxwriter', 'O': 'openpyxl'}
+
+# 输出文件组织方式: 'files'(每个任务一个文件，同月多个文件时移入月份文件夹)
+# / 'monthly'(每个月份一个工作簿，每个任务一个工作表，按模板版式由xlsxwriter生成)
+OUTPUT_MODE = 'files'
+OUTPUT_MODE_MAP = {'F': 'files', 'M': 'monthly'}
+
+# 生成流水线: 准备(主线程) → 数据生成(进程池) → 渲染保存(线程池) → 结果汇总，阶段之间为有界队列
+USE_PIPELINE = True
+PIPELINE_GENERATE_WORKERS = None  # 数据生成进程数，None为CPU核数
+PIPELINE_RENDER_THREADS = 2       # 渲染保存线程数
+PIPELINE_QUEUE_SIZE = 8           # 阶段之间队列的容量（限制同时在内存中的任务数）
+
+# 接受概率表（离线标定，位于config目录）
+ACCEPTANCE_SURFACE_FILE = 'acceptance_surface.json'
@@ -1,8 +1,25 @@
 """Excel操作模块"""
 
 from .template_handler import TemplateHandler
+from .template_cache import TemplateCache
 from .formula_restorer import FormulaRestorer
 from .chart_adjuster import ChartAdjuster
 from .worksheet_writer import WorksheetWriter
+from .xml_cell_patcher import XmlCellPatcher, CellMap
+from .formula_evaluator import FormulaEvaluator, FormulaError
+from .layout_extractor import LayoutExtractor
 
-__all__ = ['TemplateHandler', 'FormulaRestorer', 'ChartAdjuster', 'WorksheetWriter']
+__all__ = ['TemplateHandler', 'TemplateCache', 'FormulaRestorer', 'ChartAdjuster', 'WorksheetWriter',
+           'XmlCellPatcher', 'CellMap', 'FormulaEvaluator', 'FormulaError', 'LayoutExtractor', 'XlsxWriterBackend',
+           'MonthlyWorkbookWriter']
+
+
+def __getattr__(name):
+    """xlsxwriter为可选依赖：只在使用xlsxwriter写入方式或月度工作簿时导入"""
+    if name == 'XlsxWriterBackend':
+        from .xlsxwriter_backend import XlsxWriterBackend
+        return XlsxWriterBackend
+    if name == 'MonthlyWorkbookWriter':
+        from .monthly_workbook_writer import MonthlyWorkbookWriter
+        return MonthlyWorkbookWriter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
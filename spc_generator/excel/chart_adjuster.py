@@ -1,11 +1,62 @@
 """图表调整器"""
 
+from typing import Dict, Tuple
 from ..models.control_limits import ControlLimits
 
 
 class ChartAdjuster:
     """图表调整器"""
     
+    def calculate_axis_ranges(self, control_limits: ControlLimits) -> Dict[str, Tuple[float, float]]:
+        """
+        计算Xbar图和R图的纵坐标轴范围
+        
+        Args:
+            control_limits: 控制限对象
+            
+        Returns:
+            {'xbar': (最小值, 最大值), 'r': (最小值, 最大值)}，控制限无效的图不包含在内
+        """
+        ranges = {}
+        
+        # Xbar图: 控制限上下各留一个sigma
+        sigma = control_limits.sigma
+        ucl = control_limits.ucl
+        lcl = control_limits.lcl
+        
+        if sigma != 0 and ucl != 0 and lcl != 0:
+            min_val = lcl - sigma
+            max_val = ucl + sigma
+            
+            if min_val >= max_val:
+                min_val = lcl * 0.9
+                max_val = ucl * 1.1
+            
+            ranges['xbar'] = (min_val, max_val)
+        
+        # R图: 控制范围占坐标轴的80%（子组大小不超过6时D3=0，LCLR为0，坐标轴从0开始）
+        uclr = control_limits.uclr
+        lclr = control_limits.lclr
+        
+        if uclr > 0:
+            control_range = uclr - lclr
+            total_range = control_range / 0.8
+            extra_space = total_range - control_range
+            
+            min_val = lclr - extra_space / 2
+            max_val = uclr + extra_space / 2
+            
+            if min_val < 0:
+                min_val = 0
+            
+            if min_val >= max_val:
+                min_val = 0
+                max_val = uclr * 1.2
+            
+            ranges['r'] = (min_val, max_val)
+        
+        return ranges
+    
     def adjust_chart_axes(self, worksheet, control_limits: ControlLimits):
         """
         调整图表纵坐标轴范围以适应控制限
@@ -34,48 +85,13 @@ class ChartAdjuster:
                     if hasattr(drawing, '__class__') and 'Chart' in str(drawing.__class__):
                         charts.append(drawing)
             
-            # 调整图表坐标轴
-            for i, chart in enumerate(charts):
+            ranges = self.calculate_axis_ranges(control_limits)
+            
+            # 调整图表坐标轴（第一个为Xbar图，第二个为R图）
+            for chart, role in zip(charts, ('xbar', 'r')):
                 try:
-                    if i == 0:  # Xbar图
-                        sigma = control_limits.sigma
-                        ucl = control_limits.ucl
-                        lcl = control_limits.lcl
-                        
-                        if sigma != 0 and ucl != 0 and lcl != 0:
-                            min_val = lcl - sigma
-                            max_val = ucl + sigma
-                            
-                            if min_val >= max_val:
-                                min_val = lcl * 0.9
-                                max_val = ucl * 1.1
-                            
-                            if hasattr(chart, 'y_axis') and chart.y_axis:
-                                chart.y_axis.scaling.min = min_val
-                                chart.y_axis.scaling.max = max_val
-                    
-                    elif i == 1:  # R图
-                        uclr = control_limits.uclr
-                        lclr = control_limits.lclr
-                        
-                        if uclr != 0 and lclr != 0:
-                            control_range = uclr - lclr
-                            total_range = control_range / 0.8
-                            extra_space = total_range - control_range
-                            
-                            min_val = lclr - extra_space / 2
-                            max_val = uclr + extra_space / 2
-                            
-                            if min_val < 0:
-                                min_val = 0
-                            
-                            if min_val >= max_val:
-                                min_val = 0
-                                max_val = uclr * 1.2
-                            
-                            if hasattr(chart, 'y_axis') and chart.y_axis:
-                                chart.y_axis.scaling.min = min_val
-                                chart.y_axis.scaling.max = max_val
+                    if role in ranges and hasattr(chart, 'y_axis') and chart.y_axis:
+                        chart.y_axis.scaling.min, chart.y_axis.scaling.max = ranges[role]
                 
                 except Exception:
                     pass
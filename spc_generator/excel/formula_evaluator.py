@@ -0,0 +1,443 @@
+"""公式计算器 - 计算模板中使用的公式，用于写入公式缓存值"""
+
+import math
+import re
+from numbers import Number
+from typing import Callable, Dict, List, Optional
+from openpyxl.utils import get_column_letter, column_index_from_string
+
+
+class FormulaError(Exception):
+    """公式错误值（如 #DIV/0!），作为计算结果时按Excel错误值写入"""
+
+    def __init__(self, code: str):
+        super().__init__(code)
+        self.code = code
+
+
+class _Unsupported(Exception):
+    """公式中含有不支持的函数或语法"""
+
+
+# 单元格取值函数: 地址 -> 值
+Getter = Callable[[str], object]
+# 编译后的公式: 取值函数 -> 结果（区域参数返回值列表）
+Compiled = Callable[[Getter], object]
+
+
+class FormulaEvaluator:
+    """
+    公式计算器
+
+    支持模板中用到的公式：四则运算、乘方、比较运算、AVERAGE、MAX、MIN、ABS、STDEV.P 和 IF。
+    公式按文本编译为闭包并缓存，计算时按引用关系递归求值。
+    含不支持内容的公式（以及引用了它的公式）不计算，由Excel打开时重新计算。
+    """
+
+    TOKEN_PATTERN = re.compile(
+        r'\s*(?:'
+        r'(?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)|'
+        r'(?P<string>"(?:[^"]|"")*")|'
+        r'(?P<range>\$?[A-Z]{1,3}\$?\d+:\$?[A-Z]{1,3}\$?\d+)|'
+        r'(?P<func>[A-Za-z_][A-Za-z0-9_.]*)\s*\(|'
+        r'(?P<cell>\$?[A-Z]{1,3}\$?\d+)|'
+        r'(?P<op><>|>=|<=|[-+*/^&=<>(),])'
+        r')'
+    )
+
+    COMPARISONS = {
+        '=': lambda a, b: a == b,
+        '<>': lambda a, b: a != b,
+        '<': lambda a, b: a < b,
+        '>': lambda a, b: a > b,
+        '<=': lambda a, b: a <= b,
+        '>=': lambda a, b: a >= b,
+    }
+
+    def __init__(self):
+        self._compiled: Dict[str, Optional[Compiled]] = {}
+
+    def compile(self, formula: str) -> Optional[Compiled]:
+        """
+        编译公式（结果按公式文本缓存）
+
+        Args:
+            formula: 公式文本（可带或不带开头的"="）
+
+        Returns:
+            编译后的公式，不支持时返回None
+        """
+        formula = formula[1:] if formula.startswith('=') else formula
+        if formula not in self._compiled:
+            try:
+                self._compiled[formula] = _Parser(self, formula).parse()
+            except _Unsupported:
+                self._compiled[formula] = None
+        return self._compiled[formula]
+
+    def evaluate(
+        self,
+        formulas: Dict[str, str],
+        values: Dict[str, object]
+    ) -> Dict[str, object]:
+        """
+        计算一组公式
+
+        Args:
+            formulas: 单元格地址 -> 公式文本
+            values: 单元格地址 -> 常量值（未列出的单元格视为空）
+
+        Returns:
+            单元格地址 -> 计算结果（数值、文本、布尔值或FormulaError），无法计算的公式不包含在内
+        """
+        results: Dict[str, object] = {}
+        unsupported = set()
+        pending = set()
+
+        def get(address: str):
+            if address in results:
+                return results[address]
+            if address not in formulas:
+                return values.get(address)
+            if address in unsupported:
+                raise _Unsupported(address)
+            if address in pending:
+                # 循环引用按0处理
+                return 0.0
+
+            compiled = self.compile(formulas[address])
+            if compiled is None:
+                unsupported.add(address)
+                raise _Unsupported(address)
+
+            pending.add(address)
+            try:
+                value = compiled(get)
+                if isinstance(value, list):
+                    raise FormulaError('#VALUE!')
+                value = 0.0 if value is None else value
+            except FormulaError as e:
+                value = e
+            except _Unsupported:
+                unsupported.add(address)
+                raise
+            finally:
+                pending.discard(address)
+
+            results[address] = value
+            return value
+
+        for address in formulas:
+            try:
+                get(address)
+            except _Unsupported:
+                unsupported.add(address)
+
+        return results
+
+    # ---- 运行时辅助函数 ----
+
+    @staticmethod
+    def to_number(value) -> float:
+        """单个值转换为数值（空值为0，文本无法转换时为 #VALUE!）"""
+        if isinstance(value, FormulaError):
+            raise value
+        if value is None:
+            return 0.0
+        if isinstance(value, bool):
+            return float(value)
+        if isinstance(value, Number):
+            return float(value)
+        if isinstance(value, str):
+            try:
+                return float(value)
+            except ValueError:
+                raise FormulaError('#VALUE!')
+        raise FormulaError('#VALUE!')
+
+    @staticmethod
+    def numbers(args: List[object]) -> List[float]:
+        """取函数参数中的数值（区域中的文本、布尔值和空单元格被忽略）"""
+        result = []
+        for arg in args:
+            if isinstance(arg, list):
+                for value in arg:
+                    if isinstance(value, FormulaError):
+                        raise value
+                    if isinstance(value, Number) and not isinstance(value, bool):
+                        result.append(float(value))
+            else:
+                result.append(FormulaEvaluator.to_number(arg))
+        return result
+
+    @staticmethod
+    def compare(op: str, left, right) -> bool:
+        """Excel比较运算：数值 < 文本 < 布尔值，文本比较不区分大小写"""
+        for value in (left, right):
+            if isinstance(value, FormulaError):
+                raise value
+        if left is None:
+            left = '' if isinstance(right, str) else 0.0
+        if right is None:
+            right = '' if isinstance(left, str) else 0.0
+
+        def rank(value):
+            if isinstance(value, bool):
+                return 2
+            if isinstance(value, str):
+                return 1
+            return 0
+
+        left_rank, right_rank = rank(left), rank(right)
+        if left_rank != right_rank:
+            return FormulaEvaluator.COMPARISONS[op](left_rank, right_rank)
+        if left_rank == 1:
+            left, right = left.lower(), right.lower()
+        return FormulaEvaluator.COMPARISONS[op](left, right)
+
+
+def _average(args):
+    values = FormulaEvaluator.numbers(args)
+    if not values:
+        raise FormulaError('#DIV/0!')
+    return sum(values) / len(values)
+
+
+def _max(args):
+    values = FormulaEvaluator.numbers(args)
+    return max(values) if values else 0.0
+
+
+def _min(args):
+    values = FormulaEvaluator.numbers(args)
+    return min(values) if values else 0.0
+
+
+def _abs(args):
+    if len(args) != 1:
+        raise FormulaError('#VALUE!')
+    return abs(FormulaEvaluator.to_number(args[0]))
+
+
+def _stdev_p(args):
+    values = FormulaEvaluator.numbers(args)
+    if not values:
+        raise FormulaError('#DIV/0!')
+    mean = sum(values) / len(values)
+    return math.sqrt(sum((v - mean) ** 2 for v in values) / len(values))
+
+
+# 函数名 -> 实现（IF需要惰性求值，在解析器中单独处理）
+FUNCTIONS = {
+    'AVERAGE': _average,
+    'MAX': _max,
+    'MIN': _min,
+    'ABS': _abs,
+    'STDEV.P': _stdev_p,
+}
+
+
+class _Parser:
+    """递归下降解析器：把公式编译为闭包"""
+
+    def __init__(self, evaluator: FormulaEvaluator, formula: str):
+        self.evaluator = evaluator
+        self.tokens = self._tokenize(formula)
+        self.pos = 0
+
+    def _tokenize(self, formula: str):
+        tokens = []
+        pos = 0
+        formula = formula.rstrip()
+        while pos < len(formula):
+            match = FormulaEvaluator.TOKEN_PATTERN.match(formula, pos)
+            if match is None or match.end() == pos:
+                raise _Unsupported(formula)
+            kind = match.lastgroup
+            tokens.append((kind, match.group(kind)))
+            pos = match.end()
+        return tokens
+
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def _take(self):
+        token = self._peek()
+        self.pos += 1
+        return token
+
+    def _expect(self, op: str):
+        if self._take() != ('op', op):
+            raise _Unsupported(op)
+
+    def parse(self) -> Compiled:
+        node = self._comparison()
+        if self.pos != len(self.tokens):
+            raise _Unsupported('trailing tokens')
+        return node
+
+    def _comparison(self) -> Compiled:
+        left = self._concat()
+        while self._peek()[0] == 'op' and self._peek()[1] in FormulaEvaluator.COMPARISONS:
+            op = self._take()[1]
+            right = self._concat()
+            left = (lambda l, r, o: lambda get: FormulaEvaluator.compare(o, l(get), r(get)))(left, right, op)
+        return left
+
+    def _concat(self) -> Compiled:
+        left = self._additive()
+        while self._peek() == ('op', '&'):
+            self._take()
+            right = self._additive()
+            left = (lambda l, r: lambda get: _text(l(get)) + _text(r(get)))(left, right)
+        return left
+
+    def _additive(self) -> Compiled:
+        left = self._multiplicative()
+        while self._peek() in (('op', '+'), ('op', '-')):
+            op = self._take()[1]
+            right = self._multiplicative()
+            left = _binary(op, left, right)
+        return left
+
+    def _multiplicative(self) -> Compiled:
+        left = self._power()
+        while self._peek() in (('op', '*'), ('op', '/')):
+            op = self._take()[1]
+            right = self._power()
+            left = _binary(op, left, right)
+        return left
+
+    def _power(self) -> Compiled:
+        left = self._unary()
+        while self._peek() == ('op', '^'):
+            self._take()
+            right = self._unary()
+            left = _binary('^', left, right)
+        return left
+
+    def _unary(self) -> Compiled:
+        if self._peek() == ('op', '-'):
+            self._take()
+            operand = self._unary()
+            return lambda get: -FormulaEvaluator.to_number(operand(get))
+        if self._peek() == ('op', '+'):
+            self._take()
+            return self._unary()
+        return self._primary()
+
+    def _primary(self) -> Compiled:
+        kind, text = self._take()
+
+        if kind == 'number':
+            value = float(text)
+            return lambda get: value
+
+        if kind == 'string':
+            value = text[1:-1].replace('""', '"')
+            return lambda get: value
+
+        if kind == 'cell':
+            address = text.replace('$', '')
+            return lambda get: get(address)
+
+        if kind == 'range':
+            addresses = _expand_range(text.replace('$', ''))
+            return lambda get: [get(address) for address in addresses]
+
+        if kind == 'func':
+            return self._function(text.upper())
+
+        if (kind, text) == ('op', '('):
+            node = self._comparison()
+            self._expect(')')
+            return node
+
+        raise _Unsupported(text)
+
+    def _function(self, name: str) -> Compiled:
+        if name.startswith('_XLFN.'):
+            name = name[len('_XLFN.'):]
+
+        args = []
+        if self._peek() != ('op', ')'):
+            args.append(self._comparison())
+            while self._peek() == ('op', ','):
+                self._take()
+                args.append(self._comparison())
+        self._expect(')')
+
+        if name == 'IF':
+            if not 2 <= len(args) <= 3:
+                raise _Unsupported(name)
+            condition, if_true = args[0], args[1]
+            if_false = args[2] if len(args) == 3 else (lambda get: False)
+            return lambda get: if_true(get) if _truth(condition(get)) else if_false(get)
+
+        function = FUNCTIONS.get(name)
+        if function is None:
+            raise _Unsupported(name)
+        return lambda get: function([arg(get) for arg in args])
+
+
+def _binary(op: str, left: Compiled, right: Compiled) -> Compiled:
+    """数值二元运算"""
+    to_number = FormulaEvaluator.to_number
+
+    def apply(get):
+        a, b = to_number(left(get)), to_number(right(get))
+        if op == '+':
+            return a + b
+        if op == '-':
+            return a - b
+        if op == '*':
+            return a * b
+        if op == '/':
+            if b == 0:
+                raise FormulaError('#DIV/0!')
+            return a / b
+        try:
+            result = a ** b
+        except (OverflowError, ZeroDivisionError):
+            raise FormulaError('#NUM!')
+        if isinstance(result, complex):
+            raise FormulaError('#NUM!')
+        return result
+
+    return apply
+
+
+def _truth(value) -> bool:
+    """IF条件的真假"""
+    if isinstance(value, FormulaError):
+        raise value
+    if isinstance(value, str):
+        raise FormulaError('#VALUE!')
+    return bool(value)
+
+
+def _text(value) -> str:
+    """连接运算的文本形式"""
+    if isinstance(value, FormulaError):
+        raise value
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _expand_range(text: str) -> List[str]:
+    """展开区域为单元格地址列表（按行优先）"""
+    start, end = text.split(':')
+    start_col, start_row = re.match(r'([A-Z]+)(\d+)', start).groups()
+    end_col, end_row = re.match(r'([A-Z]+)(\d+)', end).groups()
+    col_a, col_b = sorted((column_index_from_string(start_col), column_index_from_string(end_col)))
+    row_a, row_b = sorted((int(start_row), int(end_row)))
+    return [
+        f"{get_column_letter(col)}{row}"
+        for row in range(row_a, row_b + 1)
+        for col in range(col_a, col_b + 1)
+    ]
@@ -1,76 +1,106 @@
 """公式恢复器"""
 
-from typing import Optional
+from typing import Optional, Dict
+from openpyxl.utils import get_column_letter
 from ..models.tolerance import Tolerance
 from ..config.constants import CELL_ADDRESSES
 
 
 class FormulaRestorer:
-    """公式恢复器"""
-    
-    def restore_formulas(
+    """
+    公式恢复器
+
+    模板公式只随公差类型（AA29）和中心来源（E4为公式或参考中心数值）变化，
+    因此按这两项划分为模板变体，每个变体的公式只生成一次，
+    由模板缓存/XML写入器在第一次使用时写入模板并复用，单个任务不再逐个写公式。
+    """
+
+    # 与公差类型和模式无关的公式
+    INVARIANT_FORMULAS = {
+        'H4': '=E17/2.326',
+        'J4': '=E4+H4*3',
+        'L4': '=E4-H4*3',
+        'N4': '=E4+H4',
+        'P4': '=E4+H4*2',
+        'R4': '=E4-H4',
+        'T4': '=E4-H4*2',
+        'E17': '=AVERAGE(C38:AA38)',
+        'L17': '=Z19*E17',
+        'U17': '=0*E17',
+        'X29': '=ABS((Q2-AVERAGE(C32:AA36))/(3*H4))',
+        'Y29': '=ABS(AVERAGE(C32:AA36)-Q3)/(3*H4)',
+        # 平均值行公式 (C37:AA37) 和极差行公式 (C38:AA38)
+        **{
+            f'{col}37': f'=AVERAGE({col}32:{col}36)'
+            for col in map(get_column_letter, range(3, 29))
+        },
+        **{
+            f'{col}38': f'=MAX({col}32:{col}36)-MIN({col}32:{col}36)'
+            for col in map(get_column_letter, range(3, 29))
+        },
+    }
+
+    # AA29 按公差类型取值
+    AA29_FORMULAS = {
+        'double': '=MIN(X29,Y29)',
+        'upper': '=X29',
+        'lower': '=Y29',
+        'none': 0,
+    }
+
+    # 参考中心变体的后缀
+    REFERENCE_CENTER_SUFFIX = '_reference_center'
+
+    def __init__(self):
+        self._variants: Dict[str, Dict[str, object]] = {}
+
+    def get_variant(
         self,
-        worksheet,
         tolerance: Tolerance,
         use_reference_range: bool = False,
         ref_center: Optional[float] = None
-    ):
+    ) -> str:
         """
-        恢复原模板中的关键公式，根据单边/双边公差动态设置公式
-        
+        确定任务使用的模板变体
+
         Args:
-            worksheet: 工作表对象
             tolerance: 公差信息
             use_reference_range: 是否使用参考分布范围模式
-            ref_center: 参考中心（用于参考分布范围模式）
+            ref_center: 参考中心
+
+        Returns:
+            变体名称，如 'double'、'upper_reference_center'
+        """
+        if tolerance.usl is not None and tolerance.lsl is not None:
+            variant = 'double'
+        elif tolerance.usl is not None:
+            variant = 'upper'
+        elif tolerance.lsl is not None:
+            variant = 'lower'
+        else:
+            variant = 'none'
+
+        if use_reference_range and ref_center is not None:
+            variant += self.REFERENCE_CENTER_SUFFIX
+        return variant
+
+    def get_formulas(self, variant: str) -> Dict[str, object]:
+        """
+        获取变体的全部公式单元格（每个变体只生成一次）
+
+        Args:
+            variant: 变体名称
+
+        Returns:
+            单元格地址到公式的映射
         """
-        try:
-            # 检测公差类型并动态设置AA29的公式
-            if tolerance.usl is not None and tolerance.lsl is not None:
-                aa29_formula = '=MIN(X29,Y29)'
-            elif tolerance.usl is not None:
-                aa29_formula = '=X29'
-            elif tolerance.lsl is not None:
-                aa29_formula = '=Y29'
-            else:
-                aa29_formula = 0
-            
-            worksheet['AA29'] = aa29_formula
-            
-            # 如果使用参考分布范围，E4已经是数值，不恢复公式
-            if not use_reference_range or ref_center is None:
-                worksheet[CELL_ADDRESSES['center']] = '=(Q2+Q3)/2'
-                if use_reference_range and ref_center is not None:
-                    worksheet[CELL_ADDRESSES['center_reference']] = ref_center
-            else:
-                worksheet[CELL_ADDRESSES['center']] = ref_center
-                worksheet[CELL_ADDRESSES['center_reference']] = ref_center
-            
-            # 恢复其他公式
-            worksheet['H4'] = '=E17/2.326'
-            worksheet['J4'] = '=E4+H4*3'
-            worksheet['L4'] = '=E4-H4*3'
-            worksheet['N4'] = '=E4+H4'
-            worksheet['P4'] = '=E4+H4*2'
-            worksheet['R4'] = '=E4-H4'
-            worksheet['T4'] = '=E4-H4*2'
-            worksheet['E17'] = '=AVERAGE(C38:AA38)'
-            worksheet['L17'] = '=Z19*E17'
-            worksheet['U17'] = '=0*E17'
-            worksheet['X29'] = '=ABS((Q2-AVERAGE(C32:AA36))/(3*H4))'
-            worksheet['Y29'] = '=ABS(AVERAGE(C32:AA36)-Q3)/(3*H4)'
-            
-            # 平均值行公式 (C37:AA37)
-            for col in range(3, 29):  # C到AA列
-                from openpyxl.utils import get_column_letter
-                col_letter = get_column_letter(col)
-                worksheet[f'{col_letter}37'] = f'=AVERAGE({col_letter}32:{col_letter}36)'
-            
-            # 极差行公式 (C38:AA38)
-            for col in range(3, 29):
-                from openpyxl.utils import get_column_letter
-                col_letter = get_column_letter(col)
-                worksheet[f'{col_letter}38'] = f'=MAX({col_letter}32:{col_letter}36)-MIN({col_letter}32:{col_letter}36)'
-            
-        except Exception as e:
-            print(f"恢复公式时出错: {e}")
+        formulas = self._variants.get(variant)
+        if formulas is None:
+            tolerance_type = variant.replace(self.REFERENCE_CENTER_SUFFIX, '')
+            formulas = {'AA29': self.AA29_FORMULAS[tolerance_type]}
+            # 参考中心变体的E4是数值，由任务写入
+            if not variant.endswith(self.REFERENCE_CENTER_SUFFIX):
+                formulas[CELL_ADDRESSES['center']] = '=(Q2+Q3)/2'
+            formulas.update(self.INVARIANT_FORMULAS)
+            self._variants[variant] = formulas
+        return formulas
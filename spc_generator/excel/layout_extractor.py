@@ -0,0 +1,403 @@
+"""模板版式提取器"""
+
+import colorsys
+import re
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from openpyxl import load_workbook
+from openpyxl.styles.colors import COLOR_INDEX
+from openpyxl.utils import column_index_from_string, range_boundaries
+from ..models.sheet_layout import SheetLayout, ChartLayout, SeriesLayout
+from ..config.constants import CELL_ADDRESSES
+
+
+class LayoutExtractor:
+    """
+    模板版式提取器 - 把模板的第一个工作表转换为SheetLayout
+
+    提取内容：单元格值/公式、样式（转换为xlsxwriter格式属性）、合并单元格、行高列宽、
+    批注、冻结窗格、打印设置，以及Xbar图和R图（按数据系列引用的行识别）。
+    绘图中的其他形状（线条、文本框）不提取。
+    """
+
+    # openpyxl边框样式 -> xlsxwriter边框序号
+    BORDER_STYLES = {
+        'thin': 1, 'medium': 2, 'dashed': 3, 'dotted': 4, 'thick': 5, 'double': 6, 'hair': 7,
+        'mediumDashed': 8, 'dashDot': 9, 'mediumDashDot': 10, 'dashDotDot': 11,
+        'mediumDashDotDot': 12, 'slantDashDot': 13,
+    }
+
+    HORIZONTAL_ALIGN = {
+        'left': 'left', 'center': 'center', 'right': 'right', 'fill': 'fill', 'justify': 'justify',
+        'centerContinuous': 'center_across', 'distributed': 'distributed',
+    }
+
+    VERTICAL_ALIGN = {
+        'top': 'top', 'center': 'vcenter', 'bottom': 'bottom', 'justify': 'vjustify',
+        'distributed': 'vdistributed',
+    }
+
+    UNDERLINES = {'single': 1, 'double': 2, 'singleAccounting': 33, 'doubleAccounting': 34}
+
+    # DrawingML线型 -> xlsxwriter dash_type
+    DASH_TYPES = {
+        'solid': 'solid', 'dot': 'round_dot', 'sysDot': 'round_dot', 'sysDash': 'square_dot',
+        'dash': 'dash', 'dashDot': 'dash_dot', 'sysDashDot': 'dash_dot', 'lgDash': 'long_dash',
+        'lgDashDot': 'long_dash_dot', 'lgDashDotDot': 'long_dash_dot_dot',
+        'sysDashDotDot': 'long_dash_dot_dot',
+    }
+
+    MARKERS = {
+        'circle': 'circle', 'square': 'square', 'diamond': 'diamond', 'triangle': 'triangle',
+        'x': 'x', 'star': 'star', 'plus': 'plus', 'dash': 'short_dash', 'dot': 'circle',
+        'none': 'none', 'auto': 'automatic',
+    }
+
+    TICK_MARKS = {'out': 'outside', 'in': 'inside', 'cross': 'cross', 'none': 'none'}
+
+    # 工作表颜色中主题序号的顺序
+    THEME_ORDER = ['lt1', 'dk1', 'lt2', 'dk2', 'accent1', 'accent2', 'accent3',
+                   'accent4', 'accent5', 'accent6', 'hlink', 'folHlink']
+
+    # 图表第一个数据系列所在行 -> 图表类型
+    CHART_ROLES = {CELL_ADDRESSES['avg_row']: 'xbar', CELL_ADDRESSES['range_row']: 'r'}
+
+    EMU_PER_PIXEL = 9525
+
+    def extract(self, template_path: str) -> SheetLayout:
+        """
+        提取模板版式
+
+        Args:
+            template_path: 模板文件路径
+
+        Returns:
+            SheetLayout对象
+        """
+        wb = load_workbook(template_path)
+        try:
+            ws = wb.worksheets[0]
+            self._theme = self._read_theme(wb.loaded_theme)
+
+            default_font = wb._fonts[0]
+            layout = SheetLayout(
+                sheet_name=ws.title,
+                default_font=(default_font.name, float(default_font.sz or 11)),
+                default_row_height=ws.sheet_format.defaultRowHeight,
+            )
+
+            self._extract_dimensions(ws, layout)
+            self._extract_cells(ws, layout)
+            layout.merges = [
+                (r.min_row - 1, r.min_col - 1, r.max_row - 1, r.max_col - 1)
+                for r in ws.merged_cells.ranges
+            ]
+            self._extract_page_setup(ws, layout)
+            layout.charts = [
+                chart for chart in (self._extract_chart(chart, layout) for chart in ws._charts)
+                if chart is not None
+            ]
+            return layout
+        finally:
+            wb.close()
+
+    # ---- 工作表 ----
+
+    def _extract_dimensions(self, ws, layout: SheetLayout):
+        """列宽和行高"""
+        for dimension in ws.column_dimensions.values():
+            if dimension.width:
+                first = dimension.min or column_index_from_string(dimension.index)
+                last = dimension.max or first
+                layout.columns.append((first - 1, min(last, 16384) - 1, dimension.width))
+        layout.columns.sort()
+
+        for row, dimension in ws.row_dimensions.items():
+            if dimension.height is not None:
+                layout.row_heights[row - 1] = dimension.height
+
+    def _extract_cells(self, ws, layout: SheetLayout):
+        """单元格值、公式、格式和批注"""
+        format_index: Dict[Tuple, int] = {}
+
+        for (row, col), cell in sorted(ws._cells.items()):
+            value = cell.value
+            if value is None and not cell.has_style:
+                continue
+
+            fmt = None
+            if cell.has_style:
+                props = self._format_properties(cell)
+                key = tuple(sorted(props.items()))
+                if key not in format_index:
+                    format_index[key] = len(layout.formats)
+                    layout.formats.append(props)
+                fmt = format_index[key]
+
+            address = cell.coordinate
+            if cell.data_type == 'f' and isinstance(value, str):
+                kind = 'formula'
+                layout.formulas[address] = value[1:]
+            elif value is None:
+                kind = 'blank'
+            elif isinstance(value, bool):
+                kind = 'bool'
+            elif isinstance(value, (int, float)):
+                kind = 'number'
+                value = float(value)
+            elif isinstance(value, datetime):
+                kind = 'datetime'
+            else:
+                kind = 'string'
+                value = str(value)
+
+            if kind not in ('formula', 'blank', 'datetime'):
+                layout.values[address] = value
+            layout.cells.append((row - 1, col - 1, address, kind, value, fmt))
+
+            if cell.comment is not None:
+                layout.comments.append((row - 1, col - 1, cell.comment.text, cell.comment.author or ''))
+
+    def _format_properties(self, cell) -> Dict[str, object]:
+        """把openpyxl单元格样式转换为xlsxwriter格式属性"""
+        props: Dict[str, object] = {}
+
+        font = cell.font
+        if font.name:
+            props['font_name'] = font.name
+        if font.sz:
+            props['font_size'] = float(font.sz)
+        if font.b:
+            props['bold'] = True
+        if font.i:
+            props['italic'] = True
+        if font.u:
+            props['underline'] = self.UNDERLINES.get(font.u, 1)
+        if font.strike:
+            props['font_strikeout'] = True
+        if font.vertAlign == 'superscript':
+            props['font_script'] = 1
+        elif font.vertAlign == 'subscript':
+            props['font_script'] = 2
+        color = self._color(font.color)
+        if color:
+            props['font_color'] = color
+
+        if cell.number_format and cell.number_format != 'General':
+            props['num_format'] = cell.number_format
+
+        alignment = cell.alignment
+        if alignment.horizontal in self.HORIZONTAL_ALIGN:
+            props['align'] = self.HORIZONTAL_ALIGN[alignment.horizontal]
+        if alignment.vertical in self.VERTICAL_ALIGN:
+            props['valign'] = self.VERTICAL_ALIGN[alignment.vertical]
+        if alignment.wrap_text:
+            props['text_wrap'] = True
+        if alignment.shrink_to_fit:
+            props['shrink'] = True
+        if alignment.indent:
+            props['indent'] = int(alignment.indent)
+        rotation = int(alignment.text_rotation or 0)
+        if rotation:
+            # Excel: 91-180表示负角度，255表示竖排
+            props['rotation'] = 270 if rotation == 255 else (90 - rotation if rotation > 90 else rotation)
+
+        fill = cell.fill
+        if fill.fill_type == 'solid':
+            color = self._color(fill.fgColor)
+            if color:
+                props['pattern'] = 1
+                props['bg_color'] = color
+
+        for side in ('left', 'right', 'top', 'bottom'):
+            border = getattr(cell.border, side)
+            if border is not None and border.style in self.BORDER_STYLES:
+                props[side] = self.BORDER_STYLES[border.style]
+                color = self._color(border.color)
+                if color:
+                    props[f'{side}_color'] = color
+
+        if cell.protection.locked is False:
+            props['locked'] = False
+        if cell.protection.hidden:
+            props['hidden'] = True
+
+        return props
+
+    def _extract_page_setup(self, ws, layout: SheetLayout):
+        """冻结窗格和打印设置"""
+        if ws.freeze_panes:
+            col_letter, row = re.match(r'([A-Z]+)(\d+)', ws.freeze_panes).groups()
+            layout.freeze_panes = (int(row) - 1, column_index_from_string(col_letter) - 1)
+
+        if ws.print_area:
+            area = ws.print_area if isinstance(ws.print_area, str) else ws.print_area[0]
+            layout.print_area = area.split(',')[0].split('!')[-1].replace('$', '')
+
+        layout.landscape = ws.page_setup.orientation == 'landscape'
+        layout.paper_size = int(ws.page_setup.paperSize) if ws.page_setup.paperSize else None
+        layout.print_scale = int(ws.page_setup.scale) if ws.page_setup.scale else None
+
+        margins = ws.page_margins
+        layout.margins = {
+            name: getattr(margins, name)
+            for name in ('left', 'right', 'top', 'bottom', 'header', 'footer')
+            if getattr(margins, name) is not None
+        }
+
+    # ---- 图表 ----
+
+    def _extract_chart(self, chart, layout: SheetLayout) -> Optional[ChartLayout]:
+        """提取Xbar图/R图的位置、数据系列和格式，其他图表返回None"""
+        series = [s for s in (self._extract_series(s) for s in chart.series) if s is not None]
+        if not series or series[0].row not in self.CHART_ROLES:
+            return None
+
+        anchor = chart.anchor
+        start, end = anchor._from, anchor.to
+        x_start = self._column_position(layout, start.col) + start.colOff // self.EMU_PER_PIXEL
+        y_start = self._row_position(layout, start.row) + start.rowOff // self.EMU_PER_PIXEL
+        x_end = self._column_position(layout, end.col) + end.colOff // self.EMU_PER_PIXEL
+        y_end = self._row_position(layout, end.row) + end.rowOff // self.EMU_PER_PIXEL
+
+        chart_layout = ChartLayout(
+            role=self.CHART_ROLES[series[0].row],
+            anchor=(start.row, start.col),
+            offset=(start.colOff // self.EMU_PER_PIXEL, start.rowOff // self.EMU_PER_PIXEL),
+            size=(x_end - x_start, y_end - y_start),
+            series=series,
+        )
+
+        try:
+            chart_layout.fill_color = self._drawing_color(chart.graphical_properties.solidFill)
+        except AttributeError:
+            pass
+
+        y_axis, x_axis = chart.y_axis, chart.x_axis
+        try:
+            chart_layout.gridline_color = self._drawing_color(y_axis.majorGridlines.spPr.ln.solidFill)
+        except AttributeError:
+            pass
+        if y_axis.number_format is not None and y_axis.number_format.formatCode:
+            chart_layout.number_format = y_axis.number_format.formatCode
+        chart_layout.tick_mark = self.TICK_MARKS.get(y_axis.majorTickMark or x_axis.majorTickMark, 'outside')
+        try:
+            run = y_axis.txPr.p[0].pPr.defRPr
+            chart_layout.font_name = run.latin.typeface if run.latin is not None else None
+            chart_layout.font_size = run.sz / 100 if run.sz else None
+        except (AttributeError, IndexError, TypeError):
+            pass
+
+        return chart_layout
+
+    def _extract_series(self, series) -> Optional[SeriesLayout]:
+        """提取数据系列（只支持单行引用）"""
+        try:
+            reference = series.val.numRef.f
+        except AttributeError:
+            return None
+        min_col, min_row, max_col, max_row = range_boundaries(reference.split('!')[-1].replace('$', ''))
+        if min_row != max_row:
+            return None
+
+        layout = SeriesLayout(row=min_row, first_col=min_col, last_col=max_col)
+
+        line = series.spPr.ln if series.spPr is not None else None
+        if line is not None:
+            if line.w:
+                layout.line_width = line.w / 12700
+            if line.prstDash:
+                layout.dash_type = self.DASH_TYPES.get(line.prstDash, 'solid')
+            color = self._drawing_color(line.solidFill)
+            if color:
+                layout.color = color
+
+        marker = series.marker
+        if marker is not None and marker.symbol and marker.symbol != 'none':
+            # 无填充的标记不可见
+            visible = marker.spPr is None or marker.spPr.noFill is None or marker.spPr.solidFill is not None
+            if visible:
+                layout.marker = self.MARKERS.get(marker.symbol, 'automatic')
+                layout.marker_size = int(marker.size) if marker.size else None
+
+        return layout
+
+    # ---- 位置换算（与xlsxwriter的像素换算一致）----
+
+    def _column_position(self, layout: SheetLayout, col: int) -> int:
+        """第col列左边界的像素位置"""
+        widths = {}
+        for first, last, width in layout.columns:
+            for c in range(first, min(last, col) + 1):
+                widths[c] = width
+        position = 0
+        for c in range(col):
+            width = widths.get(c, 8.43)
+            position += int(width * 12 + 0.5) if width < 1 else int(width * 7 + 0.5) + 5
+        return position
+
+    def _row_position(self, layout: SheetLayout, row: int) -> int:
+        """第row行上边界的像素位置"""
+        default = layout.default_row_height or 15
+        return sum(int(4.0 / 3.0 * layout.row_heights.get(r, default)) for r in range(row))
+
+    # ---- 颜色 ----
+
+    def _read_theme(self, theme_xml: Optional[bytes]) -> Dict[str, str]:
+        """读取主题配色"""
+        colors = {}
+        if not theme_xml:
+            return colors
+        text = theme_xml.decode('utf-8', errors='ignore')
+        scheme = re.search(r'<a:clrScheme.*?</a:clrScheme>', text, re.S)
+        if scheme is None:
+            return colors
+        for name, body in re.findall(r'<a:(\w+)>(.*?)</a:\1>', scheme.group(0), re.S):
+            value = re.search(r'(?:lastClr|val)="([0-9A-Fa-f]{6})"', body)
+            if value:
+                colors[name] = value.group(1).upper()
+        return colors
+
+    def _color(self, color) -> Optional[str]:
+        """单元格颜色转换为 #RRGGBB，自动颜色返回None"""
+        if color is None:
+            return None
+        rgb = None
+        if color.type == 'rgb' and isinstance(color.rgb, str):
+            rgb = color.rgb[-6:]
+        elif color.type == 'indexed' and color.indexed is not None and color.indexed < 64:
+            rgb = COLOR_INDEX[color.indexed][-6:]
+        elif color.type == 'theme' and color.theme is not None and color.theme < len(self.THEME_ORDER):
+            rgb = self._theme.get(self.THEME_ORDER[color.theme])
+        if rgb is None:
+            return None
+        if color.tint:
+            rgb = self._apply_tint(rgb, color.tint)
+        return f'#{rgb.upper()}'
+
+    def _drawing_color(self, fill) -> Optional[str]:
+        """DrawingML颜色转换为 #RRGGBB"""
+        if fill is None:
+            return None
+        if fill.srgbClr is not None:
+            rgb = fill.srgbClr if isinstance(fill.srgbClr, str) else fill.srgbClr.val
+            return f'#{rgb.upper()}'
+        if fill.schemeClr is not None:
+            scheme = fill.schemeClr
+            name = {'tx1': 'dk1', 'bg1': 'lt1', 'tx2': 'dk2', 'bg2': 'lt2'}.get(scheme.val, scheme.val)
+            rgb = self._theme.get(name, '000000' if name.startswith('dk') else 'FFFFFF')
+            if scheme.lumMod is not None or scheme.lumOff is not None:
+                r, g, b = (int(rgb[i:i + 2], 16) / 255 for i in (0, 2, 4))
+                h, l, s = colorsys.rgb_to_hls(r, g, b)
+                l = min(1.0, l * (scheme.lumMod or 100000) / 100000 + (scheme.lumOff or 0) / 100000)
+                rgb = ''.join(f'{round(v * 255):02X}' for v in colorsys.hls_to_rgb(h, l, s))
+            return f'#{rgb.upper()}'
+        return None
+
+    @staticmethod
+    def _apply_tint(rgb: str, tint: float) -> str:
+        """按Excel规则对颜色应用明暗度"""
+        r, g, b = (int(rgb[i:i + 2], 16) / 255 for i in (0, 2, 4))
+        h, l, s = colorsys.rgb_to_hls(r, g, b)
+        l = l * (1 + tint) if tint < 0 else l * (1 - tint) + tint
+        return ''.join(f'{round(v * 255):02X}' for v in colorsys.hls_to_rgb(h, l, s))
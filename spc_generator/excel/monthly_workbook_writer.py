@@ -0,0 +1,120 @@
+"""月度工作簿写入器 - 同一月份的全部任务写入一个工作簿，每个任务一个工作表"""
+
+import re
+from typing import Dict, Optional, Set, Tuple
+from .xlsxwriter_backend import XlsxWriterBackend
+from .xml_cell_patcher import CellMap
+from ..utils.output_registry import OutputRegistry
+
+
+class MonthlyWorkbookWriter:
+    """
+    月度工作簿写入器
+
+    每个月份打开一个xlsxwriter工作簿，格式只注册一次，由各任务的工作表共用；
+    工作表按模板版式生成（与XlsxWriterBackend相同），工作表名称由产品型号、工序、检测项目组成。
+    工作簿先写入临时文件，保存时原子替换为输出文件。
+    """
+
+    # Excel工作表名称的长度上限和非法字符
+    MAX_SHEET_NAME_LENGTH = 31
+    INVALID_SHEET_CHARS = re.compile(r"[\[\]:*?/\\]")
+
+    def __init__(self, backend: Optional[XlsxWriterBackend] = None):
+        self.backend = backend or XlsxWriterBackend()
+        self.output_path: Optional[str] = None
+        self._temp_path: Optional[str] = None
+        self.sheet_count = 0
+        self._workbook = None
+        self._formats = None
+        self._layout = None
+        self._sheet_names: Set[str] = set()
+
+    @property
+    def is_open(self) -> bool:
+        """是否有打开的工作簿"""
+        return self._workbook is not None
+
+    def open(self, template_path: str, output_path: str):
+        """
+        打开新的月度工作簿（已打开的工作簿先保存）
+
+        Args:
+            template_path: 模板文件路径（只用于提取版式）
+            output_path: 输出文件路径
+        """
+        self.close()
+        self._layout = self.backend.get_layout(template_path)
+        self._temp_path = OutputRegistry.create_temp_file(output_path)
+        self._workbook, self._formats = self.backend.create_workbook(self._temp_path, self._layout)
+        self.output_path = output_path
+        self.sheet_count = 0
+        self._sheet_names = set()
+
+    def add_sheet(
+        self,
+        title: str,
+        cell_map: CellMap,
+        axis_ranges: Optional[Dict[str, Tuple[float, float]]] = None,
+        variant_cells: Optional[Dict[str, object]] = None
+    ) -> str:
+        """
+        添加一个任务的工作表
+
+        Args:
+            title: 工作表标题（产品型号+工序+检测项目）
+            cell_map: 要写入的单元格
+            axis_ranges: 图表纵坐标轴范围
+            variant_cells: 变体的单元格（如预编译的公式）
+
+        Returns:
+            实际使用的工作表名称
+        """
+        if self._workbook is None:
+            raise RuntimeError("月度工作簿未打开")
+
+        sheet_name = self._unique_sheet_name(title)
+        self.backend.write_sheet(
+            self._workbook, self._formats, self._layout, sheet_name,
+            cell_map, axis_ranges, variant_cells
+        )
+        self.sheet_count += 1
+        return sheet_name
+
+    def close(self) -> Optional[str]:
+        """
+        保存并关闭当前工作簿
+
+        Returns:
+            保存的文件路径，没有打开的工作簿时返回None
+        """
+        if self._workbook is None:
+            return None
+
+        output_path = self.output_path
+        try:
+            self._workbook.close()
+            OutputRegistry.commit(self._temp_path, output_path)
+        except BaseException:
+            OutputRegistry.discard(self._temp_path)
+            raise
+        finally:
+            self._workbook = None
+            self._formats = None
+            self._temp_path = None
+        return output_path
+
+    def _unique_sheet_name(self, title: str) -> str:
+        """生成合法且不重复的工作表名称（Excel不区分大小写）"""
+        name = self.INVALID_SHEET_CHARS.sub('', title).strip("'").strip() or "SPC"
+        name = name[:self.MAX_SHEET_NAME_LENGTH]
+
+        candidate = name
+        counter = 1
+        while candidate.lower() in self._sheet_names:
+            suffix = f"_{counter}"
+            candidate = name[:self.MAX_SHEET_NAME_LENGTH - len(suffix)] + suffix
+            counter += 1
+
+        self._sheet_names.add(candidate.lower())
+        return candidate
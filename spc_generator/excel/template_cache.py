@@ -0,0 +1,75 @@
+"""模板缓存"""
+
+import os
+import pickle
+from typing import Dict, Optional, Tuple
+from openpyxl import load_workbook, Workbook
+
+
+class TemplateCache:
+    """
+    模板缓存 - 每个进程只解析一次模板，按任务提供独立副本
+
+    模板解析后保存为pickle快照，每次取用时从快照恢复出一个新的Workbook，
+    比重新解压和解析xlsx快一个数量级。模板文件被修改后自动重新解析。
+    模板变体（如预编译了公式的模板）在基础快照上写入变体单元格后另存一份快照。
+    """
+
+    def __init__(self):
+        # (绝对路径, 修改时间, 变体名称) -> 工作簿快照
+        self._snapshots: Dict[Tuple[str, float, Optional[str]], bytes] = {}
+
+    def get(
+        self,
+        template_path: str,
+        variant: Optional[str] = None,
+        variant_cells: Optional[Dict[str, object]] = None
+    ) -> Workbook:
+        """
+        获取模板工作簿副本
+
+        Args:
+            template_path: 模板文件路径
+            variant: 模板变体名称（None为原始模板）
+            variant_cells: 变体写入活动工作表的单元格（只在第一次使用该变体时写入）
+
+        Returns:
+            独立的Workbook对象（修改不影响缓存）
+        """
+        path, mtime = self._get_key(template_path)
+        key = (path, mtime, variant)
+        snapshot = self._snapshots.get(key)
+
+        if snapshot is None:
+            if variant is None:
+                wb = load_workbook(path)
+            else:
+                wb = self.get(path)
+                ws = wb.active
+                for address, value in (variant_cells or {}).items():
+                    ws[address] = value
+            snapshot = pickle.dumps(wb, pickle.HIGHEST_PROTOCOL)
+            wb.close()
+            # 同一路径只保留最新版本的快照
+            self._snapshots = {k: v for k, v in self._snapshots.items() if k[0] != path or k[1] == mtime}
+            self._snapshots[key] = snapshot
+
+        return self._restore(snapshot)
+
+    def _restore(self, snapshot: bytes) -> Workbook:
+        """从快照恢复工作簿"""
+        wb = pickle.loads(snapshot)
+        # 行/列尺寸字典的默认工厂是绑定到工作表的方法，pickle不会保存，需重新绑定
+        for ws in wb.worksheets:
+            ws.row_dimensions.default_factory = ws._add_row
+            ws.column_dimensions.default_factory = ws._add_column
+        return wb
+
+    def clear(self):
+        """清空缓存"""
+        self._snapshots.clear()
+
+    def _get_key(self, template_path: str) -> Tuple[str, float]:
+        """缓存键: 绝对路径和修改时间"""
+        path = os.path.abspath(template_path)
+        return path, os.path.getmtime(path)
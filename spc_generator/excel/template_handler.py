@@ -1,20 +1,28 @@
 """模板处理器"""
 
-from openpyxl import load_workbook, Workbook
-from typing import Optional
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+from typing import Optional, Dict
 from ..utils.date_utils import DateUtils
 from ..config.constants import CELL_ADDRESSES
+from .template_cache import TemplateCache
 
 
 class TemplateHandler:
     """模板处理器"""
     
-    def __init__(self):
+    def __init__(self, template_cache: Optional[TemplateCache] = None):
         self.date_utils = DateUtils()
+        self.template_cache = template_cache or TemplateCache()
     
-    def load_template(self, template_path: str) -> Workbook:
-        """加载模板"""
-        return load_workbook(template_path)
+    def load_template(
+        self,
+        template_path: str,
+        variant: Optional[str] = None,
+        variant_cells: Optional[Dict[str, object]] = None
+    ) -> Workbook:
+        """加载模板（模板及其变体只生成一次，每次返回缓存的独立副本）"""
+        return self.template_cache.get(template_path, variant, variant_cells)
     
     def fill_basic_info(
         self,
@@ -63,7 +71,6 @@ class TemplateHandler:
         # 生成并填充日期
         month_dates = self.date_utils.generate_month_dates(year, month, 25)
         for i, date_str in enumerate(month_dates):
-            from openpyxl.utils import get_column_letter
             col_letter = get_column_letter(3 + i)
             cell_address = f"{col_letter}{CELL_ADDRESSES['date_row']}"
             ws[cell_address] = date_str
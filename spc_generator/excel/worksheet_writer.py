@@ -1,7 +1,6 @@
 """工作表写入器"""
 
 from typing import List, Dict
-import numpy as np
 from openpyxl.utils import get_column_letter
 from ..models.task import Task
 from ..models.tolerance import Tolerance
@@ -45,35 +44,7 @@ class WorksheetWriter:
                 except Exception:
                     pass
         
-        # 更新平均值和极差行（使用舍入后的数据重新计算）
-        for col_idx in range(25):
-            try:
-                if spc_data.rounded_measurement_data:
-                    subgroup = [
-                        spc_data.rounded_measurement_data[row_idx][col_idx]
-                        for row_idx in range(5)
-                    ]
-                else:
-                    subgroup = [
-                        spc_data.measurement_data[row_idx][col_idx]
-                        for row_idx in range(5)
-                    ]
-                
-                # 计算平均值和极差
-                avg = np.mean(subgroup)
-                range_val = max(subgroup) - min(subgroup)
-                
-                # 平均值小数位数：根据分辨率确定
-                avg_decimal_places = spc_data.max_decimal_places + 1
-                
-                worksheet.cell(row=37, column=3+col_idx).value = self.validator.format_value(
-                    avg, avg_decimal_places
-                )
-                worksheet.cell(row=38, column=3+col_idx).value = self.validator.format_value(
-                    range_val, 3
-                )
-            except Exception:
-                pass
+        # 平均值和极差行 (第37/38行) 为模板变体中预编译的公式，这里不再写入
     
     def fill_approver_info(
         self,
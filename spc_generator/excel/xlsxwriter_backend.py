@@ -0,0 +1,314 @@
+"""xlsxwriter写入器 - 不加载模板，按版式直接生成SPC工作表和原生图表"""
+
+import os
+from numbers import Number
+from typing import Dict, Optional, Tuple
+import xlsxwriter
+from .layout_extractor import LayoutExtractor
+from .formula_evaluator import FormulaEvaluator, FormulaError
+from .xml_cell_patcher import CellMap
+from ..models.sheet_layout import SheetLayout, ChartLayout
+
+
+class XlsxWriterBackend:
+    """
+    xlsxwriter写入器
+
+    模板版式（SheetLayout）每个模板只提取一次，之后每个文件都由xlsxwriter从头生成：
+    单元格、格式、合并单元格、批注、打印设置和原生Xbar/R折线图。
+    公式附带FormulaEvaluator计算的缓存值。接口与XmlCellPatcher.save相同。
+    """
+
+    def __init__(
+        self,
+        extractor: Optional[LayoutExtractor] = None,
+        evaluator: Optional[FormulaEvaluator] = None
+    ):
+        self.extractor = extractor or LayoutExtractor()
+        self.evaluator = evaluator or FormulaEvaluator()
+        self._layouts: Dict[Tuple[str, float], SheetLayout] = {}
+
+    def save(
+        self,
+        template_path: str,
+        cell_map: CellMap,
+        output_path: str,
+        axis_ranges: Optional[Dict[str, Tuple[float, float]]] = None,
+        variant: Optional[str] = None,
+        variant_cells: Optional[Dict[str, object]] = None
+    ):
+        """
+        生成SPC文件
+
+        Args:
+            template_path: 模板文件路径（只用于提取版式）
+            cell_map: 要写入的单元格
+            output_path: 输出文件路径
+            axis_ranges: 图表纵坐标轴范围 {'xbar': (最小值, 最大值), 'r': (最小值, 最大值)}
+            variant: 模板变体名称（本写入器每次都完整生成，不需要缓存变体）
+            variant_cells: 变体的单元格（如预编译的公式）
+        """
+        layout = self.get_layout(template_path)
+        wb, formats = self.create_workbook(output_path, layout)
+        try:
+            self.write_sheet(wb, formats, layout, layout.sheet_name, cell_map, axis_ranges, variant_cells)
+        finally:
+            wb.close()
+
+    def create_workbook(self, output_path: str, layout: SheetLayout):
+        """
+        创建工作簿并注册版式中的全部格式（同一工作簿的各工作表共用）
+
+        Args:
+            output_path: 输出文件路径
+            layout: 模板版式
+
+        Returns:
+            (工作簿, 格式列表)
+        """
+        wb = xlsxwriter.Workbook(output_path, {
+            'in_memory': True,
+            'default_format_properties': {
+                'font_name': layout.default_font[0],
+                'font_size': layout.default_font[1],
+            },
+        })
+        formats = [wb.add_format(props) for props in layout.formats]
+        return wb, formats
+
+    def write_sheet(
+        self,
+        wb,
+        formats: list,
+        layout: SheetLayout,
+        sheet_name: str,
+        cell_map: CellMap,
+        axis_ranges: Optional[Dict[str, Tuple[float, float]]] = None,
+        variant_cells: Optional[Dict[str, object]] = None
+    ):
+        """
+        按版式在工作簿中添加一个SPC工作表
+
+        Args:
+            wb: create_workbook创建的工作簿
+            formats: create_workbook返回的格式列表
+            layout: 模板版式
+            sheet_name: 工作表名称
+            cell_map: 要写入的单元格
+            axis_ranges: 图表纵坐标轴范围
+            variant_cells: 变体的单元格（如预编译的公式）
+        """
+        cells = dict(variant_cells or {})
+        cells.update(cell_map.values)
+        results = self._evaluate(layout, cells)
+
+        ws = wb.add_worksheet(sheet_name)
+        self._write_sheet_setup(ws, layout)
+
+        # 先合并单元格（merge_range会写入空白单元格），再写入单元格内容
+        for first_row, first_col, last_row, last_col in layout.merges:
+            first_format = self._merge_format(layout, formats, first_row, first_col)
+            ws.merge_range(first_row, first_col, last_row, last_col, None, first_format)
+
+        for row, col, address, kind, value, fmt in layout.cells:
+            cell_format = formats[fmt] if fmt is not None else None
+            if address in cells:
+                self._write_value(ws, row, col, cells.pop(address), cell_format, results.get(address))
+            else:
+                self._write_template_cell(ws, row, col, kind, value, cell_format, results.get(address))
+
+        # 模板中不存在的单元格
+        for address, value in cells.items():
+            row, col = xlsxwriter.utility.xl_cell_to_rowcol(address)
+            self._write_value(ws, row, col, value, None, results.get(address))
+
+        for row, col, text, author in layout.comments:
+            ws.write_comment(row, col, text, {'author': author})
+
+        for chart_layout in layout.charts:
+            self._insert_chart(wb, ws, sheet_name, chart_layout, (axis_ranges or {}).get(chart_layout.role))
+
+    def get_layout(self, template_path: str) -> SheetLayout:
+        """
+        获取模板版式（每个模板只提取一次，修改后重新提取）
+
+        Args:
+            template_path: 模板文件路径
+
+        Returns:
+            模板版式
+        """
+        path = os.path.abspath(template_path)
+        key = (path, os.path.getmtime(path))
+        layout = self._layouts.get(key)
+        if layout is None:
+            layout = self.extractor.extract(path)
+            self._layouts = {k: v for k, v in self._layouts.items() if k[0] != path}
+            self._layouts[key] = layout
+        return layout
+
+    def _evaluate(self, layout: SheetLayout, cells: Dict[str, object]) -> Dict[str, object]:
+        """计算写入后全部公式的结果"""
+        formulas = dict(layout.formulas)
+        constants = dict(layout.values)
+        for address, value in cells.items():
+            if isinstance(value, str) and value.startswith('='):
+                formulas[address] = value[1:]
+                constants.pop(address, None)
+            else:
+                formulas.pop(address, None)
+                constants[address] = value
+        return self.evaluator.evaluate(formulas, constants)
+
+    @staticmethod
+    def _merge_format(layout: SheetLayout, formats, row: int, col: int):
+        """合并区域左上角单元格的格式"""
+        for cell_row, cell_col, _, _, _, fmt in layout.cells:
+            if (cell_row, cell_col) == (row, col):
+                return formats[fmt] if fmt is not None else None
+        return None
+
+    @staticmethod
+    def _write_sheet_setup(ws, layout: SheetLayout):
+        """列宽、行高、冻结窗格和打印设置"""
+        for first, last, width in layout.columns:
+            ws.set_column(first, last, width)
+        if layout.default_row_height:
+            ws.set_default_row(layout.default_row_height)
+        for row, height in layout.row_heights.items():
+            ws.set_row(row, height)
+
+        if layout.freeze_panes:
+            ws.freeze_panes(*layout.freeze_panes)
+        if layout.print_area:
+            ws.print_area(layout.print_area)
+        if layout.landscape:
+            ws.set_landscape()
+        if layout.paper_size:
+            ws.set_paper(layout.paper_size)
+        if layout.print_scale:
+            ws.set_print_scale(layout.print_scale)
+        margins = layout.margins
+        if margins:
+            ws.set_margins(
+                left=margins.get('left', 0.7), right=margins.get('right', 0.7),
+                top=margins.get('top', 0.75), bottom=margins.get('bottom', 0.75)
+            )
+            if 'header' in margins:
+                ws.set_header('', {'margin': margins['header']})
+            if 'footer' in margins:
+                ws.set_footer('', {'margin': margins['footer']})
+
+    def _write_template_cell(self, ws, row: int, col: int, kind: str, value, cell_format, result):
+        """写入模板原有的单元格"""
+        if kind == 'formula':
+            self._write_formula(ws, row, col, value, cell_format, result)
+        elif kind == 'string':
+            # 以"="开头的文本按文本写入，不能当作公式
+            ws.write_string(row, col, value, cell_format)
+        elif kind == 'number':
+            ws.write_number(row, col, value, cell_format)
+        elif kind == 'bool':
+            ws.write_boolean(row, col, value, cell_format)
+        elif kind == 'datetime':
+            ws.write_datetime(row, col, value, cell_format)
+        else:
+            ws.write_blank(row, col, None, cell_format)
+
+    def _write_value(self, ws, row: int, col: int, value, cell_format, result):
+        """写入任务数据"""
+        if value is None:
+            ws.write_blank(row, col, None, cell_format)
+        elif isinstance(value, bool):
+            ws.write_boolean(row, col, value, cell_format)
+        elif isinstance(value, Number):
+            number = float(value)
+            if number != number or number in (float('inf'), float('-inf')):
+                ws.write_blank(row, col, None, cell_format)
+            else:
+                ws.write_number(row, col, number, cell_format)
+        elif isinstance(value, str) and value.startswith('='):
+            self._write_formula(ws, row, col, value, cell_format, result)
+        else:
+            ws.write_string(row, col, str(value), cell_format)
+
+    @staticmethod
+    def _write_formula(ws, row: int, col: int, formula: str, cell_format, result):
+        """写入公式及其缓存值"""
+        if isinstance(result, FormulaError):
+            cached = result.code
+        elif isinstance(result, float) and (result != result or result in (float('inf'), float('-inf'))):
+            cached = '#NUM!'
+        elif result is None:
+            cached = 0
+        else:
+            cached = result
+        ws.write_formula(row, col, formula, cell_format, cached)
+
+    @staticmethod
+    def _insert_chart(
+        wb,
+        ws,
+        sheet_name: str,
+        chart_layout: ChartLayout,
+        axis_range: Optional[Tuple[float, float]]
+    ):
+        """插入原生折线图"""
+        chart = wb.add_chart({'type': 'line'})
+
+        for series in chart_layout.series:
+            line = {'color': series.color, 'dash_type': series.dash_type}
+            if series.line_width:
+                line['width'] = series.line_width
+            options = {
+                'values': [sheet_name, series.row - 1, series.first_col - 1,
+                           series.row - 1, series.last_col - 1],
+                'line': line,
+                'marker': {'type': series.marker},
+            }
+            if series.marker != 'none':
+                options['marker'].update({
+                    'fill': {'color': series.color},
+                    'border': {'color': series.color},
+                })
+                if series.marker_size:
+                    options['marker']['size'] = series.marker_size
+            chart.add_series(options)
+
+        font = {}
+        if chart_layout.font_name:
+            font['name'] = chart_layout.font_name
+        if chart_layout.font_size:
+            font['size'] = chart_layout.font_size
+
+        y_axis = {
+            'num_format': chart_layout.number_format,
+            'major_tick_mark': chart_layout.tick_mark,
+            'major_gridlines': {
+                'visible': True,
+                'line': {'color': chart_layout.gridline_color or '#D9D9D9', 'width': 0.25},
+            },
+            'line': {'color': '#000000', 'width': 0.25},
+            'num_font': font,
+        }
+        if axis_range is not None:
+            y_axis['min'], y_axis['max'] = axis_range
+        chart.set_y_axis(y_axis)
+        chart.set_x_axis({
+            'major_tick_mark': chart_layout.tick_mark,
+            'line': {'color': '#000000', 'width': 0.25},
+            'num_font': font,
+        })
+
+        chart.set_legend({'none': True})
+        chart_area = {'border': {'color': '#000000', 'width': 0.25}}
+        if chart_layout.fill_color:
+            chart_area['fill'] = {'color': chart_layout.fill_color}
+        chart.set_chartarea(chart_area)
+        chart.set_size({'width': chart_layout.size[0], 'height': chart_layout.size[1]})
+
+        ws.insert_chart(chart_layout.anchor[0], chart_layout.anchor[1], chart, {
+            'x_offset': chart_layout.offset[0],
+            'y_offset': chart_layout.offset[1],
+            'object_position': 1,
+        })
@@ -0,0 +1,547 @@
+"""XML单元格补丁写入器 - 不经过openpyxl直接修改模板zip中的工作表XML"""
+
+import os
+import re
+import struct
+import zipfile
+import zlib
+from numbers import Number
+from typing import Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape, unescape
+from openpyxl.formula.translate import Translator
+from openpyxl.utils import get_column_letter, column_index_from_string
+from .formula_evaluator import FormulaEvaluator, FormulaError
+from ..config.constants import CELL_ADDRESSES
+
+
+class CellMap:
+    """
+    单元格写入记录
+
+    支持 ws['C32'] = value 和 ws.cell(row=32, column=3).value = value 两种写法，
+    因此现有的填充方法（TemplateHandler / WorksheetWriter / FormulaRestorer）可以直接写入，
+    最后由XmlCellPatcher一次性写入模板XML。
+    """
+
+    def __init__(self):
+        self.values: Dict[str, object] = {}
+
+    def __setitem__(self, address: str, value):
+        self.values[address.upper()] = value
+
+    def __getitem__(self, address: str) -> '_CellRef':
+        return _CellRef(self, address.upper())
+
+    def __contains__(self, address: str) -> bool:
+        return address.upper() in self.values
+
+    def get(self, address: str, default=None):
+        """获取已写入的值"""
+        return self.values.get(address.upper(), default)
+
+    def cell(self, row: int, column: int, value=None) -> '_CellRef':
+        """按行列号获取单元格"""
+        ref = _CellRef(self, f"{get_column_letter(column)}{row}")
+        if value is not None:
+            ref.value = value
+        return ref
+
+
+class _CellRef:
+    """CellMap中的单元格引用"""
+
+    def __init__(self, cell_map: CellMap, address: str):
+        self._cell_map = cell_map
+        self.coordinate = address
+
+    @property
+    def value(self):
+        return self._cell_map.values.get(self.coordinate)
+
+    @value.setter
+    def value(self, value):
+        self._cell_map.values[self.coordinate] = value
+
+
+class _SheetIndex:
+    """工作表XML及其单元格/行的位置索引，以及公式和常量值"""
+
+    CELL_PATTERN = re.compile(r'<c r="([A-Z]+)(\d+)"([^>]*?)(?:/>|>(.*?)</c>)', re.S)
+    ROW_PATTERN = re.compile(r'<row r="(\d+)"[^>]*?(?:/>|>(.*?)</row>)', re.S)
+    STYLE_PATTERN = re.compile(r'\ss="(\d+)"')
+    TYPE_PATTERN = re.compile(r'\st="(\w+)"')
+    FORMULA_PATTERN = re.compile(r'<f(\s[^>]*)?(?:/>|>(.*?)</f>)', re.S)
+    VALUE_PATTERN = re.compile(r'<v>(.*?)</v>', re.S)
+    TEXT_PATTERN = re.compile(r'<t(?:\s[^>]*)?>(.*?)</t>', re.S)
+
+    def __init__(self, text: str, shared_strings: List[str]):
+        self.text = text
+        # 单元格地址 -> (起点, 终点, 样式)
+        self.cells: Dict[str, Tuple[int, int, Optional[str]]] = {}
+        # 行号 -> (行起点, 行终点, 单元格内容终点(自闭合行为None), [(列号, 单元格起点)])
+        self.rows: Dict[int, Tuple[int, int, Optional[int], List[Tuple[int, int]]]] = {}
+        # 公式单元格: 地址 -> 公式文本（共享公式已展开）/ 原始<f>元素
+        self.formulas: Dict[str, str] = {}
+        self.formula_elements: Dict[str, str] = {}
+        # 常量单元格的值
+        self.values: Dict[str, object] = {}
+
+        shared_formulas: Dict[str, Tuple[str, str]] = {}
+        shared_children: List[Tuple[str, str]] = []
+
+        for row_match in self.ROW_PATTERN.finditer(text):
+            row_num = int(row_match.group(1))
+            row_cells = []
+            content_end = None
+            if row_match.group(2) is not None:
+                offset = row_match.start(2)
+                for cell_match in self.CELL_PATTERN.finditer(row_match.group(2)):
+                    address = f"{cell_match.group(1)}{cell_match.group(2)}"
+                    col_idx = column_index_from_string(cell_match.group(1))
+                    style = self.STYLE_PATTERN.search(cell_match.group(3))
+                    start, end = offset + cell_match.start(), offset + cell_match.end()
+                    self.cells[address] = (start, end, style.group(1) if style else None)
+                    row_cells.append((col_idx, start))
+                    self._read_cell(
+                        address, cell_match.group(3), cell_match.group(4) or '',
+                        shared_strings, shared_formulas, shared_children
+                    )
+                content_end = row_match.end(2)
+            self.rows[row_num] = (row_match.start(), row_match.end(), content_end, row_cells)
+
+        # 共享公式的从属单元格按相对位置平移主公式
+        for address, shared_index in shared_children:
+            if shared_index in shared_formulas:
+                origin, formula = shared_formulas[shared_index]
+                self.formulas[address] = Translator(
+                    '=' + formula, origin=origin
+                ).translate_formula(address)[1:]
+
+        self.sheet_data_end = text.index('</sheetData>') if '</sheetData>' in text else None
+
+    def _read_cell(
+        self,
+        address: str,
+        attrs: str,
+        content: str,
+        shared_strings: List[str],
+        shared_formulas: Dict[str, Tuple[str, str]],
+        shared_children: List[Tuple[str, str]]
+    ):
+        """读取单元格的公式或常量值"""
+        formula = self.FORMULA_PATTERN.search(content)
+        if formula is not None:
+            self.formula_elements[address] = formula.group(0)
+            formula_attrs = formula.group(1) or ''
+            shared_index = re.search(r'\ssi="(\d+)"', formula_attrs)
+            if formula.group(2) is not None:
+                self.formulas[address] = unescape(formula.group(2))
+                if shared_index is not None and 't="shared"' in formula_attrs:
+                    shared_formulas[shared_index.group(1)] = (address, self.formulas[address])
+            elif shared_index is not None:
+                shared_children.append((address, shared_index.group(1)))
+            return
+
+        cell_type = self.TYPE_PATTERN.search(attrs)
+        cell_type = cell_type.group(1) if cell_type else 'n'
+        if cell_type == 'inlineStr':
+            self.values[address] = ''.join(unescape(t) for t in self.TEXT_PATTERN.findall(content))
+            return
+
+        value = self.VALUE_PATTERN.search(content)
+        if value is None:
+            return
+        value = unescape(value.group(1))
+        if cell_type == 's':
+            self.values[address] = shared_strings[int(value)]
+        elif cell_type == 'b':
+            self.values[address] = value == '1'
+        elif cell_type == 'e':
+            self.values[address] = FormulaError(value)
+        elif cell_type == 'str':
+            self.values[address] = value
+        else:
+            self.values[address] = float(value)
+
+
+class _CompiledTemplate:
+    """预解析的模板：原始压缩数据、工作表XML索引、预编译变体和图表位置"""
+
+    CHART_PATTERN = re.compile(r'^xl/charts/chart\d+\.xml$')
+    SERIES_REF_PATTERN = re.compile(r"<c:val>.*?<c:f>'?(.*?)'?!\$?[A-Z]+\$?(\d+)", re.S)
+
+    # 图表第一个数据系列所在行 -> 图表类型
+    CHART_ROLES = {CELL_ADDRESSES['avg_row']: 'xbar', CELL_ADDRESSES['range_row']: 'r'}
+
+    def __init__(self, template_path: str):
+        with open(template_path, 'rb') as f:
+            self.data = f.read()
+
+        with zipfile.ZipFile(template_path) as zf:
+            self.infos = zf.infolist()
+            self.sheet_name = self._find_first_sheet(zf)
+            self.texts = {
+                name: zf.read(name).decode('utf-8')
+                for name in (self.sheet_name, 'xl/workbook.xml',
+                             'xl/_rels/workbook.xml.rels', '[Content_Types].xml')
+                if name in zf.namelist()
+            }
+            self.charts = self._find_charts(zf)
+            self.shared_strings = self._read_shared_strings(zf)
+
+        self.sheet = _SheetIndex(self.texts[self.sheet_name], self.shared_strings)
+        # 变体名称 -> 预先写入了该变体单元格的工作表索引
+        self.variants: Dict[str, _SheetIndex] = {}
+
+    def _find_charts(self, zf: zipfile.ZipFile) -> Dict[str, str]:
+        """按数据系列引用的行识别第一个工作表上的Xbar图和R图，返回 图表类型 -> 图表XML路径"""
+        workbook = self.texts['xl/workbook.xml']
+        sheet_title = re.search(r'<sheet [^>]*name="([^"]+)"', workbook).group(1)
+
+        charts = {}
+        for name in sorted(zf.namelist()):
+            if not self.CHART_PATTERN.match(name):
+                continue
+            text = zf.read(name).decode('utf-8')
+            ref = self.SERIES_REF_PATTERN.search(text)
+            if ref is None or ref.group(1).lower() != sheet_title.lower():
+                continue
+            role = self.CHART_ROLES.get(int(ref.group(2)))
+            if role is not None and role not in charts:
+                charts[role] = name
+                self.texts[name] = text
+        return charts
+
+    @staticmethod
+    def _read_shared_strings(zf: zipfile.ZipFile) -> List[str]:
+        """读取共享字符串表"""
+        if 'xl/sharedStrings.xml' not in zf.namelist():
+            return []
+        text = zf.read('xl/sharedStrings.xml').decode('utf-8')
+        return [
+            ''.join(unescape(t) for t in _SheetIndex.TEXT_PATTERN.findall(re.sub(r'<rPh.*?</rPh>', '', item, flags=re.S)))
+            for item in re.findall(r'<si>(.*?)</si>', text, re.S)
+        ]
+
+    def raw_member(self, info: zipfile.ZipInfo) -> bytes:
+        """读取成员的原始压缩数据（不解压）"""
+        header = self.data[info.header_offset:info.header_offset + 30]
+        name_len, extra_len = struct.unpack('<HH', header[26:30])
+        start = info.header_offset + 30 + name_len + extra_len
+        return self.data[start:start + info.compress_size]
+
+    @staticmethod
+    def _find_first_sheet(zf: zipfile.ZipFile) -> str:
+        """根据workbook.xml和关系文件找到第一个工作表的XML路径"""
+        workbook = zf.read('xl/workbook.xml').decode('utf-8')
+        rels = zf.read('xl/_rels/workbook.xml.rels').decode('utf-8')
+        rel_id = re.search(r'<sheet [^>]*r:id="([^"]+)"', workbook).group(1)
+        target = re.search(r'<Relationship [^>]*Id="%s"[^>]*Target="([^"]+)"' % re.escape(rel_id), rels)
+        if target is None:
+            target = re.search(r'<Relationship [^>]*Target="([^"]+)"[^>]*Id="%s"' % re.escape(rel_id), rels)
+        path = target.group(1)
+        return path.lstrip('/') if path.startswith('/') else f"xl/{path}"
+
+
+class XmlCellPatcher:
+    """
+    XML单元格补丁写入器
+
+    只重写工作表XML中被写入的单元格，其余zip成员按原始压缩数据逐字节复制（不重新压缩）。
+    - 文本写为内联字符串，数字写为数值，以"="开头的字符串写为公式
+    - 写入单元格保留模板单元格的样式
+    - 删除calcChain.xml并设置fullCalcOnLoad，打开文件时由Excel重新计算
+    - 公式单元格写入FormulaEvaluator计算的缓存值，不经Excel重算也能读取结果（data_only）
+    - Xbar图和R图的纵坐标轴范围直接写入图表XML的<c:scaling>
+    """
+
+    CALC_CHAIN = 'xl/calcChain.xml'
+
+    def __init__(self, evaluator: Optional[FormulaEvaluator] = None):
+        self._templates: Dict[Tuple[str, float], _CompiledTemplate] = {}
+        self.evaluator = evaluator or FormulaEvaluator()
+
+    def save(
+        self,
+        template_path: str,
+        cell_map: CellMap,
+        output_path: str,
+        axis_ranges: Optional[Dict[str, Tuple[float, float]]] = None,
+        variant: Optional[str] = None,
+        variant_cells: Optional[Dict[str, object]] = None
+    ):
+        """
+        将单元格写入模板并保存为新文件
+
+        Args:
+            template_path: 模板文件路径
+            cell_map: 要写入的单元格
+            output_path: 输出文件路径
+            axis_ranges: 图表纵坐标轴范围 {'xbar': (最小值, 最大值), 'r': (最小值, 最大值)}
+            variant: 模板变体名称（同一变体的单元格只在第一次使用时写入模板，之后直接复用）
+            variant_cells: 变体的单元格（如预编译的公式）
+        """
+        template = self._get_template(template_path)
+        sheet = template.sheet
+        if variant is not None:
+            sheet = template.variants.get(variant)
+            if sheet is None:
+                sheet = _SheetIndex(
+                    self._patch_sheet(template.sheet, variant_cells or {}), template.shared_strings
+                )
+                template.variants[variant] = sheet
+
+        patched = {
+            template.sheet_name: self._patch_sheet(
+                sheet, cell_map.values, self._evaluate(sheet, cell_map.values)
+            ),
+            **self._patch_calc_settings(template),
+        }
+        for role, (min_val, max_val) in (axis_ranges or {}).items():
+            chart_name = template.charts.get(role)
+            if chart_name is not None:
+                patched[chart_name] = self._patch_axis_scaling(
+                    template.texts[chart_name], min_val, max_val
+                )
+        self._write_zip(template, patched, output_path)
+
+    def _get_template(self, template_path: str) -> _CompiledTemplate:
+        """获取预解析的模板（每个模板只解析一次，修改后重新解析）"""
+        path = os.path.abspath(template_path)
+        key = (path, os.path.getmtime(path))
+        template = self._templates.get(key)
+        if template is None:
+            template = _CompiledTemplate(path)
+            self._templates = {k: v for k, v in self._templates.items() if k[0] != path}
+            self._templates[key] = template
+        return template
+
+    def _evaluate(self, index: _SheetIndex, values: Dict[str, object]) -> Dict[str, object]:
+        """计算写入后工作表中全部公式的结果"""
+        formulas = dict(index.formulas)
+        constants = dict(index.values)
+        for address, value in values.items():
+            if isinstance(value, str) and value.startswith('='):
+                formulas[address] = value[1:]
+                constants.pop(address, None)
+            else:
+                formulas.pop(address, None)
+                constants[address] = value
+        return self.evaluator.evaluate(formulas, constants)
+
+    def _patch_sheet(
+        self,
+        index: _SheetIndex,
+        values: Dict[str, object],
+        results: Optional[Dict[str, object]] = None
+    ) -> str:
+        """
+        生成修改后的工作表XML
+
+        Args:
+            index: 工作表索引
+            values: 要写入的单元格
+            results: 公式计算结果（None时不写缓存值，模板中未写入的公式单元格保持原样）
+        """
+        sheet = index.text
+        results = results if results is not None else {}
+        # (起点, 终点, 列号, 新内容)，同一位置的插入按列号排序
+        edits: List[Tuple[int, int, int, str]] = []
+        new_cells: Dict[int, List[Tuple[int, str]]] = {}
+
+        # 模板中未被写入的公式单元格：保留公式，更新缓存值
+        for address, result in results.items():
+            if address in index.formula_elements and address not in values:
+                start, end, style = index.cells[address]
+                type_attr, cached = self._cached_value_xml(result)
+                attrs = f' r="{address}"' + (f' s="{style}"' if style is not None else '')
+                edits.append((start, end, 0,
+                              f'<c{attrs}{type_attr}>{index.formula_elements[address]}{cached}</c>'))
+
+        for address, value in values.items():
+            if address in index.cells:
+                start, end, style = index.cells[address]
+                edits.append((start, end, 0, self._cell_xml(address, style, value, results.get(address))))
+                continue
+
+            # 模板中不存在的单元格：插入到所在行中（按列顺序）
+            col_letters, row_num = re.match(r'([A-Z]+)(\d+)', address).groups()
+            col_idx = column_index_from_string(col_letters)
+            row_num = int(row_num)
+            cell_xml = self._cell_xml(address, None, value, results.get(address))
+            row = index.rows.get(row_num)
+            if row is not None and row[2] is not None:
+                position = next((start for idx, start in row[3] if idx > col_idx), row[2])
+                edits.append((position, position, col_idx, cell_xml))
+            else:
+                new_cells.setdefault(row_num, []).append((col_idx, cell_xml))
+
+        # 自闭合的行展开后写入，不存在的行新建
+        for row_num, cells in new_cells.items():
+            content = ''.join(xml for _, xml in sorted(cells))
+            row = index.rows.get(row_num)
+            if row is not None:
+                row_start, row_end = row[0], row[1]
+                open_tag = sheet[row_start:row_end][:-2].rstrip()
+                edits.append((row_start, row_end, 0, f'{open_tag}>{content}</row>'))
+            else:
+                position = next(
+                    (r[0] for num, r in sorted(index.rows.items()) if num > row_num),
+                    index.sheet_data_end
+                )
+                edits.append((position, position, 0, f'<row r="{row_num}">{content}</row>'))
+
+        parts = []
+        cursor = 0
+        for start, end, _, text in sorted(edits, key=lambda e: e[:3]):
+            parts.append(sheet[cursor:start])
+            parts.append(text)
+            cursor = end
+        parts.append(sheet[cursor:])
+        return ''.join(parts)
+
+    def _cell_xml(self, address: str, style: Optional[str], value, result=None) -> str:
+        """生成单元格XML（公式单元格附带计算结果作为缓存值）"""
+        attrs = f' r="{address}"' + (f' s="{style}"' if style is not None else '')
+
+        if value is None:
+            return f'<c{attrs}/>'
+
+        if isinstance(value, bool):
+            return f'<c{attrs} t="b"><v>{int(value)}</v></c>'
+
+        if isinstance(value, Number):
+            number = float(value)
+            if number != number or number in (float('inf'), float('-inf')):
+                return f'<c{attrs}/>'
+            # 与openpyxl的数值格式一致
+            return f'<c{attrs}><v>{"%.16g" % number}</v></c>'
+
+        text = str(value)
+        if text.startswith('='):
+            type_attr, cached = self._cached_value_xml(result)
+            return f'<c{attrs}{type_attr}><f>{escape(text[1:])}</f>{cached}</c>'
+
+        return f'<c{attrs} t="inlineStr"><is><t xml:space="preserve">{escape(text)}</t></is></c>'
+
+    @staticmethod
+    def _cached_value_xml(result) -> Tuple[str, str]:
+        """公式缓存值的类型属性和<v>元素"""
+        if result is None:
+            return '', ''
+        if isinstance(result, FormulaError):
+            return ' t="e"', f'<v>{escape(result.code)}</v>'
+        if isinstance(result, bool):
+            return ' t="b"', f'<v>{int(result)}</v>'
+        if isinstance(result, str):
+            return ' t="str"', f'<v>{escape(result)}</v>'
+        number = float(result)
+        if number != number or number in (float('inf'), float('-inf')):
+            return ' t="e"', '<v>#NUM!</v>'
+        # 缓存值使用可精确还原的最短表示
+        return '', f'<v>{repr(number)}</v>'
+
+    def _patch_axis_scaling(self, chart: str, min_val: float, max_val: float) -> str:
+        """设置图表纵坐标轴（第一个数值轴）的最小值和最大值"""
+        def replace_scaling(match):
+            scaling = re.sub(r'<c:(?:max|min) [^>]*/>', '', match.group(2))
+            # 架构要求的子元素顺序: logBase, orientation, max, min
+            bounds = f'<c:max val="{"%.16g" % max_val}"/><c:min val="{"%.16g" % min_val}"/>'
+            anchor = (re.search(r'<c:orientation [^>]*/>', scaling)
+                      or re.search(r'<c:logBase [^>]*/>', scaling))
+            position = anchor.end() if anchor else 0
+            scaling = scaling[:position] + bounds + scaling[position:]
+            return f'{match.group(1)}{scaling}</c:scaling>'
+
+        return re.sub(
+            r'(<c:valAx>.*?<c:scaling>)(.*?)</c:scaling>', replace_scaling, chart, count=1, flags=re.S
+        )
+
+    def _patch_calc_settings(self, template: _CompiledTemplate) -> Dict[str, Optional[str]]:
+        """删除计算链并设置打开时完全重算（None表示删除该成员）"""
+        patched: Dict[str, Optional[str]] = {}
+
+        workbook = template.texts['xl/workbook.xml']
+        if '<calcPr' in workbook:
+            workbook = re.sub(
+                r'<calcPr([^>]*?)(/?)>',
+                lambda m: '<calcPr' + re.sub(r'\sfullCalcOnLoad="[^"]*"', '', m.group(1))
+                          + ' fullCalcOnLoad="1"' + m.group(2) + '>',
+                workbook, count=1
+            )
+        else:
+            workbook = workbook.replace('</workbook>', '<calcPr fullCalcOnLoad="1"/></workbook>')
+        patched['xl/workbook.xml'] = workbook
+
+        if any(info.filename == self.CALC_CHAIN for info in template.infos):
+            patched[self.CALC_CHAIN] = None
+            patched['xl/_rels/workbook.xml.rels'] = re.sub(
+                r'<Relationship [^>]*Target="calcChain.xml"[^>]*/>', '',
+                template.texts['xl/_rels/workbook.xml.rels']
+            )
+            patched['[Content_Types].xml'] = re.sub(
+                r'<Override [^>]*PartName="/xl/calcChain.xml"[^>]*/>', '',
+                template.texts['[Content_Types].xml']
+            )
+
+        return patched
+
+    def _write_zip(
+        self,
+        template: _CompiledTemplate,
+        patched: Dict[str, Optional[str]],
+        output_path: str
+    ):
+        """写出zip：修改过的成员重新压缩，其余成员复制原始压缩数据"""
+        central_directory = []
+        offset = 0
+
+        with open(output_path, 'wb') as f:
+            for info in template.infos:
+                if info.filename in patched:
+                    text = patched[info.filename]
+                    if text is None:
+                        continue
+                    content = text.encode('utf-8')
+                    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+                    data = compressor.compress(content) + compressor.flush()
+                    crc, file_size, method = zlib.crc32(content), len(content), zipfile.ZIP_DEFLATED
+                else:
+                    data = template.raw_member(info)
+                    crc, file_size, method = info.CRC, info.file_size, info.compress_type
+
+                name = info.filename.encode('utf-8')
+                # 大小已写入本地文件头，不使用数据描述符
+                flag_bits = (info.flag_bits & ~0x08) | (0x800 if not info.filename.isascii() else 0)
+                dos_time, dos_date = self._dos_datetime(info.date_time)
+
+                header = struct.pack(
+                    zipfile.structFileHeader, zipfile.stringFileHeader,
+                    20, 0, flag_bits, method, dos_time, dos_date,
+                    crc, len(data), file_size, len(name), 0
+                )
+                f.write(header)
+                f.write(name)
+                f.write(data)
+
+                central_directory.append(struct.pack(
+                    zipfile.structCentralDir, zipfile.stringCentralDir,
+                    20, info.create_system, 20, 0, flag_bits, method, dos_time, dos_date,
+                    crc, len(data), file_size, len(name), 0, 0, 0, 0, info.external_attr, offset
+                ) + name)
+                offset += len(header) + len(name) + len(data)
+
+            directory = b''.join(central_directory)
+            f.write(directory)
+            f.write(struct.pack(
+                zipfile.structEndArchive, zipfile.stringEndArchive,
+                0, 0, len(central_directory), len(central_directory), len(directory), offset, 0
+            ))
+
+    @staticmethod
+    def _dos_datetime(date_time: Tuple[int, int, int, int, int, int]) -> Tuple[int, int]:
+        """转换为zip使用的DOS时间和日期"""
+        year, month, day, hour, minute, second = date_time
+        dos_time = (hour << 11) | (minute << 5) | (second // 2)
+        dos_date = (max(year, 1980) - 1980) << 9 | (month << 5) | day
+        return dos_time, dos_date
@@ -3,5 +3,8 @@
 from .base_generator import BaseGenerator
 from .standard_generator import StandardGenerator
 from .reference_range_generator import ReferenceRangeGenerator
+from .annealing_generator import AnnealingGenerator
+from .strategy_chain import GenerationStrategyChain
 
-__all__ = ['BaseGenerator', 'StandardGenerator', 'ReferenceRangeGenerator']
+__all__ = ['BaseGenerator', 'StandardGenerator', 'ReferenceRangeGenerator', 'AnnealingGenerator',
+           'GenerationStrategyChain']
@@ -0,0 +1,309 @@
+"""模拟退火生成器"""
+
+import math
+import random
+from typing import Optional, List
+from .base_generator import BaseGenerator
+from .standard_generator import StandardGenerator
+from .reference_range_generator import ReferenceRangeGenerator
+from ..models.tolerance import Tolerance
+from ..models.control_limits import ControlLimits
+from ..models.spc_data import SPCData
+from ..models.search_outcome import SearchOutcome
+from ..calculators.incremental_candidate import IncrementalCandidate
+from ..processors.resolution_processor import ResolutionProcessor
+from ..config.constants import (
+    ANNEALING_MOVES_PER_ATTEMPT,
+    ANNEALING_MOVES_PER_RESTART,
+    ANNEALING_START_TEMPERATURE,
+    ANNEALING_END_TEMPERATURE
+)
+
+
+class AnnealingGenerator(BaseGenerator):
+    """
+    模拟退火生成器 - 从任意候选数据出发，通过局部调整最小化约束违反惩罚
+
+    惩罚项：
+    - Xbar超出参考范围的个数
+    - 参考范围内原始数据不足100个的差额
+    - CPK超出目标±0.03的部分（以0.01为单位）
+    - 判异准则违规数
+    惩罚降为0即满足全部要求。
+    """
+
+    # 惩罚权重
+    XBAR_WEIGHT = 10.0
+    RAW_WEIGHT = 1.0
+    CPK_WEIGHT = 1.0
+    VIOLATION_WEIGHT = 5.0
+
+    # 局部调整方式及其概率
+    MOVES = (('nudge', 0.45), ('shift', 0.25), ('resample', 0.15), ('swap', 0.15))
+
+    # 每隔多少步全量重算一次，消除浮点累积误差
+    REFRESH_INTERVAL = 1000
+
+    def __init__(self):
+        self.standard_generator = StandardGenerator()
+        self.reference_range_generator = ReferenceRangeGenerator()
+        self.resolution_processor = ResolutionProcessor()
+
+    def generate(
+        self,
+        tolerance: Tolerance,
+        control_limits: ControlLimits,
+        target_cpk: float,
+        resolution: Optional[float],
+        max_attempts: int = 4000,
+        ref_lower: Optional[float] = None,
+        ref_upper: Optional[float] = None,
+        **kwargs
+    ) -> Optional[SPCData]:
+        """
+        模拟退火生成SPC数据
+
+        Args:
+            tolerance: 公差信息
+            control_limits: 控制限
+            target_cpk: 目标CPK
+            resolution: 分辨率
+            max_attempts: 最大尝试次数（每次尝试折算为ANNEALING_MOVES_PER_ATTEMPT步局部调整）
+            ref_lower: 参考范围下限
+            ref_upper: 参考范围上限
+
+        Returns:
+            SPCData对象，失败返回None
+        """
+        outcome = self.search(
+            tolerance, control_limits, target_cpk, resolution, max_attempts,
+            ref_lower=ref_lower, ref_upper=ref_upper
+        )
+        return outcome.result or outcome.best
+
+    def search(
+        self,
+        tolerance: Tolerance,
+        control_limits: ControlLimits,
+        target_cpk: float,
+        resolution: Optional[float],
+        max_attempts: int,
+        seed: Optional[SPCData] = None,
+        ref_lower: Optional[float] = None,
+        ref_upper: Optional[float] = None,
+        **kwargs
+    ) -> SearchOutcome:
+        """
+        在尝试次数预算内进行模拟退火搜索
+
+        Args:
+            tolerance: 公差信息
+            control_limits: 控制限
+            target_cpk: 目标CPK
+            resolution: 分辨率
+            max_attempts: 尝试次数预算
+            seed: 起始候选数据（可选，第一轮从它出发）
+            ref_lower: 参考范围下限
+            ref_upper: 参考范围上限
+            **kwargs: 其他参数
+
+        Returns:
+            SearchOutcome对象
+        """
+        outcome = SearchOutcome()
+        total_moves = max_attempts * ANNEALING_MOVES_PER_ATTEMPT
+        moves_done = 0
+        best_diff = float('inf')
+
+        step = self.resolution_processor.get_resolution_step(resolution) or 0.001
+        step = max(step, 0.001)
+
+        while moves_done < total_moves:
+            if seed is not None:
+                measurement_data = seed.rounded_measurement_data
+                seed = None
+            else:
+                measurement_data = self._initial_data(
+                    tolerance, control_limits, resolution, ref_lower, ref_upper
+                )
+                if measurement_data is None:
+                    moves_done += ANNEALING_MOVES_PER_ATTEMPT
+                    continue
+
+            candidate = IncrementalCandidate(
+                measurement_data, tolerance, control_limits, ref_lower, ref_upper
+            )
+            penalty = self._penalty(candidate, target_cpk)
+
+            restart_moves = min(ANNEALING_MOVES_PER_RESTART, total_moves - moves_done)
+            cooling = (ANNEALING_END_TEMPERATURE / ANNEALING_START_TEMPERATURE) ** (1.0 / max(restart_moves, 1))
+            temperature = ANNEALING_START_TEMPERATURE
+
+            for move_index in range(restart_moves):
+                if penalty == 0:
+                    break
+
+                undo = self._apply_random_move(
+                    candidate, control_limits, resolution, step, ref_lower, ref_upper
+                )
+                new_penalty = self._penalty(candidate, target_cpk)
+                delta = new_penalty - penalty
+
+                if delta <= 0 or random.random() < math.exp(-delta / temperature):
+                    penalty = new_penalty
+                    best_diff = self._record_best(candidate, target_cpk, outcome, best_diff)
+                else:
+                    undo()
+
+                temperature *= cooling
+                if (move_index + 1) % self.REFRESH_INTERVAL == 0:
+                    candidate.refresh()
+                    penalty = self._penalty(candidate, target_cpk)
+
+            moves_done += move_index + 1
+
+            if penalty == 0:
+                # 全量重算确认，避免累积误差造成误判
+                candidate.refresh()
+                if self._penalty(candidate, target_cpk) == 0:
+                    outcome.result = candidate.to_spc_data()
+                    print(f"    模拟退火完成，参考范围内原始数据点: {candidate.raw_in_range_count}/125, "
+                          f"cpk = {candidate.cpk:.4f}")
+                    break
+
+        outcome.attempts = min(max_attempts, math.ceil(moves_done / ANNEALING_MOVES_PER_ATTEMPT))
+        return outcome
+
+    def _initial_data(
+        self,
+        tolerance: Tolerance,
+        control_limits: ControlLimits,
+        resolution: Optional[float],
+        ref_lower: Optional[float],
+        ref_upper: Optional[float]
+    ) -> Optional[List[List[float]]]:
+        """生成初始数据（不要求满足任何约束），返回舍入后的5x25矩阵"""
+        try:
+            if ref_lower is not None and ref_upper is not None:
+                x_values, _ = self.reference_range_generator._generate_x_values_with_reference_range(
+                    (ref_lower + ref_upper) / 2, ref_lower, ref_upper, control_limits
+                )
+            else:
+                x_values, _ = self.standard_generator._generate_natural_x_values(
+                    control_limits.cl, control_limits, tolerance
+                )
+            r_values = self.standard_generator._generate_natural_r_values(control_limits)
+
+            measurement_data = [
+                self.standard_generator._generate_natural_subgroup_data(
+                    x_values[i], r_values[i], control_limits
+                )
+                for i in range(25)
+            ]
+            measurement_data = list(map(list, zip(*measurement_data)))
+            return self.resolution_processor.apply_resolution_to_matrix(measurement_data, resolution)
+        except Exception:
+            return None
+
+    def _penalty(self, candidate: IncrementalCandidate, target_cpk: float) -> float:
+        """计算约束违反惩罚，满足全部要求时为0"""
+        penalty = self._constraint_penalty(candidate)
+        cpk_excess = abs(candidate.cpk - target_cpk) - 0.03
+        if cpk_excess > 0:
+            penalty += self.CPK_WEIGHT * cpk_excess / 0.01
+        return penalty
+
+    def _constraint_penalty(self, candidate: IncrementalCandidate) -> float:
+        """除CPK以外的约束违反惩罚"""
+        penalty = 0.0
+        penalty += self.XBAR_WEIGHT * (candidate.SUBGROUP_COUNT - candidate.xbar_in_range_count)
+        if candidate.ref_lower is not None and candidate.ref_upper is not None:
+            penalty += self.RAW_WEIGHT * max(0, 100 - candidate.raw_in_range_count)
+        penalty += self.VIOLATION_WEIGHT * candidate.violation_count
+        return penalty
+
+    def _record_best(
+        self,
+        candidate: IncrementalCandidate,
+        target_cpk: float,
+        outcome: SearchOutcome,
+        best_diff: float
+    ) -> float:
+        """记录满足除CPK外全部要求、CPK最接近目标的候选数据"""
+        if self._constraint_penalty(candidate) > 0:
+            return best_diff
+
+        diff = abs(candidate.cpk - target_cpk)
+        if diff < best_diff:
+            outcome.best = candidate.to_spc_data()
+            return diff
+        return best_diff
+
+    def _apply_random_move(
+        self,
+        candidate: IncrementalCandidate,
+        control_limits: ControlLimits,
+        resolution: Optional[float],
+        step: float,
+        ref_lower: Optional[float],
+        ref_upper: Optional[float]
+    ):
+        """
+        随机执行一次局部调整
+
+        Returns:
+            撤销该调整的函数
+        """
+        move = random.choices(
+            [name for name, _ in self.MOVES], weights=[weight for _, weight in self.MOVES]
+        )[0]
+        count = candidate.SUBGROUP_COUNT
+
+        if move == 'swap':
+            col_a, col_b = random.sample(range(count), 2)
+            candidate.swap_subgroups(col_a, col_b)
+            return lambda: candidate.swap_subgroups(col_a, col_b)
+
+        col = random.randrange(count)
+        max_steps = max(1, int(round(control_limits.sigma * 0.5 / step)))
+
+        if move == 'nudge':
+            row = random.randrange(candidate.SUBGROUP_SIZE)
+            delta = random.choice((-1, 1)) * random.randint(1, max_steps) * step
+            new_value = self._round(candidate.subgroups[col][row] + delta, resolution)
+            old_value = candidate.set_value(row, col, new_value)
+            return lambda: candidate.set_value(row, col, old_value)
+
+        if move == 'shift':
+            delta = random.choice((-1, 1)) * random.randint(1, max_steps) * step
+            values = [self._round(v + delta, resolution) for v in candidate.subgroups[col]]
+        else:
+            values = self._resample_subgroup(control_limits, resolution, ref_lower, ref_upper)
+
+        old_values = candidate.set_subgroup(col, values)
+        return lambda: candidate.set_subgroup(col, old_values)
+
+    def _resample_subgroup(
+        self,
+        control_limits: ControlLimits,
+        resolution: Optional[float],
+        ref_lower: Optional[float],
+        ref_upper: Optional[float]
+    ) -> List[float]:
+        """重新生成一个子组，子组均值落在参考范围与控制限的交集内"""
+        lower, upper = control_limits.lcl, control_limits.ucl
+        if ref_lower is not None and ref_upper is not None:
+            lower, upper = max(lower, ref_lower), min(upper, ref_upper)
+        x_mean = random.uniform(lower, upper) if lower < upper else control_limits.cl
+        r_value = random.uniform(control_limits.clr * 0.5, control_limits.clr * 1.2)
+
+        subgroup = self.standard_generator._generate_natural_subgroup_data(
+            x_mean, r_value, control_limits
+        )
+        return [self._round(v, resolution) for v in subgroup]
+
+    def _round(self, value: float, resolution: Optional[float]) -> float:
+        """按分辨率舍入，无分辨率时保留3位小数（与生成器一致）"""
+        if resolution is None:
+            return round(value, 3)
+        return self.resolution_processor.apply_resolution(value, resolution)
@@ -5,6 +5,7 @@ from typing import Optional
 from ..models.tolerance import Tolerance
 from ..models.control_limits import ControlLimits
 from ..models.spc_data import SPCData
+from ..models.search_outcome import SearchOutcome
 
 
 class BaseGenerator(ABC):
@@ -35,3 +36,31 @@ class BaseGenerator(ABC):
             SPCData对象，失败返回None
         """
         pass
+    
+    @abstractmethod
+    def search(
+        self,
+        tolerance: Tolerance,
+        control_limits: ControlLimits,
+        target_cpk: float,
+        resolution: Optional[float],
+        max_attempts: int,
+        seed: Optional[SPCData] = None,
+        **kwargs
+    ) -> SearchOutcome:
+        """
+        在尝试次数预算内搜索SPC数据（供生成策略链调用）
+        
+        Args:
+            tolerance: 公差信息
+            control_limits: 控制限
+            target_cpk: 目标CPK
+            resolution: 分辨率
+            max_attempts: 尝试次数预算
+            seed: 前一个策略得到的最佳候选数据（可作为起点）
+            **kwargs: 其他参数
+            
+        Returns:
+            SearchOutcome对象（包含满足要求的数据、最佳候选数据和实际尝试次数）
+        """
+        pass
@@ -7,6 +7,7 @@ from .base_generator import BaseGenerator
 from ..models.tolerance import Tolerance
 from ..models.control_limits import ControlLimits
 from ..models.spc_data import SPCData
+from ..models.search_outcome import SearchOutcome
 from ..calculators.cpk_calculator import CpkCalculator
 from ..calculators.eight_rules_checker import EightRulesChecker
 from ..processors.resolution_processor import ResolutionProcessor
@@ -50,162 +51,196 @@ class ReferenceRangeGenerator(BaseGenerator):
         Returns:
             SPCData对象，失败返回None
         """
+        outcome = self.search(
+            tolerance, control_limits, target_cpk, resolution, max_attempts,
+            ref_lower=ref_lower, ref_upper=ref_upper
+        )
+        return outcome.result or outcome.best
+    
+    def search(
+        self,
+        tolerance: Tolerance,
+        control_limits: ControlLimits,
+        target_cpk: float,
+        resolution: Optional[float],
+        max_attempts: int,
+        seed: Optional[SPCData] = None,
+        ref_lower: Optional[float] = None,
+        ref_upper: Optional[float] = None,
+        **kwargs
+    ) -> SearchOutcome:
+        """
+        在尝试次数预算内进行参考范围模式搜索
+        
+        Args:
+            tolerance: 公差信息
+            control_limits: 控制限
+            target_cpk: 目标CPK
+            resolution: 分辨率
+            max_attempts: 尝试次数预算
+            seed: 起始候选数据（随机抽样不使用）
+            ref_lower: 参考范围下限
+            ref_upper: 参考范围上限
+            
+        Returns:
+            SearchOutcome对象
+        """
+        outcome = SearchOutcome()
         if ref_lower is None or ref_upper is None:
-            return None
+            return outcome
         
         print(f"    使用参考分布范围模式: {ref_lower:.4f} - {ref_upper:.4f}")
         
         # 检查参考范围是否超差
         if tolerance.usl is not None and ref_upper > tolerance.usl:
             print(f"    请检查参考分布范围是否超差: 上限{ref_upper} > 公差上限{tolerance.usl}")
-            return None
+            return outcome
         
         if tolerance.lsl is not None and ref_lower < tolerance.lsl:
             print(f"    请检查参考分布范围是否超差: 下限{ref_lower} < 公差下限{tolerance.lsl}")
-            return None
-        
-        # 计算参考中心
-        ref_center = (ref_lower + ref_upper) / 2
-        ref_width = ref_upper - ref_lower
+            return outcome
         
         decimal_places = 3
-        best_result = None
         best_diff = float('inf')
         
         for attempt in range(max_attempts):
-            try:
-                # 生成X值，确保所有25个Xbar都在参考范围内
-                x_values, _ = self._generate_x_values_with_reference_range(
-                    ref_center, ref_lower, ref_upper, control_limits, decimal_places
-                )
-                
-                # 检查Xbar是否全部在参考范围内
-                xbar_all_in_range = all(ref_lower <= x <= ref_upper for x in x_values)
-                if not xbar_all_in_range:
-                    continue
-                
-                # 生成R值
-                r_values = self.standard_generator._generate_natural_r_values(control_limits, decimal_places)
-                
-                # 生成详细的测量数据，要求每个子组至少4/5个点在参考范围内
-                measurement_data = []
-                for i in range(25):
-                    subgroup = self._generate_subgroup_with_reference_requirement(
-                        x_values[i], r_values[i], control_limits,
-                        ref_lower, ref_upper, 5, decimal_places, min_points_in_range=4
-                    )
-                    measurement_data.append(subgroup)
-                
-                # 转置数据
-                measurement_data = list(map(list, zip(*measurement_data)))
-                
-                # 应用分辨率舍入
-                rounded_measurement_data = self.resolution_processor.apply_resolution_to_matrix(
-                    measurement_data, resolution
-                )
-                
-                # 计算原始数据在参考范围内的点数
-                raw_in_range_count, total_raw_points = self._count_raw_data_in_reference_range(
-                    rounded_measurement_data, ref_lower, ref_upper
-                )
-                
-                # 计算舍入后的数据的小数位数
-                max_decimal_places = self.resolution_processor.calculate_max_decimal_places(
-                    rounded_measurement_data
-                )
-                
-                # 使用组内标准差计算方法计算cpk
-                excel_cpk, excel_rbar, excel_sigma_within = self.cpk_calculator.calculate_cpk_excel_method(
-                    rounded_measurement_data, tolerance, resolution
-                )
-                
-                # 重新计算舍入后的x_values和r_values
-                rounded_x_values, rounded_r_values = self.standard_generator._recalculate_x_r_values(
-                    rounded_measurement_data
+            outcome.attempts = attempt + 1
+            candidate, accepted = self._generate_candidate(
+                tolerance, control_limits, target_cpk, resolution,
+                ref_lower, ref_upper, decimal_places
+            )
+            
+            if accepted:
+                raw_in_range_count, _ = self._count_raw_data_in_reference_range(
+                    candidate.rounded_measurement_data, ref_lower, ref_upper
                 )
-                
-                # 再次确认Xbar全部在参考范围内
-                xbar_all_in_range_rounded = all(ref_lower <= x <= ref_upper for x in rounded_x_values)
-                
-                # 检查判异准则
-                all_violations = self.rules_checker.check_all_rules(
-                    rounded_x_values, rounded_r_values, control_limits
+                print(f"    生成完成，参考范围内原始数据点: {raw_in_range_count}/125, Xbar全部在参考范围内")
+                print(f"    cpk = {candidate.actual_cpk:.4f}, Rbar = {candidate.rbar:.6f}, σ(组内) = {candidate.sigma_within:.6f}")
+                outcome.result = candidate
+                return outcome
+            
+            # 记录最佳尝试
+            if candidate is not None:
+                diff = abs(candidate.actual_cpk - target_cpk)
+                if diff < best_diff:
+                    best_diff = diff
+                    outcome.best = candidate
+        
+        if outcome.best is None:
+            print(f"    警告: 未找到符合参考分布范围严格要求的数据")
+        return outcome
+    
+    def _generate_candidate(
+        self,
+        tolerance: Tolerance,
+        control_limits: ControlLimits,
+        target_cpk: float,
+        resolution: Optional[float],
+        ref_lower: float,
+        ref_upper: float,
+        decimal_places: int = 3
+    ) -> Tuple[Optional[SPCData], bool]:
+        """
+        进行一次参考范围模式的生成尝试
+        
+        Args:
+            tolerance: 公差信息
+            control_limits: 控制限
+            target_cpk: 目标CPK
+            resolution: 分辨率
+            ref_lower: 参考范围下限
+            ref_upper: 参考范围上限
+            decimal_places: 小数位数
+            
+        Returns:
+            (候选数据, 是否满足全部要求) 元组，不满足参考范围或存在判异时候选数据为None
+        """
+        try:
+            ref_center = (ref_lower + ref_upper) / 2
+            
+            # 生成X值，确保所有25个Xbar都在参考范围内
+            x_values, _ = self._generate_x_values_with_reference_range(
+                ref_center, ref_lower, ref_upper, control_limits, decimal_places
+            )
+            
+            # 检查Xbar是否全部在参考范围内
+            xbar_all_in_range = all(ref_lower <= x <= ref_upper for x in x_values)
+            if not xbar_all_in_range:
+                return None, False
+            
+            # 生成R值
+            r_values = self.standard_generator._generate_natural_r_values(control_limits, decimal_places)
+            
+            # 生成详细的测量数据，要求每个子组至少4/5个点在参考范围内
+            measurement_data = []
+            for i in range(25):
+                subgroup = self._generate_subgroup_with_reference_requirement(
+                    x_values[i], r_values[i], control_limits,
+                    ref_lower, ref_upper, 5, decimal_places, min_points_in_range=4
                 )
-                
-                # 如果满足所有条件，使用这个数据
-                target_min = target_cpk - 0.03
-                target_max = target_cpk + 0.03
-                
-                if (xbar_all_in_range_rounded and
-                    raw_in_range_count >= 100 and
-                    target_min <= excel_cpk <= target_max and
-                    len(all_violations) == 0):
-                    
-                    print(f"    生成完成，参考范围内原始数据点: {raw_in_range_count}/125, Xbar全部在参考范围内")
-                    print(f"    cpk = {excel_cpk:.4f}, Rbar = {excel_rbar:.6f}, σ(组内) = {excel_sigma_within:.6f}")
-                    
-                    return SPCData(
-                        measurement_data=measurement_data,
-                        rounded_measurement_data=rounded_measurement_data,
-                        x_values=rounded_x_values,
-                        r_values=rounded_r_values,
-                        actual_cpk=excel_cpk,
-                        rbar=excel_rbar,
-                        sigma_within=excel_sigma_within,
-                        max_decimal_places=max_decimal_places,
-                        control_limits=control_limits
-                    )
-                
-                # 记录最佳尝试
-                if (xbar_all_in_range_rounded and
+                measurement_data.append(subgroup)
+            
+            # 转置数据
+            measurement_data = list(map(list, zip(*measurement_data)))
+            
+            # 应用分辨率舍入
+            rounded_measurement_data = self.resolution_processor.apply_resolution_to_matrix(
+                measurement_data, resolution
+            )
+            
+            # 计算原始数据在参考范围内的点数
+            raw_in_range_count, total_raw_points = self._count_raw_data_in_reference_range(
+                rounded_measurement_data, ref_lower, ref_upper
+            )
+            
+            # 计算舍入后的数据的小数位数
+            max_decimal_places = self.resolution_processor.calculate_max_decimal_places(
+                rounded_measurement_data
+            )
+            
+            # 使用组内标准差计算方法计算cpk
+            excel_cpk, excel_rbar, excel_sigma_within = self.cpk_calculator.calculate_cpk_excel_method(
+                rounded_measurement_data, tolerance, resolution
+            )
+            
+            # 重新计算舍入后的x_values和r_values
+            rounded_x_values, rounded_r_values = self.standard_generator._recalculate_x_r_values(
+                rounded_measurement_data
+            )
+            
+            # 再次确认Xbar全部在参考范围内
+            xbar_all_in_range_rounded = all(ref_lower <= x <= ref_upper for x in rounded_x_values)
+            
+            # 检查判异准则
+            all_violations = self.rules_checker.check_all_rules(
+                rounded_x_values, rounded_r_values, control_limits
+            )
+            
+            if not (xbar_all_in_range_rounded and
                     raw_in_range_count >= 100 and
                     len(all_violations) == 0):
-                    diff = abs(excel_cpk - target_cpk)
-                    if diff < best_diff:
-                        best_diff = diff
-                        best_cpk = excel_cpk
-                        best_result = SPCData(
-                            measurement_data=measurement_data,
-                            rounded_measurement_data=rounded_measurement_data,
-                            x_values=rounded_x_values,
-                            r_values=rounded_r_values,
-                            actual_cpk=excel_cpk,
-                            rbar=excel_rbar,
-                            sigma_within=excel_sigma_within,
-                            max_decimal_places=max_decimal_places,
-                            control_limits=control_limits
-                        )
+                return None, False
             
-            except Exception:
-                if attempt % 500 == 0 and attempt > 0:
-                    print(f"    尝试{attempt}次后仍在搜索...")
-                continue
-        
-        # 检查是否找到了符合要求的数据
-        if best_result:
-            return best_result
-        
-        print(f"    警告: 未找到符合参考分布范围严格要求的数据")
-        # 尝试标准模式作为后备
-        print(f"    尝试使用标准模式生成...")
-        
-        # 调用标准生成器作为后备
-        from .standard_generator import StandardGenerator
-        standard_gen = StandardGenerator()
-        fallback_result = standard_gen.generate(
-            tolerance=tolerance,
-            control_limits=control_limits,
-            target_cpk=target_cpk,
-            resolution=resolution,
-            max_attempts=max_attempts // 2
-        )
-        
-        if fallback_result:
-            print(f"    使用标准模式成功生成数据")
-            return fallback_result
+            candidate = SPCData(
+                measurement_data=measurement_data,
+                rounded_measurement_data=rounded_measurement_data,
+                x_values=rounded_x_values,
+                r_values=rounded_r_values,
+                actual_cpk=excel_cpk,
+                rbar=excel_rbar,
+                sigma_within=excel_sigma_within,
+                max_decimal_places=max_decimal_places,
+                control_limits=control_limits
+            )
+            
+            # 如果满足所有条件，使用这个数据
+            target_min = target_cpk - 0.03
+            target_max = target_cpk + 0.03
+            
+            return candidate, target_min <= excel_cpk <= target_max
         
-        print(f"    标准模式也未能生成数据")
-        return None
+        except Exception:
+            return None, False
     
     def _generate_x_values_with_reference_range(
         self,
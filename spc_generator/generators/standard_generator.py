@@ -7,6 +7,7 @@ from .base_generator import BaseGenerator
 from ..models.tolerance import Tolerance
 from ..models.control_limits import ControlLimits
 from ..models.spc_data import SPCData
+from ..models.search_outcome import SearchOutcome
 from ..calculators.control_limits_calculator import ControlLimitsCalculator
 from ..calculators.cpk_calculator import CpkCalculator
 from ..calculators.eight_rules_checker import EightRulesChecker
@@ -46,99 +47,148 @@ class StandardGenerator(BaseGenerator):
         Returns:
             SPCData对象，失败返回None
         """
-        decimal_places = 3
-        
-        # 计算中心值
-        center = tolerance.center or 0.0
+        outcome = self.search(
+            tolerance, control_limits, target_cpk, resolution, max_attempts
+        )
+        return outcome.result or outcome.best
+    
+    def search(
+        self,
+        tolerance: Tolerance,
+        control_limits: ControlLimits,
+        target_cpk: float,
+        resolution: Optional[float],
+        max_attempts: int,
+        seed: Optional[SPCData] = None,
+        **kwargs
+    ) -> SearchOutcome:
+        """
+        在尝试次数预算内进行标准模式搜索
         
-        best_result = None
+        Args:
+            tolerance: 公差信息
+            control_limits: 控制限
+            target_cpk: 目标CPK
+            resolution: 分辨率
+            max_attempts: 尝试次数预算
+            seed: 起始候选数据（随机抽样不使用）
+            
+        Returns:
+            SearchOutcome对象
+        """
+        decimal_places = 3
+        outcome = SearchOutcome()
         best_diff = float('inf')
         
         for attempt in range(max_attempts):
-            try:
-                # 生成X值和R值
-                x_values, _ = self._generate_natural_x_values(
-                    center, control_limits, tolerance, decimal_places, center_offset_sigma=0.2
-                )
-                r_values = self._generate_natural_r_values(control_limits, decimal_places)
-                
-                # 生成详细的测量数据
-                measurement_data = []
-                for i in range(25):
-                    subgroup = self._generate_natural_subgroup_data(
-                        x_values[i], r_values[i], control_limits, 5, decimal_places, allow_variation=0.05
-                    )
-                    measurement_data.append(subgroup)
-                
-                # 转置数据
-                measurement_data = list(map(list, zip(*measurement_data)))
-                
-                # 应用分辨率舍入
-                rounded_measurement_data = self.resolution_processor.apply_resolution_to_matrix(
-                    measurement_data, resolution
-                )
-                
-                # 计算舍入后的数据的小数位数
-                max_decimal_places = self.resolution_processor.calculate_max_decimal_places(
-                    rounded_measurement_data
-                )
-                
-                # 使用组内标准差计算方法计算cpk
-                excel_cpk, excel_rbar, excel_sigma_within = self.cpk_calculator.calculate_cpk_excel_method(
-                    rounded_measurement_data, tolerance, resolution
-                )
-                
-                # 重新计算舍入后的x_values和r_values
-                rounded_x_values, rounded_r_values = self._recalculate_x_r_values(rounded_measurement_data)
-                
-                # 使用八准则检查
-                all_violations = self.rules_checker.check_all_rules(
-                    rounded_x_values, rounded_r_values, control_limits
-                )
-                
-                # 如果满足条件，使用这个数据
-                target_min = target_cpk - 0.03
-                target_max = target_cpk + 0.03
-                
-                if target_min <= excel_cpk <= target_max and len(all_violations) == 0:
-                    return SPCData(
-                        measurement_data=measurement_data,
-                        rounded_measurement_data=rounded_measurement_data,
-                        x_values=rounded_x_values,
-                        r_values=rounded_r_values,
-                        actual_cpk=excel_cpk,
-                        rbar=excel_rbar,
-                        sigma_within=excel_sigma_within,
-                        max_decimal_places=max_decimal_places,
-                        control_limits=control_limits
-                    )
-                
-                # 记录最佳尝试
-                if len(all_violations) == 0:
-                    diff = abs(excel_cpk - target_cpk)
-                    if diff < best_diff:
-                        best_diff = diff
-                        best_result = SPCData(
-                            measurement_data=measurement_data,
-                            rounded_measurement_data=rounded_measurement_data,
-                            x_values=rounded_x_values,
-                            r_values=rounded_r_values,
-                            actual_cpk=excel_cpk,
-                            rbar=excel_rbar,
-                            sigma_within=excel_sigma_within,
-                            max_decimal_places=max_decimal_places,
-                            control_limits=control_limits
-                        )
+            outcome.attempts = attempt + 1
+            candidate, accepted = self._generate_candidate(
+                tolerance, control_limits, target_cpk, resolution, decimal_places
+            )
             
-            except Exception:
-                continue
+            if accepted:
+                outcome.result = candidate
+                return outcome
+            
+            # 记录最佳尝试
+            if candidate is not None:
+                diff = abs(candidate.actual_cpk - target_cpk)
+                if diff < best_diff:
+                    best_diff = diff
+                    outcome.best = candidate
+        
+        if outcome.best is None:
+            print(f"    警告: 未找到理想数据")
+        return outcome
+    
+    def _generate_candidate(
+        self,
+        tolerance: Tolerance,
+        control_limits: ControlLimits,
+        target_cpk: float,
+        resolution: Optional[float],
+        decimal_places: int = 3
+    ) -> Tuple[Optional[SPCData], bool]:
+        """
+        进行一次生成尝试
         
-        # 返回最佳结果
-        if best_result:
-            return best_result
+        Args:
+            tolerance: 公差信息
+            control_limits: 控制限
+            target_cpk: 目标CPK
+            resolution: 分辨率
+            decimal_places: 小数位数
+            
+        Returns:
+            (候选数据, 是否满足全部要求) 元组，存在判异时候选数据为None
+        """
+        try:
+            # 计算中心值
+            center = tolerance.center or 0.0
+            
+            # 生成X值和R值
+            x_values, _ = self._generate_natural_x_values(
+                center, control_limits, tolerance, decimal_places, center_offset_sigma=0.2
+            )
+            r_values = self._generate_natural_r_values(control_limits, decimal_places)
+            
+            # 生成详细的测量数据
+            measurement_data = []
+            for i in range(25):
+                subgroup = self._generate_natural_subgroup_data(
+                    x_values[i], r_values[i], control_limits, 5, decimal_places, allow_variation=0.05
+                )
+                measurement_data.append(subgroup)
+            
+            # 转置数据
+            measurement_data = list(map(list, zip(*measurement_data)))
+            
+            # 应用分辨率舍入
+            rounded_measurement_data = self.resolution_processor.apply_resolution_to_matrix(
+                measurement_data, resolution
+            )
+            
+            # 计算舍入后的数据的小数位数
+            max_decimal_places = self.resolution_processor.calculate_max_decimal_places(
+                rounded_measurement_data
+            )
+            
+            # 使用组内标准差计算方法计算cpk
+            excel_cpk, excel_rbar, excel_sigma_within = self.cpk_calculator.calculate_cpk_excel_method(
+                rounded_measurement_data, tolerance, resolution
+            )
+            
+            # 重新计算舍入后的x_values和r_values
+            rounded_x_values, rounded_r_values = self._recalculate_x_r_values(rounded_measurement_data)
+            
+            # 使用八准则检查
+            all_violations = self.rules_checker.check_all_rules(
+                rounded_x_values, rounded_r_values, control_limits
+            )
+            
+            if len(all_violations) > 0:
+                return None, False
+            
+            candidate = SPCData(
+                measurement_data=measurement_data,
+                rounded_measurement_data=rounded_measurement_data,
+                x_values=rounded_x_values,
+                r_values=rounded_r_values,
+                actual_cpk=excel_cpk,
+                rbar=excel_rbar,
+                sigma_within=excel_sigma_within,
+                max_decimal_places=max_decimal_places,
+                control_limits=control_limits
+            )
+            
+            # 如果满足条件，使用这个数据
+            target_min = target_cpk - 0.03
+            target_max = target_cpk + 0.03
+            
+            return candidate, target_min <= excel_cpk <= target_max
         
-        print(f"    警告: 未找到理想数据")
-        return None
+        except Exception:
+            return None, False
     
     def _generate_natural_x_values(
         self,
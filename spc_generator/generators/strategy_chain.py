@@ -0,0 +1,112 @@
+"""生成策略链 - 单一尝试次数预算下的统一后备调度"""
+
+from typing import Optional, Dict, List, Iterable
+from .base_generator import BaseGenerator
+from ..models.tolerance import Tolerance
+from ..models.control_limits import ControlLimits
+from ..models.spc_data import SPCData
+from ..config.constants import GENERATION_STRATEGY_SHARES
+
+
+class GenerationStrategyChain:
+    """
+    生成策略链
+
+    持有一个任务的全部尝试次数预算，按配置顺序依次运行各生成策略（同一策略只运行一次），
+    未用完的预算顺延给后续策略，最佳候选数据在策略之间共享（作为下一个策略的起点）。
+    后备策略只在前面的策略连一个候选数据都没有得到时才运行。
+    """
+
+    def __init__(
+        self,
+        strategies: Dict[str, BaseGenerator],
+        budget_shares: Optional[Dict[str, float]] = None
+    ):
+        """
+        Args:
+            strategies: 策略名称到生成器的映射
+            budget_shares: 各策略可使用的剩余预算比例（最后一个策略总是使用全部剩余预算）
+        """
+        self.strategies = strategies
+        self.budget_shares = budget_shares or GENERATION_STRATEGY_SHARES
+        self.attempts_used: Dict[str, int] = {}
+
+    def run(
+        self,
+        order: Iterable[str],
+        budget: int,
+        tolerance: Tolerance,
+        control_limits: ControlLimits,
+        target_cpk: float,
+        resolution: Optional[float],
+        ref_lower: Optional[float] = None,
+        ref_upper: Optional[float] = None,
+        fallback_strategies: Iterable[str] = ()
+    ) -> Optional[SPCData]:
+        """
+        按顺序运行策略
+
+        Args:
+            order: 策略运行顺序
+            budget: 总尝试次数预算
+            tolerance: 公差信息
+            control_limits: 控制限
+            target_cpk: 目标CPK
+            resolution: 分辨率
+            ref_lower: 参考范围下限
+            ref_upper: 参考范围上限
+            fallback_strategies: 后备策略（已有候选数据时跳过）
+
+        Returns:
+            满足全部要求的数据；都不满足时返回最佳候选数据；没有候选数据返回None
+        """
+        order = self._unique(order)
+        fallback_strategies = set(fallback_strategies)
+        self.attempts_used = {}
+
+        remaining = budget
+        best: Optional[SPCData] = None
+
+        for index, name in enumerate(order):
+            if remaining <= 0:
+                break
+
+            if name in fallback_strategies and best is not None:
+                continue
+
+            is_last = index == len(order) - 1
+            share = 1.0 if is_last else self.budget_shares.get(name, 1.0)
+            allotted = max(1, int(remaining * share))
+
+            outcome = self.strategies[name].search(
+                tolerance=tolerance,
+                control_limits=control_limits,
+                target_cpk=target_cpk,
+                resolution=resolution,
+                max_attempts=allotted,
+                seed=best,
+                ref_lower=ref_lower,
+                ref_upper=ref_upper
+            )
+            remaining -= outcome.attempts
+            self.attempts_used[name] = outcome.attempts
+
+            if outcome.result is not None:
+                return outcome.result
+
+            if outcome.best is not None and (
+                best is None or
+                abs(outcome.best.actual_cpk - target_cpk) < abs(best.actual_cpk - target_cpk)
+            ):
+                best = outcome.best
+
+        return best
+
+    @staticmethod
+    def _unique(order: Iterable[str]) -> List[str]:
+        """去除重复策略，保留首次出现的顺序"""
+        unique = []
+        for name in order:
+            if name not in unique:
+                unique.append(name)
+        return unique
@@ -1,9 +1,10 @@
 """SPC年度计划一键生成工具 - 主程序入口"""
 
+import importlib.util
 import os
 import sys
 import time
-from typing import Dict, List
+from typing import List, Optional
 from pathlib import Path
 
 # 获取主脚本所在目录（项目根目录）
@@ -46,25 +47,36 @@ def get_project_root():
 from .parsers.theoretical_value_parser import TheoreticalValueParser
 from .parsers.reference_range_parser import ReferenceRangeParser
 from .parsers.excel_plan_reader import ExcelPlanReader
+from .parsers.plan_cache import PlanCache
 from .calculators.control_limits_calculator import ControlLimitsCalculator
 from .generators.standard_generator import StandardGenerator
 from .generators.reference_range_generator import ReferenceRangeGenerator
+from .generators.annealing_generator import AnnealingGenerator
+from .generators.strategy_chain import GenerationStrategyChain
 from .processors.difficulty_evaluator import DifficultyEvaluator
+from .processors.feasibility_checker import FeasibilityChecker
 from .excel.template_handler import TemplateHandler
 from .excel.formula_restorer import FormulaRestorer
 from .excel.chart_adjuster import ChartAdjuster
 from .excel.worksheet_writer import WorksheetWriter
 from .services.spc_service import SPCService
 from .services.file_organizer import FileOrganizer
-from .services.plan_updater import PlanUpdater
+from .services.plan_run import PlanRun
+from .services.spc_pipeline import SPCPipeline
 from .utils.file_utils import FileUtils
 from .utils.logger import setup_logging, get_logger, get_log_file_path
-from .config.constants import MONTH_MAP, MONTH_NAME_MAP
+from .config.constants import MONTH_MAP, MONTH_NAME_MAP, SEARCH_ENGINE_MAP, OUTPUT_WRITER_MAP, OUTPUT_MODE_MAP, USE_PIPELINE, USE_PLAN_CACHE, USE_RERUN_MANIFEST
 
 
-def main():
-    """主程序入口"""
+def main(argv: Optional[List[str]] = None):
+    """
+    主程序入口
+    
+    Args:
+        argv: 计划文件所在目录或通配符（批量运行），None时使用命令行参数；为空时查找当前目录中的计划文件
+    """
     start_time = time.time()
+    plan_runs: List[PlanRun] = []
     
     try:
         print("=" * 60)
@@ -103,6 +115,7 @@ def main():
         choice = input().strip().upper()
         
         use_reference_range = (choice == 'Y')
+        search_engine = 'auto'
         
         if use_reference_range:
             print("已启用参考分布范围模式")
@@ -110,9 +123,34 @@ def main():
             print("  1. 125个原始数据中至少100个在参考范围内")
             print("  2. 25个Xbar全部在参考范围内")
             print("  3. 其他要求保持不变")
+            
+            # 询问参考范围模式的搜索引擎
+            print("选择搜索引擎 (A=自动, S=随机抽样, T=模拟退火, 默认A): ", end="")
+            search_engine = SEARCH_ENGINE_MAP.get(input().strip().upper(), 'auto')
+            print(f"搜索引擎: {search_engine}")
         else:
             print("使用标准模式")
         
+        # 询问输出文件组织方式和写入方式（月度工作簿固定由xlsxwriter生成）
+        print("输出文件组织 (F=每个任务一个文件, M=每月一个工作簿, 默认F): ", end="")
+        output_mode = OUTPUT_MODE_MAP.get(input().strip().upper(), 'files')
+        if output_mode == 'monthly':
+            output_writer = 'xlsxwriter'
+            print("每个月份生成一个工作簿，每个任务一个工作表")
+        else:
+            print("选择输出方式 (X=修改模板XML, W=xlsxwriter重新生成, O=openpyxl, 默认X): ", end="")
+            output_writer = OUTPUT_WRITER_MAP.get(input().strip().upper(), 'xml')
+            print(f"输出方式: {output_writer}")
+        
+        # xlsxwriter为可选依赖，未安装时改为每个任务一个文件、修改模板XML
+        if output_writer == 'xlsxwriter' and importlib.util.find_spec('xlsxwriter') is None:
+            print("未安装xlsxwriter（pip install xlsxwriter），改为每个任务一个文件、修改模板XML")
+            output_mode, output_writer = 'files', 'xml'
+        
+        # 询问是否更新年度计划文件（生成过程中即按批写入，中途中断也不会丢失已完成任务的结果）
+        update_choice = input("生成后更新SPC推进计划文件? (Y/N, 默认Y): ").strip().upper()
+        update_plan = (update_choice != 'N')
+        
         # 查找所需文件
         # #region agent log
         with open(log_path, 'a', encoding='utf-8') as f:
@@ -130,7 +168,14 @@ def main():
             }, ensure_ascii=False) + '\n')
         # #endregion
         
-        plan_file = file_utils.find_spc_plan_file()
+        # 命令行参数为目录或通配符时批量处理多个计划，否则查找当前目录中的计划文件
+        plan_args = sys.argv[1:] if argv is None else list(argv)
+        batch_mode = bool(plan_args)
+        if batch_mode:
+            plan_files = file_utils.find_plan_files(plan_args)
+        else:
+            plan_file = file_utils.find_spc_plan_file()
+            plan_files = [plan_file] if plan_file else []
         
         # #region agent log
         with open(log_path, 'a', encoding='utf-8') as f:
@@ -141,21 +186,27 @@ def main():
                 'location': 'main.py:70',
                 'message': '查找文件后',
                 'data': {
-                    'plan_file': plan_file,
+                    'plan_files': plan_files,
                     'search_dir': os.getcwd()
                 },
                 'timestamp': int(time.time() * 1000)
             }, ensure_ascii=False) + '\n')
         # #endregion
         
-        if not plan_file:
+        if not plan_files:
             print("错误: 未找到SPC推进计划文件")
-            print(f"当前目录文件列表: {[f for f in os.listdir('.') if f.endswith('.xlsx')]}")
+            if batch_mode:
+                print(f"查找范围: {plan_args}")
+            else:
+                print(f"当前目录文件列表: {[f for f in os.listdir('.') if f.endswith('.xlsx')]}")
             input("按回车键退出...")
             return
         
-        # 从计划文件名中提取计划名称（去掉扩展名）
-        plan_name = os.path.splitext(plan_file)[0]
+        # 从计划文件名中提取计划名称（去掉扩展名），批量运行时日志按计划数命名
+        if batch_mode:
+            plan_name = f"SPC批量生成_{len(plan_files)}个计划"
+        else:
+            plan_name = os.path.splitext(plan_files[0])[0]
         
         # 初始化日志系统
         logger = setup_logging(plan_name, project_root)
@@ -164,14 +215,22 @@ def main():
         logger.info("SPC文件批量生成工具 V3.4 (模块化版本)")
         logger.info("=" * 60)
         logger.info(f"工作目录: {os.getcwd()}")
-        logger.info(f"计划文件: {plan_file}")
+        for plan_file in plan_files:
+            logger.info(f"计划文件: {plan_file}")
         logger.info(f"日志文件: {log_file_path}")
         if use_reference_range:
-            logger.info("已启用参考分布范围模式")
+            logger.info(f"已启用参考分布范围模式，搜索引擎: {search_engine}")
         else:
             logger.info("使用标准模式")
+        logger.info(f"输出文件组织: {output_mode}, 输出方式: {output_writer}")
+        logger.info(f"用户选择更新计划文件: {update_choice}")
         
-        print(f"SPC推进计划文件: {plan_file}")
+        if batch_mode:
+            print(f"SPC推进计划文件: {len(plan_files)} 个")
+            for plan_file in plan_files:
+                print(f"  {plan_file}")
+        else:
+            print(f"SPC推进计划文件: {plan_files[0]}")
         
         template_file = file_utils.find_spc_template_file()
         if not template_file:
@@ -183,11 +242,6 @@ def main():
         
         print(f"SPC模板文件: {template_file}")
         
-        # 从文件名中提取车间名称和年份
-        workshop_name, year = file_utils.extract_workshop_name_and_year(plan_file)
-        print(f"年份: {year}, 车间: {workshop_name}")
-        logger.info(f"年份: {year}, 车间: {workshop_name}")
-        
         # 初始化各模块
         parser = TheoreticalValueParser()
         ref_range_parser = ReferenceRangeParser()
@@ -199,8 +253,14 @@ def main():
         chart_adjuster = ChartAdjuster()
         worksheet_writer = WorksheetWriter()
         difficulty_evaluator = DifficultyEvaluator()
-        
-        # 创建服务
+        feasibility_checker = FeasibilityChecker(difficulty_evaluator, calculator)
+        strategy_chain = GenerationStrategyChain({
+            'reference': reference_range_generator,
+            'annealing': AnnealingGenerator(),
+            'standard': standard_generator,
+        })
+        
+        # 创建服务（批量运行时各计划共用一个服务，模板只解析一次）
         spc_service = SPCService(
             parser=parser,
             ref_range_parser=ref_range_parser,
@@ -211,139 +271,212 @@ def main():
             formula_restorer=formula_restorer,
             chart_adjuster=chart_adjuster,
             worksheet_writer=worksheet_writer,
-            difficulty_evaluator=difficulty_evaluator
+            difficulty_evaluator=difficulty_evaluator,
+            feasibility_checker=feasibility_checker,
+            strategy_chain=strategy_chain,
+            output_writer=output_writer,
+            output_mode=output_mode
         )
         
-        # 读取计划文件
+        # 读取计划文件（多个计划时在子进程中同时读取）
         logger.info("开始读取计划文件...")
-        plan_reader = ExcelPlanReader()
-        tasks = plan_reader.read_tasks(plan_file)
-        approver_info = plan_reader.read_approver_info(plan_file)
-        
-        print(f"\n找到 {len(tasks)} 个任务")
-        logger.info(f"找到 {len(tasks)} 个任务")
-        
-        # 按月份分组任务
-        month_tasks: Dict[int, List] = {}
-        for task in tasks:
-            for month_name in task.month_status:
-                month_num = MONTH_MAP.get(month_name)
-                if month_num:
-                    if month_num not in month_tasks:
-                        month_tasks[month_num] = []
-                    month_tasks[month_num].append(task)
-        
-        print(f"按月份分组: {sorted(month_tasks.keys())}月")
-        logger.info(f"按月份分组: {sorted(month_tasks.keys())}月")
-        
-        # 存储所有结果
-        all_results = []
-        generated_files = []
-        
-        # 处理每个月份的任务
-        for month_num in sorted(month_tasks.keys()):
-            month_name = MONTH_NAME_MAP.get(month_num, f"{month_num}月")
-            month_tasks_list = month_tasks[month_num]
+        plan_cache = PlanCache()
+        if len(plan_files) > 1:
+            plan_contents = plan_cache.load_many(plan_files, parser, USE_PLAN_CACHE)
+            if any(plan_cache.hits):
+                print(f"使用计划解析缓存: {sum(plan_cache.hits)} 个计划文件未修改")
+                logger.info(f"使用计划解析缓存: {sum(plan_cache.hits)} 个计划文件未修改")
+        else:
+            plan_reader = ExcelPlanReader()
+            if USE_PLAN_CACHE:
+                # 计划文件内容和解析器版本都未变化时直接使用上次的解析结果（同时预先填入公差解析结果）
+                plan_contents = [plan_cache.load(plan_files[0], plan_reader, parser)]
+                if plan_cache.hit:
+                    print("使用计划解析缓存（计划文件未修改）")
+                    logger.info(f"使用计划解析缓存: {plan_cache.get_cache_path(plan_files[0])}")
+            else:
+                plan_contents = [plan_reader.read_plan_sheets(plan_files[0])]
+                # 整列批量解析理论值，生成时直接使用解析结果
+                parser.parse_all(task.theory for task in plan_contents[0][0])
+        
+        # 从文件名中提取车间名称和年份，批量运行时每个计划输出到各自的车间文件夹
+        plan_infos = []
+        for plan_file, content in zip(plan_files, plan_contents):
+            if isinstance(content, Exception):
+                print(f"错误: 读取计划文件失败: {plan_file}: {content}")
+                logger.error(f"读取计划文件失败: {plan_file}: {content}")
+                continue
+            # 整列批量解析参考分布范围，准备任务时直接使用解析结果
+            ref_range_parser.parse_all(task.reference_range for task in content[0])
+            workshop_name, year = file_utils.extract_workshop_name_and_year(os.path.basename(plan_file))
+            plan_infos.append((plan_file, content, workshop_name, year))
+        file_organizer = FileOrganizer()
+        if batch_mode:
+            output_roots = file_organizer.plan_workshop_folders([info[2] for info in plan_infos])
+        else:
+            output_roots = ["."] * len(plan_infos)
+        
+        plan_runs: List[PlanRun] = []
+        for (plan_file, (tasks, sheet_approvers), workshop_name, year), output_root in zip(plan_infos, output_roots):
+            plan_run = PlanRun(plan_file, tasks, sheet_approvers, workshop_name, year, output_root)
+            plan_runs.append(plan_run)
+            
+            if batch_mode:
+                print(f"\n{plan_file}")
+                print(f"  年份: {year}, 车间: {workshop_name}, 输出文件夹: {output_root}")
+                print(f"  找到 {len(tasks)} 个任务, 按月份分组: {sorted(plan_run.month_tasks.keys())}月")
+                if len(sheet_approvers) > 1:
+                    print(f"  计划工作表: {', '.join(sheet_approvers)}")
+            else:
+                print(f"年份: {year}, 车间: {workshop_name}")
+                print(f"\n找到 {len(tasks)} 个任务")
+                print(f"按月份分组: {sorted(plan_run.month_tasks.keys())}月")
+                if len(sheet_approvers) > 1:
+                    print(f"计划工作表: {', '.join(sheet_approvers)}")
+            logger.info(f"{plan_file}: 年份: {year}, 车间: {workshop_name}, 输出目录: {output_root}")
+            logger.info(f"找到 {len(tasks)} 个任务")
+            logger.info(f"按月份分组: {sorted(plan_run.month_tasks.keys())}月")
+            logger.info(f"计划工作表: {', '.join(sheet_approvers)}")
+            
+            # 预先规划输出目录
+            plan_run.plan_output_dirs(file_organizer, output_mode)
             
-            print(f"\n处理 {month_name}:")
-            print(f"  有 {len(month_tasks_list)} 个任务")
-            logger.info(f"开始处理 {month_name}，共 {len(month_tasks_list)} 个任务")
+            # 结果日志（上次运行中断时留下的结果可以先合并）和计划文件检查点
+            plan_run.start_journal(update_plan)
             
-            # 处理该月份的每个任务
-            for task_idx, task in enumerate(month_tasks_list):
-                print(f"\n  任务 {task_idx + 1}/{len(month_tasks_list)}:")
-                task_info = f"{task.product_model} - {task.process} - {task.inspection_item}"
-                logger.info(f"处理任务 {task_idx + 1}/{len(month_tasks_list)}: {task_info}")
+            # 重新运行：计划行未修改且输出文件仍在的任务复用上次的结果，只生成修改过的行
+            # （月度工作簿的每个文件包含整月的任务，不按行复用）
+            if USE_RERUN_MANIFEST and output_mode == 'files':
+                reused_count = plan_run.apply_manifest({
+                    'template': PlanCache.hash_file(template_file),
+                    'year': year,
+                    'workshop_name': workshop_name,
+                    'output_root': output_root,
+                    'sheet_approvers': sheet_approvers,
+                    'use_reference_range': use_reference_range,
+                    'search_engine': search_engine,
+                    'output_writer': output_writer,
+                }, use_reference_range)
+                if reused_count:
+                    print(f"复用 {reused_count} 个未修改任务的文件，需要生成 {plan_run.pending_count} 个")
+                    logger.info(f"复用 {reused_count} 个未修改任务的文件，需要生成 {plan_run.pending_count} 个")
+        
+        plan_runs_by_file = {plan_run.plan_file: plan_run for plan_run in plan_runs}
+        
+        if USE_PIPELINE:
+            # 流水线：数据生成在进程池中进行，渲染保存在线程池中进行，与下一个任务的准备同时执行；
+            # 批量运行时全部计划的任务共用一个流水线
+            pipeline = SPCPipeline(spc_service)
+            print(f"\n使用生成流水线: {pipeline.generate_workers}个生成进程, {pipeline.render_threads}个保存线程")
+            logger.info(f"使用生成流水线: {pipeline.generate_workers}个生成进程, {pipeline.render_threads}个保存线程")
+            
+            def on_result(job, result):
+                plan_runs_by_file[job.plan_file].record_result(job.task, job.month_num, result, use_reference_range)
+                logger.info(f"任务生成成功: {job.label} -> {os.path.basename(result[0])}")
+            
+            pipeline.run_plans(
+                plan_runs,
+                template_path=template_file,
+                on_result=on_result,
+                use_reference_range=use_reference_range,
+                search_engine=search_engine
+            )
+            if pipeline.failed_jobs:
+                logger.warning(f"{pipeline.failed_jobs} 个任务未生成文件")
+            
+            # 月度工作簿：全部任务写入后保存
+            if output_mode == 'monthly':
+                for monthly_path in spc_service.close_monthly_workbook():
+                    logger.info(f"月度工作簿已保存: {monthly_path}")
+        
+        else:
+            for plan_run in plan_runs:
+                if batch_mode:
+                    print(f"\n车间 {plan_run.workshop_name}: {plan_run.plan_file}")
+                    logger.info(f"开始处理车间 {plan_run.workshop_name}: {plan_run.plan_file}")
                 
-                # 为每个任务生成SPC文件
-                try:
-                    result = spc_service.generate_spc_file(
-                        task=task,
-                        month_num=month_num,
-                        year=year,
-                        workshop_name=workshop_name,
-                        template_path=template_file,
-                        approver_info=approver_info,
-                        use_reference_range=use_reference_range
-                    )
-                    
-                    if result:
-                        file_path, adjusted_target_cpk, difficulty, actual_cpk = result
-                        logger.info(f"任务 {task_idx + 1} 生成成功: {os.path.basename(file_path)}")
-                    else:
-                        logger.warning(f"任务 {task_idx + 1} 生成失败: 返回None")
-                        continue
-                except Exception as e:
-                    error_msg = f"任务 {task_idx + 1} 生成失败: {str(e)}"
-                    logger.error(error_msg, exc_info=True)
-                    print(f"  错误: {error_msg}")
-                    continue
+                # 处理每个月份的任务
+                for month_num in sorted(plan_run.pending_tasks.keys()):
+                    month_name = MONTH_NAME_MAP.get(month_num, f"{month_num}月")
+                    month_tasks_list = plan_run.pending_tasks[month_num]
+                
+                    print(f"\n处理 {month_name}:")
+                    print(f"  有 {len(month_tasks_list)} 个任务")
+                    logger.info(f"开始处理 {month_name}，共 {len(month_tasks_list)} 个任务")
                 
-                if result:
+                    # 处理该月份的每个任务
+                    for task_idx, task in enumerate(month_tasks_list):
+                        print(f"\n  任务 {task_idx + 1}/{len(month_tasks_list)}:")
+                        task_info = f"{task.product_model} - {task.process} - {task.inspection_item}"
+                        logger.info(f"处理任务 {task_idx + 1}/{len(month_tasks_list)}: {task_info}")
                     
-                    # 记录生成的文件
-                    file_info = {
-                        'month': month_num,
-                        'month_name': month_name,
-                        'filename': os.path.basename(file_path),
-                        'full_path': os.path.abspath(file_path),
-                        'product_model': task.product_model,
-                        'process': task.process,
-                        'inspection_item': task.inspection_item,
-                        'target_cpk': adjusted_target_cpk,
-                        'actual_cpk': actual_cpk,
-                        'difficulty': difficulty,
-                        'use_reference_range': use_reference_range
-                    }
-                    generated_files.append(file_info)
+                        # 为每个任务生成SPC文件
+                        try:
+                            result = spc_service.generate_spc_file(
+                                task=task,
+                                month_num=month_num,
+                                year=plan_run.year,
+                                workshop_name=plan_run.workshop_name,
+                                template_path=template_file,
+                                approver_info=plan_run.approver_for(task),
+                                use_reference_range=use_reference_range,
+                                search_engine=search_engine,
+                                output_dir=plan_run.output_dirs[month_num]
+                            )
+                        
+                            if result:
+                                logger.info(f"任务 {task_idx + 1} 生成成功: {os.path.basename(result[0])}")
+                            else:
+                                logger.warning(f"任务 {task_idx + 1} 生成失败: 返回None")
+                                continue
+                        except Exception as e:
+                            error_msg = f"任务 {task_idx + 1} 生成失败: {str(e)}"
+                            logger.error(error_msg, exc_info=True)
+                            print(f"  错误: {error_msg}")
+                            continue
                     
-                    # 记录结果用于更新原计划文件
-                    all_results.append({
-                        'row_index': task.row_index,
-                        'month_num': month_num,
-                        'actual_cpk': actual_cpk,
-                        'adjusted_target_cpk': adjusted_target_cpk,
-                        'difficulty': difficulty,
-                        'product_model': task.product_model,
-                        'process': task.process
-                    })
-        
-        # 按月份组织文件
-        if generated_files:
-            logger.info("开始按月份组织文件...")
-            file_organizer = FileOrganizer()
-            files_by_month = {}
-            for file_info in generated_files:
-                month_num = file_info['month']
-                if month_num not in files_by_month:
-                    files_by_month[month_num] = []
-                files_by_month[month_num].append(file_info['full_path'])
-            
-            file_organizer.organize_by_month(files_by_month)
-            logger.info(f"文件组织完成，共 {len(generated_files)} 个文件")
+                        plan_run.record_result(task, month_num, result, use_reference_range)
+                
+                    # 月度工作簿：当月任务全部写入后保存
+                    if output_mode == 'monthly':
+                        for monthly_path in spc_service.close_monthly_workbook(month_num):
+                            logger.info(f"{month_name} 月度工作簿已保存: {monthly_path}")
+        
         
         # 输出统计信息
         end_time = time.time()
         elapsed_time = end_time - start_time
+        generated_files = [file_info for plan_run in plan_runs for file_info in plan_run.generated_files]
         
         print("\n" + "=" * 60)
         print("处理完成!")
-        print(f"共生成 {len(generated_files)} 个SPC文件")
-        logger.info("处理完成!")
-        logger.info(f"共生成 {len(generated_files)} 个SPC文件")
-        
-        # 按月份分组统计
-        month_stats = {}
-        for file_info in generated_files:
-            month_name = file_info['month_name']
-            if month_name not in month_stats:
-                month_stats[month_name] = 0
-            month_stats[month_name] += 1
-        
-        for month_name in sorted(month_stats.keys(), key=lambda x: MONTH_MAP.get(x, 0)):
-            count = month_stats[month_name]
-            folder_status = "（已创建文件夹）" if count > 1 else ""
-            print(f"  {month_name}: {count}个文件{folder_status}")
+        if output_mode == 'monthly':
+            workbook_count = len({f['full_path'] for f in generated_files})
+            print(f"共生成 {len(generated_files)} 个SPC工作表（{workbook_count} 个月度工作簿）")
+            logger.info("处理完成!")
+            logger.info(f"共生成 {len(generated_files)} 个SPC工作表（{workbook_count} 个月度工作簿）")
+        else:
+            print(f"共生成 {len(generated_files)} 个SPC文件")
+            logger.info("处理完成!")
+            logger.info(f"共生成 {len(generated_files)} 个SPC文件")
+        
+        # 按车间、月份分组统计
+        for plan_run in plan_runs:
+            if batch_mode:
+                print(f"车间 {plan_run.workshop_name}（{plan_run.output_root}）: {len(plan_run.generated_files)}个")
+            month_stats = {}
+            for file_info in plan_run.generated_files:
+                month_name = file_info['month_name']
+                if month_name not in month_stats:
+                    month_stats[month_name] = 0
+                month_stats[month_name] += 1
+            
+            for month_name in sorted(month_stats.keys(), key=lambda x: MONTH_MAP.get(x, 0)):
+                count = month_stats[month_name]
+                month_num = MONTH_MAP.get(month_name, 0)
+                folder_status = "（已创建文件夹）" if plan_run.output_dirs.get(month_num, plan_run.output_root) != plan_run.output_root else ""
+                unit = "个工作表" if output_mode == 'monthly' else "个文件"
+                print(f"  {month_name}: {count}{unit}{folder_status}")
         
         # 统计参考分布范围模式使用情况
         ref_range_count = sum(
@@ -366,28 +499,36 @@ def main():
             for difficulty, count in difficulty_stats.items():
                 print(f"  {difficulty}: {count}个文件")
         
+        # 列出可行性预检查判定不可行或难度预测改用标准模式的任务
+        if spc_service.infeasible_tasks:
+            print("不可行或改用标准模式的任务:")
+            logger.info("不可行或改用标准模式的任务:")
+            for item in spc_service.infeasible_tasks:
+                month_name = MONTH_NAME_MAP.get(item['month'], f"{item['month']}月")
+                action_text = "已跳过" if item['action'] == 'skip' else "已转为标准模式"
+                task_text = f"{month_name} {item['product_model']} - {item['process']} - {item['inspection_item']}"
+                if batch_mode:
+                    task_text = f"{item['workshop_name']} {task_text}"
+                print(f"  {task_text}: {action_text}")
+                logger.info(f"  {task_text}: {action_text}")
+                for reason in item['reasons']:
+                    print(f"    {reason}")
+                    logger.info(f"    {reason}")
+        
         print(f"总耗时: {elapsed_time:.2f}秒")
         logger.info(f"总耗时: {elapsed_time:.2f}秒")
         
-        # 询问是否更新年度计划文件
-        if all_results:
-            print("\n" + "-" * 60)
-            update_choice = input("是否更新SPC推进计划文件? (Y/N, 默认Y): ").strip().upper()
-            logger.info(f"用户选择更新计划文件: {update_choice}")
-            
-            if update_choice != 'N':
-                logger.info("开始更新SPC推进计划文件...")
-                plan_updater = PlanUpdater()
-                plan_updater.update_spc_plan_file(plan_file, all_results)
-                logger.info("SPC推进计划文件更新完成")
-            else:
-                print("用户选择不更新SPC推进计划文件")
-                logger.info("用户选择不更新SPC推进计划文件")
+        # 更新年度计划文件：由各计划的结果日志合并生成最终的计划文件，成功后删除日志
+        for plan_run in plan_runs:
+            plan_run.finish(update_plan)
         
         print("=" * 60)
         logger.info(f"日志文件已保存: {log_file_path}")
         
     except Exception as e:
+        # 已完成任务的结果在结果日志中，先保存尚未写入的检查点
+        for plan_run in plan_runs:
+            plan_run.abort()
         error_msg = f"程序运行出错: {e}"
         print(error_msg)
         logger.error(error_msg, exc_info=True)
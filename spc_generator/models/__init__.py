@@ -4,5 +4,14 @@ from .tolerance import Tolerance, ToleranceType
 from .task import Task
 from .control_limits import ControlLimits
 from .spc_data import SPCData
+from .difficulty_prediction import DifficultyPrediction
+from .feasibility import FeasibilityResult
+from .search_outcome import SearchOutcome
+from .sheet_layout import SheetLayout, ChartLayout, SeriesLayout
+from .spc_job import SPCJob
 
-__all__ = ['Tolerance', 'ToleranceType', 'Task', 'ControlLimits', 'SPCData']
+__all__ = [
+    'Tolerance', 'ToleranceType', 'Task', 'ControlLimits', 'SPCData',
+    'DifficultyPrediction', 'FeasibilityResult', 'SearchOutcome',
+    'SheetLayout', 'ChartLayout', 'SeriesLayout', 'SPCJob'
+]
@@ -0,0 +1,36 @@
+"""难度预测数据模型"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class DifficultyPrediction:
+    """基于接受概率表的难度预测"""
+    strategy: str                                   # 生成策略: 'reference' / 'standard'
+    max_attempts: int                               # 尝试次数预算
+    acceptance_probability: Optional[float] = None  # 单次尝试的接受概率
+    candidate_probability: Optional[float] = None   # 单次尝试得到无判异候选数据的概率
+    attempts_per_second: Optional[float] = None     # 每秒尝试次数
+    redirect_reason: Optional[str] = None           # 从参考范围模式改用标准模式的原因（未改用时为None）
+    
+    @property
+    def expected_attempts(self) -> Optional[float]:
+        """预计尝试次数（接受概率的倒数）"""
+        if not self.acceptance_probability:
+            return None
+        return 1.0 / self.acceptance_probability
+    
+    @property
+    def expected_seconds(self) -> Optional[float]:
+        """预计耗时（秒）"""
+        if self.expected_attempts is None or not self.attempts_per_second:
+            return None
+        return self.expected_attempts / self.attempts_per_second
+    
+    @property
+    def max_seconds(self) -> Optional[float]:
+        """预算耗尽时的耗时（秒）"""
+        if not self.attempts_per_second:
+            return None
+        return self.max_attempts / self.attempts_per_second
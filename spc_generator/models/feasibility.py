@@ -0,0 +1,16 @@
+"""可行性检查结果数据模型"""
+
+from dataclasses import dataclass, field
+from typing import List
+
+
+@dataclass
+class FeasibilityResult:
+    """可行性检查结果"""
+    action: str = 'generate'                          # 处理方式: 'generate' / 'redirect' / 'skip'
+    reasons: List[str] = field(default_factory=list)  # 不可行原因
+
+    @property
+    def feasible(self) -> bool:
+        """是否可以按原模式生成"""
+        return self.action == 'generate'
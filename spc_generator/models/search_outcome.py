@@ -0,0 +1,13 @@
+"""搜索结果数据模型"""
+
+from dataclasses import dataclass
+from typing import Optional
+from .spc_data import SPCData
+
+
+@dataclass
+class SearchOutcome:
+    """一次生成搜索的结果"""
+    result: Optional[SPCData] = None  # 满足全部要求的数据
+    best: Optional[SPCData] = None    # 无判异但CPK未达标的最佳候选数据
+    attempts: int = 0                 # 实际消耗的尝试次数
@@ -0,0 +1,61 @@
+"""SPC工作表版式数据模型"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass
+class SeriesLayout:
+    """图表数据系列"""
+    row: int                           # 数据所在行（1开始）
+    first_col: int                     # 起始列（1开始）
+    last_col: int                      # 结束列（1开始）
+    line_width: Optional[float] = None # 线宽（磅），None为默认
+    dash_type: str = 'solid'           # 线型（xlsxwriter dash_type）
+    color: str = '#000000'             # 线条颜色
+    marker: str = 'none'               # 数据点标记（xlsxwriter marker type）
+    marker_size: Optional[int] = None  # 标记大小
+
+
+@dataclass
+class ChartLayout:
+    """折线图版式"""
+    role: str                                         # 'xbar' / 'r'
+    anchor: Tuple[int, int]                           # 左上角单元格 (行, 列)，0开始
+    offset: Tuple[int, int]                           # 左上角偏移 (x, y)，像素
+    size: Tuple[int, int]                             # 图表大小 (宽, 高)，像素
+    series: List[SeriesLayout] = field(default_factory=list)
+    fill_color: Optional[str] = None                  # 图表区填充色
+    gridline_color: Optional[str] = None              # 主要网格线颜色
+    number_format: str = 'General'                    # 纵坐标轴数字格式
+    tick_mark: str = 'outside'                        # 刻度线位置
+    font_name: Optional[str] = None                   # 坐标轴字体
+    font_size: Optional[float] = None                 # 坐标轴字号
+
+
+@dataclass
+class SheetLayout:
+    """
+    工作表版式：从模板提取一次，用于不加载模板直接生成SPC工作表
+
+    单元格按行优先顺序保存，行列号均为0开始。
+    """
+    sheet_name: str
+    default_font: Tuple[str, float]                                 # 默认字体 (名称, 字号)
+    default_row_height: Optional[float] = None
+    columns: List[Tuple[int, int, float]] = field(default_factory=list)   # (起始列, 结束列, 列宽)
+    row_heights: Dict[int, float] = field(default_factory=dict)
+    formats: List[Dict[str, object]] = field(default_factory=list)        # xlsxwriter格式属性
+    # (行, 列, 地址, 类型, 值, 格式序号)，类型为 'formula' / 'string' / 'number' / 'bool' / 'datetime' / 'blank'
+    cells: List[Tuple[int, int, str, str, object, Optional[int]]] = field(default_factory=list)
+    formulas: Dict[str, str] = field(default_factory=dict)               # 模板公式（不含"="）
+    values: Dict[str, object] = field(default_factory=dict)              # 模板常量值
+    merges: List[Tuple[int, int, int, int]] = field(default_factory=list)
+    comments: List[Tuple[int, int, str, str]] = field(default_factory=list)  # (行, 列, 内容, 作者)
+    freeze_panes: Optional[Tuple[int, int]] = None
+    print_area: Optional[str] = None
+    landscape: bool = False
+    paper_size: Optional[int] = None
+    print_scale: Optional[int] = None
+    margins: Dict[str, float] = field(default_factory=dict)
+    charts: List[ChartLayout] = field(default_factory=list)
@@ -0,0 +1,39 @@
+"""SPC生成任务数据模型"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from .task import Task
+from .tolerance import Tolerance
+from .control_limits import ControlLimits
+
+
+@dataclass
+class SPCJob:
+    """
+    已完成解析和控制限计算、确定了生成策略的任务
+
+    在生成流水线的各阶段之间传递（数据生成阶段会被发送到子进程，因此只包含可序列化的数据）。
+    """
+    task: Task
+    month_num: int
+    year: int
+    workshop_name: str
+    template_path: str
+    approver_info: Dict[str, str]
+    tolerance: Tolerance
+    control_limits: ControlLimits
+    adjusted_target_cpk: float
+    difficulty: str
+    max_attempts: int
+    strategy_order: List[str] = field(default_factory=list)
+    use_reference_range: bool = False
+    ref_lower: Optional[float] = None
+    ref_upper: Optional[float] = None
+    ref_center: Optional[float] = None
+    output_dir: str = "."                # 输出目录（预先规划的月份文件夹或当前目录）
+    plan_file: str = ""                  # 所属计划文件（批量运行时区分各计划的结果）
+
+    @property
+    def label(self) -> str:
+        """任务描述（产品型号 - 工序 - 检测项目）"""
+        return f"{self.task.product_model} - {self.task.process} - {self.task.inspection_item}"
@@ -17,6 +17,7 @@ class Task:
     equipment_no: str = ""
     target_cpk: float = 1.8
     month_status: Dict[str, bool] = field(default_factory=dict)
+    sheet_name: str = ""  # 所在工作表（一个计划文件有多个工作表时）
     
     def has_month(self, month_name: str) -> bool:
         """检查是否有该月份的任务"""
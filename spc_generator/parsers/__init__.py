@@ -3,5 +3,6 @@
 from .theoretical_value_parser import TheoreticalValueParser
 from .reference_range_parser import ReferenceRangeParser
 from .excel_plan_reader import ExcelPlanReader
+from .plan_cache import PlanCache
 
-__all__ = ['TheoreticalValueParser', 'ReferenceRangeParser', 'ExcelPlanReader']
+__all__ = ['TheoreticalValueParser', 'ReferenceRangeParser', 'ExcelPlanReader', 'PlanCache']
@@ -1,72 +1,204 @@
 """Excel计划文件读取器"""
 
 import re
-from typing import List, Dict
+from typing import Dict, List, Optional, Sequence, Tuple
 from openpyxl import load_workbook
+from openpyxl.utils import coordinate_to_tuple
 from ..models.task import Task
 from ..utils.validation_utils import ValidationUtils
+from ..config.constants import PLAN_MAX_BLANK_ROWS
+
+
+class _CellValue:
+    """_PlanCells中的单元格（只有value）"""
+    
+    __slots__ = ('value',)
+    
+    def __init__(self, value):
+        self.value = value
+
+
+class _PlanCells:
+    """
+    读取计划文件时收集的审批人查找用单元格
+    
+    每个单元格只用一个预编译的关键字正则判断是否含审批人关键字，命中的单元格按角色记入索引，
+    同时保存其右侧、下方单元格、固定位置的后备单元格和最后一行，
+    按 ws.cell(row, column) / ws['C15'] 的方式访问，其余单元格为空。
+    只收集有数据的行，max_row为最后一个有数据的行（不含只设置了格式的空行）。
+    """
+    
+    # 审批人后备查找位置
+    FALLBACK_CELLS = ['C15', 'B15', 'D15', 'C10', 'B10']
+    
+    def __init__(self, role_keywords: Dict[str, Sequence[str]]):
+        """
+        Args:
+            role_keywords: 角色到关键字列表的映射
+        """
+        self.role_keywords = role_keywords
+        self.keyword_pattern = re.compile('|'.join(
+            re.escape(keyword) for keywords in role_keywords.values() for keyword in keywords
+        ))
+        self.values: Dict[Tuple[int, int], object] = {}
+        # 角色 -> [(行, 列, 去除空白的文本, 文本中包含的该角色关键字)]，按行列顺序
+        self.hits: Dict[str, List[Tuple[int, int, str, List[str]]]] = {role: [] for role in role_keywords}
+        self.max_row = 0
+        self.last_row: Tuple = ()
+        self._fallback = {coordinate_to_tuple(address) for address in self.FALLBACK_CELLS}
+        self._previous_candidates: List[int] = []
+    
+    def add_row(self, row: int, values: Sequence):
+        """
+        收集一行
+        
+        Args:
+            row: 行号（1开始）
+            values: 该行各列的值（A列开始）
+        """
+        # 上一行关键字单元格的下方单元格
+        for col in self._previous_candidates:
+            if col <= len(values):
+                self.values[(row, col)] = values[col - 1]
+        self._previous_candidates = []
+        
+        for col, value in enumerate(values, start=1):
+            if (row, col) in self._fallback:
+                self.values[(row, col)] = value
+            if not value:
+                continue
+            text = str(value).strip()
+            if self.keyword_pattern.search(text):
+                for role, keywords in self.role_keywords.items():
+                    matched = [keyword for keyword in keywords if keyword in text]
+                    if matched:
+                        self.hits[role].append((row, col, text, matched))
+                self.values[(row, col)] = value
+                if col < len(values):
+                    self.values[(row, col + 1)] = values[col]
+                self._previous_candidates.append(col)
+        
+        self.max_row = row
+        self.last_row = tuple(values)
+    
+    def cell(self, row: int, column: int) -> _CellValue:
+        """按行列号获取单元格"""
+        if row == self.max_row and column <= len(self.last_row):
+            return _CellValue(self.last_row[column - 1])
+        return _CellValue(self.values.get((row, column)))
+    
+    def __getitem__(self, address: str) -> _CellValue:
+        return self.cell(*coordinate_to_tuple(address))
 
 
 class ExcelPlanReader:
     """Excel计划文件读取器"""
     
+    # 任务行从第3行开始
+    FIRST_TASK_ROW = 3
+    # 审批人关键字（按角色，同一单元格含多个关键字时按列表顺序尝试）
+    ROLE_KEYWORDS = {
+        'preparer': ['编制', '制表', '编制人', '制表人', 'preparer', 'author'],
+        'auditor': ['审核', '审核人', 'auditor', 'checker'],
+        'approver': ['批准', '批准人', '批准者', 'approver', 'approval'],
+    }
+    # 关键字后的姓名（预编译，按顺序尝试）: 关键字 -> 正则列表
+    NAME_PATTERNS = {
+        keyword: [
+            re.compile(rf'{re.escape(keyword)}[:：]\s*([^\s:：]+)'),
+            re.compile(rf'{re.escape(keyword)}\s+([^\s:：]+)'),
+            re.compile(rf'{re.escape(keyword)}\s*([^\s:：]+)$'),
+        ]
+        for keywords in ROLE_KEYWORDS.values() for keyword in keywords
+    }
+    
     def __init__(self):
         self.validator = ValidationUtils()
     
-    def read_tasks(self, workbook_path: str) -> List[Task]:
+    def read_plan(self, workbook_path: str) -> Tuple[List[Task], Dict[str, str]]:
         """
-        读取所有任务
+        读取全部任务和审批人信息（审批人为第一个计划工作表中的审批人）
         
         Args:
             workbook_path: Excel文件路径
             
         Returns:
-            任务列表
+            (任务列表, 审批人信息字典)
         """
-        wb = load_workbook(workbook_path, data_only=True)
-        ws = wb.active
+        tasks, sheet_approvers = self.read_plan_sheets(workbook_path)
+        return tasks, next(iter(sheet_approvers.values()))
+    
+    def read_plan_sheets(self, workbook_path: str) -> Tuple[List[Task], Dict[str, Dict[str, str]]]:
+        """
+        只读方式打开计划文件一次，依次读取每个符合计划格式的工作表（有任务行的工作表），
+        逐行读取任务（记录所在工作表），同时收集各工作表的审批人关键字单元格
         
-        tasks = []
-        for row in range(3, ws.max_row + 1):
-            product_model = ws.cell(row=row, column=2).value  # B列
-            if product_model is None or str(product_model).strip() == '':
-                continue
+        只读取工作表尺寸（dimension）范围内的行；许多计划表把格式设置到了很远的行，
+        连续PLAN_MAX_BLANK_ROWS个空行后即认为数据已经结束，不再读取后面的空行。
+        
+        Args:
+            workbook_path: Excel文件路径
             
-            product_model_str = str(product_model).strip()
-            if not product_model_str.startswith('NB'):
-                continue
+        Returns:
+            (全部工作表的任务列表, 工作表名称 -> 审批人信息字典)，
+            没有符合计划格式的工作表时审批人信息取自活动工作表
+        """
+        wb = load_workbook(workbook_path, read_only=True, data_only=True)
+        try:
+            tasks = []
+            sheet_approvers = {}
+            for ws in wb.worksheets:
+                sheet_tasks, approver_info = self._read_sheet(ws)
+                if sheet_tasks:
+                    tasks.extend(sheet_tasks)
+                    sheet_approvers[ws.title] = approver_info
             
-            # 读取任务信息
-            task = Task(
-                row_index=row,
-                product_model=product_model_str,
-                process=str(ws.cell(row=row, column=3).value).strip() if ws.cell(row=row, column=3).value else '',  # C列
-                theory=str(ws.cell(row=row, column=4).value).strip() if ws.cell(row=row, column=4).value else '',  # D列
-                reference_range=str(ws.cell(row=row, column=5).value).strip() if ws.cell(row=row, column=5).value else '',  # E列
-                inspection_item=str(ws.cell(row=row, column=6).value).strip() if ws.cell(row=row, column=6).value else '',  # F列
-                resolution=self.validator.safe_float_convert(ws.cell(row=row, column=7).value),  # G列
-                equipment_no=str(ws.cell(row=row, column=8).value).strip() if ws.cell(row=row, column=8).value else '',  # H列
-                target_cpk=self.validator.safe_float_convert(ws.cell(row=row, column=21).value) if ws.cell(row=row, column=21).value else 1.8,  # U列
-                month_status={}
-            )
+            if not sheet_approvers:
+                sheet_approvers[wb.active.title] = self._read_sheet(wb.active)[1]
+            return tasks, sheet_approvers
+        finally:
+            wb.close()
+    
+    def _read_sheet(self, ws) -> Tuple[List[Task], Dict[str, str]]:
+        """
+        逐行读取一个工作表的任务和审批人信息
+        
+        Args:
+            ws: 只读工作表
             
-            # 读取每个月份的状态 (I列到T列)
-            for col in range(9, 21):  # I列(9)到T列(20)
-                month_cell = ws.cell(row=row, column=col)
-                month_value = month_cell.value
-                
-                if month_value is not None:
-                    month_str = str(month_value).strip().upper()
-                    if month_str == 'N':
-                        # 计算月份索引: col-8 (因为I列是第1个月)
-                        month_index = col - 8
-                        month_name = f"{month_index}月"
-                        task.month_status[month_name] = True
+        Returns:
+            (任务列表, 审批人信息字典)
+        """
+        tasks = []
+        cells = _PlanCells(self.ROLE_KEYWORDS)
+        blank_rows = 0
+        for row, values in enumerate(ws.iter_rows(values_only=True), start=1):
+            if all(value is None or value == '' for value in values):
+                blank_rows += 1
+                if blank_rows >= PLAN_MAX_BLANK_ROWS:
+                    break
+                continue
+            blank_rows = 0
             
-            tasks.append(task)
+            if row >= self.FIRST_TASK_ROW:
+                task = self._parse_task_row(row, values, ws.title)
+                if task is not None:
+                    tasks.append(task)
+            cells.add_row(row, values)
         
-        wb.close()
-        return tasks
+        return tasks, self._get_approver_info_generic(cells)
+    
+    def read_tasks(self, workbook_path: str) -> List[Task]:
+        """
+        读取所有任务
+        
+        Args:
+            workbook_path: Excel文件路径
+            
+        Returns:
+            任务列表
+        """
+        return self.read_plan(workbook_path)[0]
     
     def read_approver_info(self, workbook_path: str) -> Dict[str, str]:
         """
@@ -78,12 +210,54 @@ class ExcelPlanReader:
         Returns:
             审批人信息字典 {'preparer': '', 'auditor': '', 'approver': ''}
         """
-        wb = load_workbook(workbook_path, data_only=True)
-        ws = wb.active
+        return self.read_plan(workbook_path)[1]
+    
+    def _parse_task_row(self, row: int, values: Sequence, sheet_name: str = "") -> Optional[Task]:
+        """
+        解析一行任务（B列为NB开头的产品型号）
         
-        approver_info = self._get_approver_info_generic(ws)
-        wb.close()
-        return approver_info
+        Args:
+            row: 行号
+            values: 该行各列的值（A列开始）
+            sheet_name: 所在工作表名称
+            
+        Returns:
+            任务，不是任务行时返回None
+        """
+        def value(col: int):
+            return values[col - 1] if col <= len(values) else None
+        
+        def text(col: int) -> str:
+            cell_value = value(col)
+            return str(cell_value).strip() if cell_value else ''
+        
+        product_model_str = text(2)  # B列
+        if not product_model_str.startswith('NB'):
+            return None
+        
+        target_cpk = value(21)  # U列
+        task = Task(
+            row_index=row,
+            product_model=product_model_str,
+            process=text(3),  # C列
+            theory=text(4),  # D列
+            reference_range=text(5),  # E列
+            inspection_item=text(6),  # F列
+            resolution=self.validator.safe_float_convert(value(7)),  # G列
+            equipment_no=text(8),  # H列
+            target_cpk=self.validator.safe_float_convert(target_cpk) if target_cpk else 1.8,
+            month_status={},
+            sheet_name=sheet_name
+        )
+        
+        # 读取每个月份的状态 (I列到T列)
+        for col in range(9, 21):  # I列(9)到T列(20)
+            month_value = value(col)
+            if month_value is not None and str(month_value).strip().upper() == 'N':
+                # 计算月份索引: col-8 (因为I列是第1个月)
+                task.month_status[f"{col - 8}月"] = True
+        
+        return task
     
     def read_month_names(self, workbook_path: str) -> Dict[int, str]:
         """
@@ -117,10 +291,13 @@ class ExcelPlanReader:
         wb.close()
         return month_names
     
-    def _get_approver_info_generic(self, ws) -> Dict[str, str]:
+    def _get_approver_info_generic(self, cells: _PlanCells) -> Dict[str, str]:
         """
         通用的审批人信息查找方法
         适用于各种SPC计划表格布局
+        
+        Args:
+            cells: 读取计划文件时收集的单元格
         """
         try:
             approver_info = {
@@ -129,103 +306,38 @@ class ExcelPlanReader:
                 'approver': ''
             }
             
-            preparer_keywords = ['编制', '制表', '编制人', '制表人', 'preparer', 'author']
-            auditor_keywords = ['审核', '审核人', 'auditor', 'checker']
-            approver_keywords = ['批准', '批准人', '批准者', 'approver', 'approval']
-            
-            max_row = ws.max_row
-            max_col = ws.max_column
+            def resolve(hits) -> str:
+                """按顺序从命中的单元格中提取姓名，返回第一个有效姓名"""
+                for row, col, cell_value, keywords in hits:
+                    for keyword in keywords:
+                        name = self._extract_name_from_cell(cell_value, keyword, row, col, cells)
+                        if name:
+                            return name
+                return ''
             
-            # 首先尝试从表格底部查找（最后10行）
-            search_rows = min(10, max_row)
-            start_row = max(1, max_row - search_rows + 1)
+            # 实际数据的最后一行（不含只设置了格式的空行）
+            max_row = cells.max_row
+            start_row = max(1, max_row - min(10, max_row) + 1)
             
-            for row in range(start_row, max_row + 1):
-                for col in range(1, max_col + 1):
-                    cell = ws.cell(row=row, column=col)
-                    if cell and cell.value:
-                        cell_value = str(cell.value).strip()
-                        
-                        if not approver_info['preparer']:
-                            for keyword in preparer_keywords:
-                                if keyword in cell_value:
-                                    name = self._extract_name_from_cell(cell_value, keyword, row, col, ws)
-                                    if name:
-                                        approver_info['preparer'] = name
-                                        break
-                        
-                        if not approver_info['auditor']:
-                            for keyword in auditor_keywords:
-                                if keyword in cell_value:
-                                    name = self._extract_name_from_cell(cell_value, keyword, row, col, ws)
-                                    if name:
-                                        approver_info['auditor'] = name
-                                        break
-                        
-                        if not approver_info['approver']:
-                            for keyword in approver_keywords:
-                                if keyword in cell_value:
-                                    name = self._extract_name_from_cell(cell_value, keyword, row, col, ws)
-                                    if name:
-                                        approver_info['approver'] = name
-                                        break
-            
-            # 如果没找到，扩大搜索范围（整个表格）
-            if not (approver_info['preparer'] and approver_info['auditor'] and approver_info['approver']):
-                for row in range(1, max_row + 1):
-                    if approver_info['preparer'] and approver_info['auditor'] and approver_info['approver']:
-                        break
-                    
-                    for col in range(1, max_col + 1):
-                        cell = ws.cell(row=row, column=col)
-                        if cell and cell.value:
-                            cell_value = str(cell.value).strip()
-                            
-                            if not approver_info['preparer']:
-                                for keyword in preparer_keywords:
-                                    if keyword in cell_value:
-                                        name = self._extract_name_from_cell(cell_value, keyword, row, col, ws)
-                                        if name:
-                                            approver_info['preparer'] = name
-                                            break
-                            
-                            if not approver_info['auditor']:
-                                for keyword in auditor_keywords:
-                                    if keyword in cell_value:
-                                        name = self._extract_name_from_cell(cell_value, keyword, row, col, ws)
-                                        if name:
-                                            approver_info['auditor'] = name
-                                            break
-                            
-                            if not approver_info['approver']:
-                                for keyword in approver_keywords:
-                                    if keyword in cell_value:
-                                        name = self._extract_name_from_cell(cell_value, keyword, row, col, ws)
-                                        if name:
-                                            approver_info['approver'] = name
-                                            break
+            # 各角色先在表格底部（最后10行）查找，没找到再在整个表格中查找
+            for role, hits in cells.hits.items():
+                approver_info[role] = (
+                    resolve([hit for hit in hits if hit[0] >= start_row]) or resolve(hits)
+                )
             
             # 如果仍然没有找到所有审批人，尝试从特定位置查找
             if not approver_info['preparer']:
-                common_preparer_cells = ['C15', 'B15', 'D15', 'C10', 'B10']
-                for cell_addr in common_preparer_cells:
-                    try:
-                        cell = ws[cell_addr]
-                        if cell and cell.value:
-                            cell_value = str(cell.value).strip()
-                            if not re.match(r'^\d+$', cell_value) and 2 <= len(cell_value) <= 10:
-                                approver_info['preparer'] = cell_value
-                                break
-                    except:
-                        pass
+                for cell_addr in cells.FALLBACK_CELLS:
+                    cell_value = cells[cell_addr].value
+                    if cell_value:
+                        cell_value = str(cell_value).strip()
+                        if not re.match(r'^\d+$', cell_value) and 2 <= len(cell_value) <= 10:
+                            approver_info['preparer'] = cell_value
+                            break
             
             # 如果没有找到任何审批人，尝试从最后一行提取
             if not any(approver_info.values()):
-                last_row_cells = []
-                for col in range(1, max_col + 1):
-                    cell = ws.cell(row=max_row, column=col)
-                    if cell and cell.value:
-                        last_row_cells.append(str(cell.value).strip())
+                last_row_cells = [str(value).strip() for value in cells.last_row if value]
                 
                 for text in last_row_cells:
                     if re.search(r'[\u4e00-\u9fff]{2,4}', text):
@@ -247,14 +359,8 @@ class ExcelPlanReader:
     def _extract_name_from_cell(self, cell_value: str, keyword: str, row: int, col: int, ws) -> str:
         """从单元格中提取姓名"""
         try:
-            patterns = [
-                rf'{keyword}[:：]\s*([^\s:：]+)',
-                rf'{keyword}\s+([^\s:：]+)',
-                rf'{keyword}\s*([^\s:：]+)$',
-            ]
-            
-            for pattern in patterns:
-                match = re.search(pattern, cell_value)
+            for pattern in self.NAME_PATTERNS[keyword]:
+                match = pattern.search(cell_value)
                 if match:
                     name = match.group(1).strip()
                     if self.validator.is_valid_name(name):
@@ -0,0 +1,180 @@
+"""计划解析缓存 - 计划文件内容不变时直接读取上次的解析结果，不再用openpyxl解析"""
+
+import hashlib
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+from .excel_plan_reader import ExcelPlanReader
+from .theoretical_value_parser import TheoreticalValueParser
+from ..models.task import Task
+from ..models.tolerance import Tolerance
+from ..utils.output_registry import OutputRegistry
+from ..config.constants import PLAN_CACHE_SUFFIX, PLAN_PARSER_VERSION
+
+
+def _load_plan_in_worker(
+    plan_path: str,
+    use_cache: bool
+) -> Tuple[List[Task], Dict[str, Dict[str, str]], Dict[str, Tolerance], bool]:
+    """在子进程中读取一个计划（返回公差解析结果，由主进程填入理论值解析器）"""
+    reader = ExcelPlanReader()
+    parser = TheoreticalValueParser()
+    if use_cache:
+        cache = PlanCache()
+        tasks, sheet_approvers = cache.load(plan_path, reader, parser)
+        hit = cache.hit
+    else:
+        tasks, sheet_approvers = reader.read_plan_sheets(plan_path)
+        hit = False
+    return tasks, sheet_approvers, parser.parse_all(task.theory for task in tasks), hit
+
+
+class PlanCache:
+    """
+    计划解析缓存
+
+    解析结果（全部计划工作表的任务列表、各工作表的审批人信息、各理论值解析得到的公差）以pickle保存在计划文件旁，
+    键为计划文件内容的SHA-256哈希和解析器版本（PLAN_PARSER_VERSION）：
+    计划文件被修改（包括生成后回写实际CPK）或解析逻辑升级后自动重新解析。
+    缓存文件损坏或无法写入时只打印警告，按无缓存处理。
+    """
+
+    HASH_CHUNK_SIZE = 1 << 20
+
+    def __init__(self, version: int = PLAN_PARSER_VERSION):
+        self.version = version
+        # 最近一次load是否命中缓存 / 最近一次load_many各计划是否命中缓存
+        self.hit = False
+        self.hits: List[bool] = []
+
+    def load(
+        self,
+        plan_path: str,
+        reader: ExcelPlanReader,
+        parser: TheoreticalValueParser
+    ) -> Tuple[List[Task], Dict[str, Dict[str, str]]]:
+        """
+        读取计划的全部工作表（优先使用缓存），并把公差解析结果预先填入理论值解析器
+
+        Args:
+            plan_path: 计划文件路径
+            reader: 计划文件读取器（缓存未命中时使用）
+            parser: 理论值解析器
+
+        Returns:
+            (任务列表, 工作表名称 -> 审批人信息字典)
+        """
+        cache_path = self.get_cache_path(plan_path)
+        file_hash = self.hash_file(plan_path)
+
+        entry = self._read_entry(cache_path, file_hash)
+        self.hit = entry is not None
+        if entry is not None:
+            parser.preload(entry['tolerances'])
+            return entry['tasks'], entry['sheet_approvers']
+
+        tasks, sheet_approvers = reader.read_plan_sheets(plan_path)
+        tolerances = parser.parse_all(task.theory for task in tasks)
+        self._write_entry(cache_path, {
+            'version': self.version,
+            'hash': file_hash,
+            'tasks': tasks,
+            'sheet_approvers': sheet_approvers,
+            'tolerances': tolerances,
+        })
+        return tasks, sheet_approvers
+
+    def load_many(
+        self,
+        plan_paths: Sequence[str],
+        parser: TheoreticalValueParser,
+        use_cache: bool = True,
+        max_workers: Optional[int] = None
+    ) -> List[Union[Tuple[List[Task], Dict[str, Dict[str, str]]], Exception]]:
+        """
+        同时读取多个计划（每个计划在一个子进程中读取），公差解析结果填入理论值解析器
+
+        Args:
+            plan_paths: 计划文件路径列表
+            parser: 理论值解析器
+            use_cache: 是否使用缓存
+            max_workers: 子进程数，None为CPU核数
+
+        Returns:
+            与plan_paths顺序相同的 (任务列表, 工作表名称 -> 审批人信息字典) 列表，读取出错的计划为异常对象
+        """
+        results = []
+        self.hits = []
+        with ProcessPoolExecutor(max_workers=min(len(plan_paths), max_workers or os.cpu_count() or 1)) as pool:
+            futures = [pool.submit(_load_plan_in_worker, path, use_cache) for path in plan_paths]
+            for future in futures:
+                try:
+                    tasks, sheet_approvers, tolerances, hit = future.result()
+                except Exception as e:
+                    results.append(e)
+                    self.hits.append(False)
+                    continue
+                parser.preload(tolerances)
+                results.append((tasks, sheet_approvers))
+                self.hits.append(hit)
+        return results
+
+    @staticmethod
+    def get_cache_path(plan_path: str) -> str:
+        """
+        缓存文件路径（计划文件所在目录下的隐藏文件）
+
+        Args:
+            plan_path: 计划文件路径
+
+        Returns:
+            缓存文件路径
+        """
+        directory, filename = os.path.split(plan_path)
+        return os.path.join(directory, f".{filename}{PLAN_CACHE_SUFFIX}")
+
+    @classmethod
+    def hash_file(cls, path: str) -> str:
+        """
+        计算文件内容的SHA-256哈希
+
+        Args:
+            path: 文件路径
+
+        Returns:
+            十六进制哈希字符串
+        """
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(cls.HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _read_entry(self, cache_path: str, file_hash: str) -> Optional[dict]:
+        """读取缓存，不存在、已失效或无法读取时返回None"""
+        if not os.path.exists(cache_path):
+            return None
+        try:
+            with open(cache_path, 'rb') as f:
+                entry = pickle.load(f)
+        except Exception as e:
+            print(f"警告: 计划缓存无法读取，重新解析计划文件: {e}")
+            return None
+        if not isinstance(entry, dict) or entry.get('version') != self.version or entry.get('hash') != file_hash:
+            return None
+        return entry
+
+    @staticmethod
+    def _write_entry(cache_path: str, entry: Dict[str, object]):
+        """原子写入缓存，失败时只打印警告"""
+        temp_path = None
+        try:
+            temp_path = OutputRegistry.create_temp_file(cache_path)
+            with open(temp_path, 'wb') as f:
+                pickle.dump(entry, f, pickle.HIGHEST_PROTOCOL)
+            OutputRegistry.commit(temp_path, cache_path)
+        except Exception as e:
+            if temp_path is not None:
+                OutputRegistry.discard(temp_path)
+            print(f"警告: 计划缓存无法保存: {e}")
@@ -1,7 +1,8 @@
 """参考范围解析器"""
 
 import re
-from typing import Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 from ..utils.validation_utils import ValidationUtils
 
@@ -9,35 +10,77 @@ from ..utils.validation_utils import ValidationUtils
 class ReferenceRangeParser:
     """参考分布范围解析器"""
     
+    # "数值-数值"格式
+    RANGE_PATTERN = re.compile(r'^([-+]?\d*\.?\d+)\s*[-~–—]\s*([-+]?\d*\.?\d+)$')
+    # 其他可能的格式
+    TILDE_RANGE_PATTERN = re.compile(r'^([-+]?\d*\.?\d+)\s*[~]\s*([-+]?\d*\.?\d+)$')
+    
     def __init__(self):
         self.validator = ValidationUtils()
+        # 解析结果缓存（读取计划后由parse_all整列预先填入）
+        self._cache: Dict[str, Tuple[Optional[float], Optional[float]]] = {}
     
-    def parse(self, range_str: str) -> Tuple[Optional[float], Optional[float]]:
+    def parse(self, range_str: str, use_cache: bool = True) -> Tuple[Optional[float], Optional[float]]:
         """
         解析参考分布范围字符串，格式如'52.992-52.999'
         
         Args:
             range_str: 参考范围字符串
+            use_cache: 是否使用缓存
             
         Returns:
             (下限, 上限) 元组
         """
-        if not range_str or pd.isna(range_str) or str(range_str).strip() == '':
+        # 移除可能的空格和特殊字符
+        range_str = self._normalize(range_str)
+        if not range_str:
             return None, None
         
-        range_str = str(range_str).strip()
+        if use_cache:
+            cached = self._cache.get(range_str)
+            if cached is not None:
+                return cached
         
-        # 移除可能的空格和特殊字符
-        range_str = re.sub(r'\s+', '', range_str)
+        result = self._parse_normalized(range_str)
+        if use_cache:
+            self._cache[range_str] = result
+        return result
+    
+    def parse_all(self, range_strs: Iterable) -> Dict[str, Tuple[Optional[float], Optional[float]]]:
+        """
+        批量解析一列参考分布范围（如计划文件E列），结果同时存入缓存：
+        去重后用pandas的str.extract向量化解析，数值不是普通写法的逐个解析，结果与parse相同
         
+        Args:
+            range_strs: 参考范围序列
+            
+        Returns:
+            去除空白的参考范围字符串 -> (下限, 上限)（空字符串不包含在内）
+        """
+        keys = [key for key in dict.fromkeys(self._normalize(range_str) for range_str in range_strs) if key]
+        lower, upper = self._parse_unique(keys)
+        results = {
+            key: (None, None) if np.isnan(lower[index]) else (float(lower[index]), float(upper[index]))
+            for index, key in enumerate(keys)
+        }
+        self._cache.update(results)
+        return results
+    
+    @staticmethod
+    def _normalize(range_str) -> str:
+        """与parse相同的预处理：移除全部空白，空值为空字符串"""
+        if not range_str or pd.isna(range_str):
+            return ''
+        return re.sub(r'\s+', '', str(range_str).strip())
+    
+    def _parse_normalized(self, range_str: str) -> Tuple[Optional[float], Optional[float]]:
+        """解析已移除空白的参考范围字符串"""
         # 匹配"数值-数值"格式
-        pattern = r'^([-+]?\d*\.?\d+)\s*[-~–—]\s*([-+]?\d*\.?\d+)$'
-        match = re.match(pattern, range_str)
+        match = self.RANGE_PATTERN.match(range_str)
         
         if not match:
             # 尝试其他可能的格式
-            pattern2 = r'^([-+]?\d*\.?\d+)\s*[~]\s*([-+]?\d*\.?\d+)$'
-            match = re.match(pattern2, range_str)
+            match = self.TILDE_RANGE_PATTERN.match(range_str)
         
         if match:
             try:
@@ -49,3 +92,32 @@ class ReferenceRangeParser:
                 pass
         
         return None, None
+    
+    def _parse_unique(self, keys: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        解析去重后的参考范围：普通数值写法向量化解析，其余逐个解析
+        
+        Args:
+            keys: 已移除空白、不重复的参考范围字符串
+            
+        Returns:
+            与keys顺序相同的 (下限数组, 上限数组)，无法解析的为NaN
+        """
+        series = pd.Series(keys, dtype=object)
+        extracted = series.str.extract(self.RANGE_PATTERN)
+        lower = self.validator.plain_float_column(extracted[0])
+        upper = self.validator.plain_float_column(extracted[1])
+        matched = extracted[0].notna().to_numpy()
+        plain = ~np.isnan(lower) & ~np.isnan(upper)
+        
+        # 上下限颠倒或相等时与parse相同，视为无法解析
+        invalid = plain & ~(lower < upper)
+        lower[invalid] = np.nan
+        upper[invalid] = np.nan
+        
+        # 数值不是普通写法的逐个解析
+        for position in np.flatnonzero(matched & ~plain):
+            parsed_lower, parsed_upper = self._parse_normalized(keys[position])
+            lower[position] = np.nan if parsed_lower is None else parsed_lower
+            upper[position] = np.nan if parsed_upper is None else parsed_upper
+        return lower, upper
@@ -1,47 +1,104 @@
 """理论值解析器 - 支持25+种公差格式"""
 
 import re
-from typing import Optional
+from collections import OrderedDict
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 from ..models.tolerance import Tolerance, ToleranceType
 from ..utils.validation_utils import ValidationUtils
+from ..config.constants import THEORY_PARSE_CACHE_SIZE
 
 
 class TheoreticalValueParser:
-    """理论值解析器 - 支持25+种公差格式"""
+    """
+    理论值解析器 - 支持25+种公差格式
+    
+    各解析策略的正则表达式预先编译。解析前先按首字符和是否含±、φ、比较符号、"-"、
+    "基值"、"上限/下限"等特征对字符串预分类，只按优先级依次运行该类字符串可能匹配的策略
+    （每类的策略列表只计算一次），结果与依次尝试全部策略相同。
+    解析结果保存在最多THEORY_PARSE_CACHE_SIZE条的LRU缓存中。
+    
+    批量解析（parse_all）先去重，常见格式（单边数值、≤上限、范围、不对称公差、对称公差）
+    用pandas的str.extract向量化解析，其余格式逐个解析，结果与逐个解析相同。
+    """
+    
+    # 预分类特征：字符串中出现的字符 -> 特征
+    FEATURE_CHARS = {
+        '±': '±', 'φ': 'φ', 'Φ': 'φ', '≤': '<', '＜': '<', '<': '<',
+        '-': '-', '°': '°', '/': '/', '(': '(', '（': '(',
+    }
+    # 需要单独区分的首字符（其余首字符按数字/其他分类）
+    LEAD_CHARS = frozenset('CcRrPpMm')
+    
+    BASE_LIMIT_PATTERN = re.compile(r'基值\s*[:：]\s*([0-9.]+)\s*[;；]\s*下限\s*[:：]\s*([0-9.]+)\s*[;；]\s*上限\s*[:：]\s*([0-9.]+)')
+    BASE_LIMIT_VARIANT_PATTERN = re.compile(r'([0-9.]+)\s*[;；]\s*下限\s*[:：]\s*([0-9.]+)\s*[;；]\s*上限\s*[:：]\s*([0-9.]+)')
+    LIMIT_ONLY_PATTERN = re.compile(r'下限\s*[:：]\s*([0-9.]+)\s*[;；]\s*上限\s*[:：]\s*([0-9.]+)')
+    MULTI_FEATURE_PATTERN = re.compile(r'^\s*(\d+)\s*-\s*(.+)$')
+    GEOMETRIC_PATTERN = re.compile(r'^\s*[≤≥＜＞<>]?\s*[φΦ]\s*([0-9.]+)\s*$')
+    GEOMETRIC_INEQUALITY_PATTERN = re.compile(r'^\s*[≤＜<]\s*[φΦ]?\s*([0-9.]+)\s*$')
+    ROUGHNESS_INEQUALITY_PATTERN = re.compile(r'^\s*[≤＜<]\s*(Ra|Rz|Pt|Pa|Ry|Rpk)\s*([0-9.]+)\s*$', re.IGNORECASE)
+    UNIT_NUMERIC_PATTERN = re.compile(r'^\s*([0-9.]+)\s*(mm|μm|°|度)?\s*$', re.IGNORECASE)
+    INEQUALITY_PATTERN = re.compile(r'^\s*[≤＜<]\s*([0-9.]+)\s*$')
+    ROUGHNESS_PATTERN = re.compile(r'^\s*(Ra|Rz|Pt|Pa|Ry|Rpk)\s*([0-9.]+)\s*$', re.IGNORECASE)
+    RANGE_SEARCH_PATTERN = re.compile(r'[φ]?\s*([0-9.]+)\s*-\s*[φ]?\s*([0-9.]+)')
+    RANGE_PATTERN = re.compile(r'^\s*[φ]?\s*[0-9.]+\s*-\s*[φ]?\s*[0-9.]+$')
+    ASYMMETRIC_PATTERN = re.compile(r'^\s*[φ]?\s*([0-9.]+)\s*[（(]\s*([+-]?[0-9.]+)\s*/\s*([+-]?[0-9.]+)\s*[）)]\s*$')
+    SYMMETRIC_PATTERN = re.compile(r'^\s*[φ]?\s*([0-9.]+)\s*[°]?\s*[（(]?\s*±\s*([0-9.]+)\s*[°]?[）)]?\s*$')
+    ANGLE_PATTERN = re.compile(r'([0-9.]+)\s*°\s*±\s*([0-9.]+)\s*°')
+    CHAMFER_PATTERN = re.compile(r'C\s*([0-9.]+)\s*±\s*([0-9.]+)')
+    CHAMFER_MAX_PATTERN = re.compile(r'C\s*([0-9.]+)\s*max', re.IGNORECASE)
+    RADIUS_PATTERN = re.compile(r'R\s*([0-9.]+)\s*±\s*([0-9.]+)')
+    MIN_PATTERN = re.compile(r'^min\s*([0-9.]+)$', re.IGNORECASE)
+    MAX_PATTERN = re.compile(r'^max\s*([0-9.]+)$', re.IGNORECASE)
+    THREAD_PATTERN = re.compile(r'[M]\d+')
+    # 批量解析用的范围格式（RANGE_PATTERN加上分组）
+    RANGE_GROUPS_PATTERN = re.compile(r'^\s*[φ]?\s*([0-9.]+)\s*-\s*[φ]?\s*([0-9.]+)$')
+    
+    # 批量解析时向量化处理的常见格式: (计算方式, 正则表达式, 数值分组)
+    # 匹配这些格式的字符串（"数量-规格"格式除外）逐个解析时命中的也是对应的策略
+    BULK_FORMATS = [
+        ('upper', UNIT_NUMERIC_PATTERN, (0,)),             # 0.025mm（策略9）
+        ('upper', GEOMETRIC_INEQUALITY_PATTERN, (0,)),     # ≤0.8、≤φ0.01（策略6/7/10）
+        ('range', RANGE_GROUPS_PATTERN, (0, 1)),           # 47.322-47.331（策略12）
+        ('asymmetric', ASYMMETRIC_PATTERN, (0, 1, 2)),     # 27.4（-0.05/-0.1）（策略13）
+        ('symmetric', SYMMETRIC_PATTERN, (0, 1)),          # φ3.5±0.1（策略14）
+    ]
     
     def __init__(self):
         self.validator = ValidationUtils()
-        # 解析策略列表（按优先级排序）
+        # 解析策略列表（按优先级排序）: (策略, 必须具有的特征, 允许的首字符分类，None为不限)
         self._strategies = [
-            self._parse_special_values,
-            self._parse_base_limit_format,
-            self._parse_base_limit_variant,
-            self._parse_limit_only,
-            self._parse_multi_feature,
-            self._parse_geometric_tolerance,
-            self._parse_geometric_inequality,
-            self._parse_roughness_inequality,
-            self._parse_unit_numeric,
-            self._parse_inequality,
-            self._parse_roughness,
-            self._parse_range_format,
-            self._parse_asymmetric_tolerance,
-            self._parse_symmetric_tolerance,
-            self._parse_angle_tolerance,
-            self._parse_chamfer_tolerance,
-            self._parse_chamfer_max,
-            self._parse_radius_tolerance,
-            self._parse_min_tolerance,
-            self._parse_max_tolerance,
-            self._parse_thread_spec,
-            self._parse_appearance_check,
-            self._parse_material_spec,
-            self._parse_simple_range,
-            self._parse_simple_numeric,
+            (self._parse_special_values, (), None),
+            (self._parse_base_limit_format, ('基值',), None),
+            (self._parse_base_limit_variant, ('上下限',), None),
+            (self._parse_limit_only, ('上下限',), None),
+            (self._parse_multi_feature, ('-',), ('数字',)),
+            (self._parse_geometric_tolerance, ('φ',), None),
+            (self._parse_geometric_inequality, ('<',), None),
+            (self._parse_roughness_inequality, ('<',), None),
+            (self._parse_unit_numeric, (), ('数字',)),
+            (self._parse_inequality, ('<',), None),
+            (self._parse_roughness, (), tuple('RrPp')),
+            (self._parse_range_format, ('-',), None),
+            (self._parse_asymmetric_tolerance, ('(', '/'), None),
+            (self._parse_symmetric_tolerance, ('±',), None),
+            (self._parse_angle_tolerance, ('±', '°'), None),
+            (self._parse_chamfer_tolerance, ('±',), ('C',)),
+            (self._parse_chamfer_max, (), tuple('Cc')),
+            (self._parse_radius_tolerance, ('±',), ('R',)),
+            (self._parse_min_tolerance, (), tuple('Mm')),
+            (self._parse_max_tolerance, (), tuple('Mm')),
+            (self._parse_thread_spec, (), ('M',)),
+            (self._parse_appearance_check, ('非ASCII',), None),
+            (self._parse_material_spec, (), None),
+            (self._parse_simple_range, ('-',), None),
+            (self._parse_simple_numeric, (), None),
         ]
-        # 缓存
-        self._cache = {}
+        # 预分类 -> 需要尝试的策略
+        self._dispatch: Dict[Tuple[str, FrozenSet[str]], Tuple[Callable[[str], Optional[Tolerance]], ...]] = {}
+        # 缓存（LRU）
+        self._cache: "OrderedDict[str, Tolerance]" = OrderedDict()
     
     def parse(self, theory_str: str, use_cache: bool = True) -> Tolerance:
         """
@@ -60,24 +117,168 @@ class TheoreticalValueParser:
         theory_str = str(theory_str).strip()
         
         # 检查缓存
-        if use_cache and theory_str in self._cache:
-            return self._cache[theory_str]
+        if use_cache:
+            cached = self._cache.get(theory_str)
+            if cached is not None:
+                self._cache.move_to_end(theory_str)
+                return cached
         
-        # 尝试每种解析策略
-        for strategy in self._strategies:
+        # 只尝试该类字符串可能匹配的解析策略
+        for strategy in self._strategies_for(theory_str):
             result = strategy(theory_str)
             if result is not None:
                 if use_cache:
-                    self._cache[theory_str] = result
+                    self._remember(theory_str, result)
                 return result
         
         # 无法解析，返回默认值
         print(f"警告: 无法解析理论值 '{theory_str}'，使用默认值")
         default = Tolerance(1.0, 0.0, ToleranceType.UPPER_ONLY, theory_str)
         if use_cache:
-            self._cache[theory_str] = default
+            self._remember(theory_str, default)
         return default
     
+    def parse_all(self, theory_strs) -> Dict[str, Tolerance]:
+        """
+        批量解析理论值（结果同时存入缓存）
+        
+        Args:
+            theory_strs: 理论值字符串序列
+            
+        Returns:
+            去除首尾空白的理论值字符串 -> Tolerance对象（空字符串不包含在内）
+        """
+        keys = [key for key in dict.fromkeys(self._normalize(theory_str) for theory_str in theory_strs) if key]
+        return dict(zip(keys, self._parse_unique(keys)))
+    
+    @staticmethod
+    def _normalize(theory_str) -> str:
+        """与parse相同的预处理：去除首尾空白，空值为空字符串"""
+        if not theory_str or pd.isna(theory_str):
+            return ''
+        return str(theory_str).strip()
+    
+    def _parse_unique(self, keys: List[str]) -> List[Tolerance]:
+        """
+        解析去重后的理论值：常见格式向量化解析，其余逐个解析
+        
+        Args:
+            keys: 去除首尾空白、不重复的理论值字符串
+            
+        Returns:
+            与keys顺序相同的Tolerance对象
+        """
+        results: List[Optional[Tolerance]] = [None] * len(keys)
+        series = pd.Series(keys, dtype=object)
+        # "数量-规格"格式（如 2-φ3.5±0.1）逐个解析时优先，不参与向量化解析
+        pending = ((series != '') & ~series.str.match(self.MULTI_FEATURE_PATTERN)).to_numpy(dtype=bool, copy=True)
+        
+        for kind, pattern, groups in self.BULK_FORMATS:
+            if not pending.any():
+                break
+            positions = np.flatnonzero(pending)
+            extracted = series.iloc[positions].str.extract(pattern)
+            matched = extracted[0].notna().to_numpy()
+            values = np.column_stack([self.validator.plain_float_column(extracted[group]) for group in groups])
+            usl, lsl, tolerance_type, valid = self._bulk_limits(kind, values)
+            # 匹配了格式的字符串不再尝试后面的格式；数值不是普通写法或不满足策略条件的逐个解析
+            pending[positions[matched]] = False
+            for index in np.flatnonzero(matched & valid):
+                key = keys[positions[index]]
+                tolerance = Tolerance(
+                    None if np.isnan(usl[index]) else float(usl[index]),
+                    None if np.isnan(lsl[index]) else float(lsl[index]),
+                    tolerance_type,
+                    key
+                )
+                results[positions[index]] = tolerance
+                self._remember(key, tolerance)
+        
+        # 其余格式逐个解析
+        for position, key in enumerate(keys):
+            if results[position] is None:
+                results[position] = self.parse(key)
+        return results
+    
+    @staticmethod
+    def _bulk_limits(kind: str, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, ToleranceType, np.ndarray]:
+        """
+        按格式计算向量化解析的规格限
+        
+        Args:
+            kind: 计算方式（upper/range/asymmetric/symmetric）
+            values: 数值分组（每列一个分组，不能转换的为NaN）
+            
+        Returns:
+            (USL数组, LSL数组, 公差类型, 与逐个解析结果相同的行)
+        """
+        complete = ~np.isnan(values).any(axis=1)
+        if kind == 'upper':
+            return values[:, 0], np.full(len(values), np.nan), ToleranceType.UPPER_ONLY, complete
+        if kind == 'range':
+            # 逐个解析时下限或上限为0的范围不由范围策略处理
+            return values[:, 1], values[:, 0], ToleranceType.DOUBLE, complete & (values[:, 0] != 0) & (values[:, 1] != 0)
+        if kind == 'asymmetric':
+            return values[:, 0] + values[:, 1], values[:, 0] + values[:, 2], ToleranceType.DOUBLE, complete
+        return values[:, 0] + values[:, 1], values[:, 0] - values[:, 1], ToleranceType.DOUBLE, complete
+    
+    def preload(self, tolerances: Dict[str, Tolerance]):
+        """
+        预先填入解析结果（如从计划缓存中读取的结果），之后解析相同的字符串直接返回
+        
+        Args:
+            tolerances: 理论值字符串 -> Tolerance对象
+        """
+        for theory_str, tolerance in tolerances.items():
+            self._remember(theory_str, tolerance)
+    
+    def _remember(self, theory_str: str, tolerance: Tolerance):
+        """存入LRU缓存，超过容量时删除最久未使用的结果"""
+        self._cache[theory_str] = tolerance
+        self._cache.move_to_end(theory_str)
+        if len(self._cache) > THEORY_PARSE_CACHE_SIZE:
+            self._cache.popitem(last=False)
+    
+    def classify(self, text: str) -> Tuple[str, FrozenSet[str]]:
+        """
+        预分类：首字符分类和字符串具有的特征
+        
+        Args:
+            text: 去除首尾空白的理论值字符串（非空）
+            
+        Returns:
+            (首字符分类, 特征集合)
+        """
+        first = text[0]
+        if first.isdigit() or first == '.':
+            lead = '数字'
+        elif first in self.LEAD_CHARS:
+            lead = first
+        else:
+            lead = '其他'
+        
+        features = {feature for char, feature in self.FEATURE_CHARS.items() if char in text}
+        if '基值' in text:
+            features.add('基值')
+        if '下限' in text and '上限' in text:
+            features.add('上下限')
+        if not text.isascii():
+            features.add('非ASCII')
+        return lead, frozenset(features)
+    
+    def _strategies_for(self, text: str) -> Tuple[Callable[[str], Optional[Tolerance]], ...]:
+        """该类字符串需要依次尝试的解析策略（按预分类计算一次后保存）"""
+        key = self.classify(text)
+        strategies = self._dispatch.get(key)
+        if strategies is None:
+            lead, features = key
+            strategies = tuple(
+                strategy for strategy, required, leads in self._strategies
+                if features.issuperset(required) and (leads is None or lead in leads)
+            )
+            self._dispatch[key] = strategies
+        return strategies
+    
     # 1. 处理特殊值
     def _parse_special_values(self, text: str) -> Optional[Tolerance]:
         """解析特殊值：OK、/、符合"""
@@ -88,7 +289,7 @@ class TheoreticalValueParser:
     # 2. 处理基值-下限-上限格式
     def _parse_base_limit_format(self, text: str) -> Optional[Tolerance]:
         """解析：基值:30.0；下限：29.947；上限：29.98"""
-        match = re.search(r'基值\s*[:：]\s*([0-9.]+)\s*[;；]\s*下限\s*[:：]\s*([0-9.]+)\s*[;；]\s*上限\s*[:：]\s*([0-9.]+)', text)
+        match = self.BASE_LIMIT_PATTERN.search(text)
         if match:
             lower_limit = self.validator.safe_float_convert(match.group(2))
             upper_limit = self.validator.safe_float_convert(match.group(3))
@@ -99,7 +300,7 @@ class TheoreticalValueParser:
     # 3. 处理基值-下限-上限变体格式
     def _parse_base_limit_variant(self, text: str) -> Optional[Tolerance]:
         """解析：30.0；下限：29.947；上限：29.98"""
-        match = re.search(r'([0-9.]+)\s*[;；]\s*下限\s*[:：]\s*([0-9.]+)\s*[;；]\s*上限\s*[:：]\s*([0-9.]+)', text)
+        match = self.BASE_LIMIT_VARIANT_PATTERN.search(text)
         if match:
             lower_limit = self.validator.safe_float_convert(match.group(2))
             upper_limit = self.validator.safe_float_convert(match.group(3))
@@ -110,7 +311,7 @@ class TheoreticalValueParser:
     # 4. 处理下限-上限格式
     def _parse_limit_only(self, text: str) -> Optional[Tolerance]:
         """解析：下限：29.947；上限：29.98"""
-        match = re.search(r'下限\s*[:：]\s*([0-9.]+)\s*[;；]\s*上限\s*[:：]\s*([0-9.]+)', text)
+        match = self.LIMIT_ONLY_PATTERN.search(text)
         if match:
             lower_limit = self.validator.safe_float_convert(match.group(1))
             upper_limit = self.validator.safe_float_convert(match.group(2))
@@ -121,7 +322,7 @@ class TheoreticalValueParser:
     # 5. 处理多特征格式
     def _parse_multi_feature(self, text: str) -> Optional[Tolerance]:
         """解析：2-φ3.5±0.1、2-120°±3°"""
-        match = re.match(r'^\s*(\d+)\s*-\s*(.+)$', text)
+        match = self.MULTI_FEATURE_PATTERN.match(text)
         if match:
             real_spec = match.group(2).strip()
             # 递归解析真实的公差部分
@@ -131,7 +332,7 @@ class TheoreticalValueParser:
     # 6. 优先处理形位公差
     def _parse_geometric_tolerance(self, text: str) -> Optional[Tolerance]:
         """解析：≤Φ0.04, Φ0.04, φ0.025"""
-        match = re.match(r'^\s*[≤≥＜＞<>]?\s*[φΦ]\s*([0-9.]+)\s*$', text)
+        match = self.GEOMETRIC_PATTERN.match(text)
         if match:
             value = self.validator.safe_float_convert(match.group(1))
             if value is not None:
@@ -141,7 +342,7 @@ class TheoreticalValueParser:
     # 7. 处理带比较符号的形位公差
     def _parse_geometric_inequality(self, text: str) -> Optional[Tolerance]:
         """解析：≤φ0.01"""
-        match = re.match(r'^\s*[≤＜<]\s*[φΦ]?\s*([0-9.]+)\s*$', text)
+        match = self.GEOMETRIC_INEQUALITY_PATTERN.match(text)
         if match:
             value = self.validator.safe_float_convert(match.group(1))
             if value is not None:
@@ -151,7 +352,7 @@ class TheoreticalValueParser:
     # 8. 处理带粗糙度符号和比较符号的格式
     def _parse_roughness_inequality(self, text: str) -> Optional[Tolerance]:
         """解析：≤Pt3.2, ≤Ra0.8, ≤Ry6.3, ≤Rpk0.2"""
-        match = re.match(r'^\s*[≤＜<]\s*(Ra|Rz|Pt|Pa|Ry|Rpk)\s*([0-9.]+)\s*$', text, re.IGNORECASE)
+        match = self.ROUGHNESS_INEQUALITY_PATTERN.match(text)
         if match:
             value = self.validator.safe_float_convert(match.group(2))
             if value is not None:
@@ -161,7 +362,7 @@ class TheoreticalValueParser:
     # 9. 处理带单位的简单数值公差
     def _parse_unit_numeric(self, text: str) -> Optional[Tolerance]:
         """解析：0.025mm"""
-        match = re.match(r'^\s*([0-9.]+)\s*(mm|μm|°|度)?\s*$', text, re.IGNORECASE)
+        match = self.UNIT_NUMERIC_PATTERN.match(text)
         if match:
             value = self.validator.safe_float_convert(match.group(1))
             if value is not None:
@@ -171,7 +372,7 @@ class TheoreticalValueParser:
     # 10. 处理带比较符号的公差
     def _parse_inequality(self, text: str) -> Optional[Tolerance]:
         """解析：≤0.8, ＜0.025"""
-        match = re.match(r'^\s*[≤＜<]\s*([0-9.]+)\s*$', text)
+        match = self.INEQUALITY_PATTERN.match(text)
         if match:
             value = self.validator.safe_float_convert(match.group(1))
             if value is not None:
@@ -181,7 +382,7 @@ class TheoreticalValueParser:
     # 11. 粗糙度公差格式
     def _parse_roughness(self, text: str) -> Optional[Tolerance]:
         """解析：Ra0.8, Pt3.2, Ry6.3, Rpk0.2"""
-        match = re.match(r'^\s*(Ra|Rz|Pt|Pa|Ry|Rpk)\s*([0-9.]+)\s*$', text, re.IGNORECASE)
+        match = self.ROUGHNESS_PATTERN.match(text)
         if match:
             value = self.validator.safe_float_convert(match.group(2))
             if value is not None:
@@ -192,9 +393,9 @@ class TheoreticalValueParser:
     def _parse_range_format(self, text: str) -> Optional[Tolerance]:
         """解析：47.322-47.331 或 57.67-57.70"""
         if '-' in text:
-            range_match = re.findall(r'[φ]?\s*([0-9.]+)\s*-\s*[φ]?\s*([0-9.]+)', text)
+            range_match = self.RANGE_SEARCH_PATTERN.findall(text)
             if range_match:
-                if re.match(r'^\s*[φ]?\s*[0-9.]+\s*-\s*[φ]?\s*[0-9.]+$', text):
+                if self.RANGE_PATTERN.match(text):
                     min_val = self.validator.safe_float_convert(range_match[0][0])
                     max_val = self.validator.safe_float_convert(range_match[0][1])
                     if min_val and max_val:
@@ -204,7 +405,7 @@ class TheoreticalValueParser:
     # 13. 不对称公差格式
     def _parse_asymmetric_tolerance(self, text: str) -> Optional[Tolerance]:
         """解析：27.4（-0.05/-0.1）"""
-        match = re.match(r'^\s*[φ]?\s*([0-9.]+)\s*[（(]\s*([+-]?[0-9.]+)\s*/\s*([+-]?[0-9.]+)\s*[）)]\s*$', text)
+        match = self.ASYMMETRIC_PATTERN.match(text)
         if match:
             base_value = self.validator.safe_float_convert(match.group(1))
             upper_tol = self.validator.safe_float_convert(match.group(2))
@@ -218,7 +419,7 @@ class TheoreticalValueParser:
     # 14. 对称公差格式
     def _parse_symmetric_tolerance(self, text: str) -> Optional[Tolerance]:
         """解析：φ3.5±0.1"""
-        match = re.match(r'^\s*[φ]?\s*([0-9.]+)\s*[°]?\s*[（(]?\s*±\s*([0-9.]+)\s*[°]?[）)]?\s*$', text)
+        match = self.SYMMETRIC_PATTERN.match(text)
         if match:
             base_value = self.validator.safe_float_convert(match.group(1))
             tolerance = self.validator.safe_float_convert(match.group(2))
@@ -231,7 +432,7 @@ class TheoreticalValueParser:
     # 15. 角度公差
     def _parse_angle_tolerance(self, text: str) -> Optional[Tolerance]:
         """解析：120°±3°"""
-        match = re.match(r'([0-9.]+)\s*°\s*±\s*([0-9.]+)\s*°', text)
+        match = self.ANGLE_PATTERN.match(text)
         if match:
             base_value = self.validator.safe_float_convert(match.group(1))
             tolerance = self.validator.safe_float_convert(match.group(2))
@@ -244,7 +445,7 @@ class TheoreticalValueParser:
     # 16. 倒角公差格式
     def _parse_chamfer_tolerance(self, text: str) -> Optional[Tolerance]:
         """解析：C0.3±0.2"""
-        match = re.match(r'C\s*([0-9.]+)\s*±\s*([0-9.]+)', text)
+        match = self.CHAMFER_PATTERN.match(text)
         if match:
             base_value = self.validator.safe_float_convert(match.group(1))
             tolerance = self.validator.safe_float_convert(match.group(2))
@@ -257,7 +458,7 @@ class TheoreticalValueParser:
     # 17. 倒角最大值格式
     def _parse_chamfer_max(self, text: str) -> Optional[Tolerance]:
         """解析：C0.3max"""
-        match = re.match(r'C\s*([0-9.]+)\s*max', text, re.IGNORECASE)
+        match = self.CHAMFER_MAX_PATTERN.match(text)
         if match:
             value = self.validator.safe_float_convert(match.group(1))
             if value is not None:
@@ -267,7 +468,7 @@ class TheoreticalValueParser:
     # 18. 圆角公差
     def _parse_radius_tolerance(self, text: str) -> Optional[Tolerance]:
         """解析：R1.5±0.3"""
-        match = re.match(r'R\s*([0-9.]+)\s*±\s*([0-9.]+)', text)
+        match = self.RADIUS_PATTERN.match(text)
         if match:
             base_value = self.validator.safe_float_convert(match.group(1))
             tolerance = self.validator.safe_float_convert(match.group(2))
@@ -280,7 +481,7 @@ class TheoreticalValueParser:
     # 19. 最小值公差
     def _parse_min_tolerance(self, text: str) -> Optional[Tolerance]:
         """解析：min25"""
-        match = re.match(r'^min\s*([0-9.]+)$', text, re.IGNORECASE)
+        match = self.MIN_PATTERN.match(text)
         if match:
             value = self.validator.safe_float_convert(match.group(1))
             if value is not None:
@@ -290,7 +491,7 @@ class TheoreticalValueParser:
     # 20. 最大值公差
     def _parse_max_tolerance(self, text: str) -> Optional[Tolerance]:
         """解析：max50"""
-        match = re.match(r'^max\s*([0-9.]+)$', text, re.IGNORECASE)
+        match = self.MAX_PATTERN.match(text)
         if match:
             value = self.validator.safe_float_convert(match.group(1))
             if value is not None:
@@ -300,7 +501,7 @@ class TheoreticalValueParser:
     # 21. 螺纹规格
     def _parse_thread_spec(self, text: str) -> Optional[Tolerance]:
         """解析：M8"""
-        match = re.match(r'[M]\d+', text)
+        match = self.THREAD_PATTERN.match(text)
         if match:
             return Tolerance(None, None, ToleranceType.NONE, text)
         return None
@@ -3,5 +3,6 @@
 from .resolution_processor import ResolutionProcessor
 from .data_formatter import DataFormatter
 from .difficulty_evaluator import DifficultyEvaluator
+from .feasibility_checker import FeasibilityChecker
 
-__all__ = ['ResolutionProcessor', 'DataFormatter', 'DifficultyEvaluator']
+__all__ = ['ResolutionProcessor', 'DataFormatter', 'DifficultyEvaluator', 'FeasibilityChecker']
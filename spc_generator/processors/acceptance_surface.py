@@ -0,0 +1,440 @@
+"""接受概率表 - 离线标定的生成接受概率与尝试速度"""
+
+import os
+import json
+import math
+import time
+from typing import Optional, Dict, List, Tuple
+from ..models.tolerance import Tolerance, ToleranceType
+from ..config.constants import ACCEPTANCE_SURFACE_FILE, REFERENCE_MAX_ATTEMPTS, REDIRECT_CONFIDENCE
+
+
+# 标定网格
+DEFAULT_AXES = {
+    'target_cpk': [1.33, 1.67, 2.0, 2.33],
+    'reference_ratio': [0.2, 0.35, 0.5, 0.7, 0.9],
+    'resolution_ratio': [0.02, 0.1, 0.25, 0.5, 0.75, 1.0, 1.25, 1.5, 2.0, 3.0],
+}
+
+# 各模式使用的特征轴（标准模式与参考范围宽度无关）
+MODE_AXES = {
+    'reference': ['target_cpk', 'reference_ratio', 'resolution_ratio'],
+    'standard': ['target_cpk', 'resolution_ratio'],
+}
+
+TOLERANCE_TYPES = [
+    ToleranceType.DOUBLE.value,
+    ToleranceType.UPPER_ONLY.value,
+    ToleranceType.LOWER_ONLY.value,
+]
+
+# 标定使用的数据分辨率（生成器固定保留3位小数，等效最小刻度为0.001）
+CALIBRATION_RESOLUTION = 0.001
+
+
+def get_default_surface_path() -> str:
+    """获取默认接受概率表路径"""
+    config_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config')
+    return os.path.join(config_dir, ACCEPTANCE_SURFACE_FILE)
+
+
+class AcceptanceSurface:
+    """
+    接受概率表
+
+    按归一化特征（目标CPK、参考范围宽度/公差范围、分辨率/σ）和公差类型索引，
+    记录单次生成尝试的接受概率、候选概率和每秒尝试次数，运行时做多线性插值。
+    标定时同时记录候选概率的置信上限（REDIRECT_CONFIDENCE），一次候选数据都没有得到的网格点
+    按需加测，用于判断参考范围模式是否几乎不可能得到候选数据。
+    特征超出标定网格时不外推。分辨率接近σ时数据舍入使CPK只能取离散值，接受概率在相邻网格点之间
+    变化剧烈，因此同时给出所在网格单元各顶点中最低的接受概率，供保守地确定尝试次数预算。
+    """
+
+    def __init__(self, table: Dict):
+        self.table = table
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> Optional['AcceptanceSurface']:
+        """
+        加载接受概率表
+
+        Args:
+            path: 文件路径，默认为config目录下的标定文件
+
+        Returns:
+            AcceptanceSurface对象，文件不存在或无法读取时返回None
+        """
+        path = path or get_default_surface_path()
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return cls(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"读取接受概率表时出错: {e}")
+            return None
+
+    def save(self, path: Optional[str] = None):
+        """保存接受概率表"""
+        path = path or get_default_surface_path()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.table, f, ensure_ascii=False, indent=1)
+
+    def lookup(
+        self,
+        mode: str,
+        tolerance_type: str,
+        features: Dict[str, float]
+    ) -> Optional[Dict[str, float]]:
+        """
+        插值查询
+
+        Args:
+            mode: 生成模式 'reference' / 'standard'
+            tolerance_type: 公差类型（ToleranceType的值）
+            features: 特征字典
+
+        Returns:
+            {'acceptance': 接受概率, 'acceptance_floor': 所在网格单元各顶点中最低的接受概率,
+             'candidate': 候选概率, 'candidate_upper': 所在网格单元各顶点中最高的候选概率置信上限,
+             'attempts_per_second': 每秒尝试次数}，
+            无对应数据或特征超出标定网格时返回None
+        """
+        mode_table = self.table.get('surfaces', {}).get(mode)
+        if not mode_table:
+            return None
+
+        values = mode_table['values'].get(tolerance_type)
+        if not values:
+            return None
+
+        axes = [mode_table['axes'][name] for name in mode_table['axis_names']]
+        point = [features[name] for name in mode_table['axis_names']]
+        if not self._covers(axes, point):
+            return None
+
+        corners = self._corners(axes, point)
+        stats = {
+            key: max(0.0, sum(weight * values[key][index] for index, weight in corners))
+            for key in ('acceptance', 'candidate', 'attempts_per_second')
+        }
+        stats['acceptance_floor'] = min(values['acceptance'][index] for index, _ in corners)
+        # 没有记录置信上限的表（旧版标定文件）不能据此判断候选概率足够低
+        upper = values.get('candidate_upper')
+        stats['candidate_upper'] = max(upper[index] for index, _ in corners) if upper else 1.0
+        return stats
+
+    @staticmethod
+    def _covers(axes: List[List[float]], point: List[float]) -> bool:
+        """特征是否都在标定网格范围内（包括边界）"""
+        return all(axis[0] <= x <= axis[-1] for axis, x in zip(axes, point))
+
+    @staticmethod
+    def _corners(axes: List[List[float]], point: List[float]) -> List[Tuple[int, float]]:
+        """
+        网格范围内的点所在网格单元的顶点
+
+        Returns:
+            权重不为0的 (行优先下标, 多线性插值权重) 列表
+        """
+        # 每个轴上的下标和权重
+        positions = []
+        for axis, x in zip(axes, point):
+            if len(axis) == 1 or x <= axis[0]:
+                positions.append((0, 0, 0.0))
+            elif x >= axis[-1]:
+                positions.append((len(axis) - 1, len(axis) - 1, 0.0))
+            else:
+                i = 0
+                while axis[i + 1] < x:
+                    i += 1
+                t = (x - axis[i]) / (axis[i + 1] - axis[i])
+                positions.append((i, i + 1, t))
+
+        # 行优先的步长
+        strides = []
+        stride = 1
+        for axis in reversed(axes):
+            strides.insert(0, stride)
+            stride *= len(axis)
+
+        corners = []
+        for corner in range(2 ** len(axes)):
+            weight = 1.0
+            index = 0
+            for dim, (lo, hi, t) in enumerate(positions):
+                if (corner >> dim) & 1:
+                    weight *= t
+                    index += hi * strides[dim]
+                else:
+                    weight *= 1 - t
+                    index += lo * strides[dim]
+            if weight:
+                corners.append((index, weight))
+        return corners
+
+    @classmethod
+    def calibrate(
+        cls,
+        samples_per_point: int = 200,
+        axes: Optional[Dict[str, List[float]]] = None,
+        progress: bool = True
+    ) -> 'AcceptanceSurface':
+        """
+        离线标定：在特征网格的每个点上构造合成任务并统计生成尝试的结果，
+        之后对可能改用标准模式的网格点加测（见refine_redirect_points）
+
+        Args:
+            samples_per_point: 每个网格点的尝试次数
+            axes: 特征网格，默认使用DEFAULT_AXES
+            progress: 是否打印进度
+
+        Returns:
+            标定后的AcceptanceSurface对象
+        """
+        axes = axes or DEFAULT_AXES
+        generators = cls._create_generators()
+
+        table = {
+            'version': 1,
+            'samples_per_point': samples_per_point,
+            'surfaces': {},
+        }
+
+        for mode, axis_names in MODE_AXES.items():
+            mode_axes = {name: axes[name] for name in axis_names}
+            grid = cls._grid_points([mode_axes[name] for name in axis_names])
+            values = {}
+
+            for tolerance_type in TOLERANCE_TYPES:
+                acceptance, candidate, candidate_upper, samples, rates = [], [], [], [], []
+                for point in grid:
+                    features = dict(zip(axis_names, point))
+                    accepted_count, candidate_count, count, elapsed = cls._sample_point(
+                        generators, mode, tolerance_type, features, samples_per_point
+                    )
+                    acceptance.append(round(accepted_count / count, 5))
+                    candidate.append(round(candidate_count / count, 5))
+                    candidate_upper.append(cls._candidate_upper(candidate_count, count))
+                    samples.append(count)
+                    rates.append(round(count / elapsed, 1) if elapsed > 0 else 0.0)
+
+                values[tolerance_type] = {
+                    'acceptance': acceptance,
+                    'candidate': candidate,
+                    'candidate_upper': candidate_upper,
+                    'samples': samples,
+                    'attempts_per_second': rates,
+                }
+                if progress:
+                    print(f"已标定: {mode} / {tolerance_type} ({len(grid)}个网格点)")
+
+            table['surfaces'][mode] = {
+                'axis_names': axis_names,
+                'axes': mode_axes,
+                'values': values,
+            }
+
+        surface = cls(table)
+        surface.refine_redirect_points(progress, generators)
+        return surface
+
+    def refine_redirect_points(self, progress: bool = True, generators: Optional[Dict] = None):
+        """
+        对可能改用标准模式的参考范围模式网格点加测
+
+        一次候选数据都没有得到的网格点，只有候选概率的置信上限低于1/REFERENCE_MAX_ATTEMPTS时才能判定
+        参考范围模式在预算内几乎不可能得到候选数据。只对标准模式可以生成（接受概率大于0）的网格点加测，
+        直到尝试次数足以给出这样的上限，得到候选数据时提前结束。
+
+        Args:
+            progress: 是否打印进度
+            generators: 生成器（标定时传入，None时新建）
+        """
+        reference = self.table['surfaces']['reference']
+        axis_names = reference['axis_names']
+        grid = self._grid_points([reference['axes'][name] for name in axis_names])
+        # 候选数据为0时置信上限低于阈值所需的尝试次数
+        required = int(self.poisson_upper_bound(0, REDIRECT_CONFIDENCE) * REFERENCE_MAX_ATTEMPTS) + 1
+        generators = generators or self._create_generators()
+
+        for tolerance_type, values in reference['values'].items():
+            refined = 0
+            for index, point in enumerate(grid):
+                features = dict(zip(axis_names, point))
+                count = values['samples'][index]
+                if values['candidate'][index] > 0 or count >= required:
+                    continue
+                standard = self.lookup('standard', tolerance_type, features)
+                if not standard or standard['acceptance'] <= 0:
+                    continue
+
+                # 已有的尝试没有得到候选数据，也就没有被接受的数据，接受次数只来自加测
+                accepted_count, candidate_count, extra, _ = self._sample_point(
+                    generators, 'reference', tolerance_type, features, required - count, stop_on_candidate=True
+                )
+                count += extra
+                values['acceptance'][index] = round(accepted_count / count, 5)
+                values['candidate'][index] = round(candidate_count / count, 5)
+                values['candidate_upper'][index] = self._candidate_upper(candidate_count, count)
+                values['samples'][index] = count
+                refined += 1
+            if progress:
+                print(f"已加测: reference / {tolerance_type} ({refined}个网格点)")
+
+    @staticmethod
+    def _create_generators() -> Dict:
+        """标定使用的控制限计算器和生成器"""
+        from ..calculators.control_limits_calculator import ControlLimitsCalculator
+        from ..generators.standard_generator import StandardGenerator
+        from ..generators.reference_range_generator import ReferenceRangeGenerator
+
+        return {
+            'calculator': ControlLimitsCalculator(),
+            'standard': StandardGenerator(),
+            'reference': ReferenceRangeGenerator(),
+        }
+
+    @classmethod
+    def _sample_point(
+        cls,
+        generators: Dict,
+        mode: str,
+        tolerance_type: str,
+        features: Dict[str, float],
+        samples: int,
+        stop_on_candidate: bool = False
+    ) -> Tuple[int, int, int, float]:
+        """
+        在一个网格点上构造合成任务并运行生成尝试
+
+        Args:
+            generators: _create_generators返回的生成器
+            mode: 生成模式 'reference' / 'standard'
+            tolerance_type: 公差类型
+            features: 网格点的特征
+            samples: 尝试次数
+            stop_on_candidate: 得到候选数据时是否提前结束
+
+        Returns:
+            (接受次数, 候选次数, 实际尝试次数, 耗时秒数)
+        """
+        tolerance, ref_lower, ref_upper = cls._synthetic_task(
+            tolerance_type,
+            features['target_cpk'],
+            features.get('reference_ratio'),
+            features['resolution_ratio']
+        )
+        ref_center = (ref_lower + ref_upper) / 2 if mode == 'reference' else None
+        control_limits = generators['calculator'].calculate(
+            tolerance=tolerance, target_cpk=features['target_cpk'], ref_center=ref_center
+        )
+
+        accepted_count = 0
+        candidate_count = 0
+        count = 0
+        start = time.perf_counter()
+        while count < samples:
+            if mode == 'reference':
+                result, accepted = generators['reference']._generate_candidate(
+                    tolerance, control_limits, features['target_cpk'],
+                    CALIBRATION_RESOLUTION, ref_lower, ref_upper
+                )
+            else:
+                result, accepted = generators['standard']._generate_candidate(
+                    tolerance, control_limits, features['target_cpk'],
+                    CALIBRATION_RESOLUTION
+                )
+            count += 1
+            accepted_count += int(accepted)
+            candidate_count += int(result is not None)
+            if stop_on_candidate and result is not None:
+                break
+        return accepted_count, candidate_count, count, time.perf_counter() - start
+
+    @classmethod
+    def _candidate_upper(cls, candidate_count: int, samples: int) -> float:
+        """候选概率的置信上限"""
+        return float(f"{min(1.0, cls.poisson_upper_bound(candidate_count, REDIRECT_CONFIDENCE) / samples):.6g}")
+
+    @staticmethod
+    def poisson_upper_bound(count: int, confidence: float) -> float:
+        """
+        泊松分布期望值的单侧置信上限（观测到count次事件时）
+
+        count为0时约为-ln(1-confidence)，置信水平95%时即"三法则"的3
+
+        Args:
+            count: 观测到的事件次数
+            confidence: 置信水平
+
+        Returns:
+            期望事件次数的上限
+        """
+        def cdf(mean: float) -> float:
+            term = total = math.exp(-mean)
+            for i in range(1, count + 1):
+                term *= mean / i
+                total += term
+            return total
+
+        low, high = 0.0, count + 10.0 * math.sqrt(count + 1) + 10.0
+        for _ in range(100):
+            middle = (low + high) / 2
+            if cdf(middle) > 1 - confidence:
+                low = middle
+            else:
+                high = middle
+        return high
+
+    @staticmethod
+    def _grid_points(axes: List[List[float]]) -> List[Tuple[float, ...]]:
+        """按行优先顺序列出网格点"""
+        points = [()]
+        for axis in axes:
+            points = [p + (x,) for p in points for x in axis]
+        return points
+
+    @staticmethod
+    def _synthetic_task(
+        tolerance_type: str,
+        target_cpk: float,
+        reference_ratio: Optional[float],
+        resolution_ratio: float
+    ) -> Tuple[Tolerance, float, float]:
+        """
+        构造满足给定特征的合成任务
+
+        以固定的数据分辨率反推σ和公差范围，参考范围以控制中心为中心。
+
+        Returns:
+            (公差, 参考范围下限, 参考范围上限)
+        """
+        sigma = CALIBRATION_RESOLUTION / resolution_ratio
+        tolerance_range = 6 * target_cpk * sigma
+
+        if tolerance_type == ToleranceType.DOUBLE.value:
+            lsl = 10.0
+            usl = lsl + tolerance_range
+            tolerance = Tolerance(usl, lsl, ToleranceType.DOUBLE, f"{lsl}-{usl}")
+            center = (usl + lsl) / 2
+        elif tolerance_type == ToleranceType.UPPER_ONLY.value:
+            usl = tolerance_range
+            tolerance = Tolerance(usl, None, ToleranceType.UPPER_ONLY, f"≤{usl}")
+            center = usl / 2
+        else:
+            lsl = 2 * tolerance_range
+            tolerance = Tolerance(None, lsl, ToleranceType.LOWER_ONLY, f"min{lsl}")
+            center = lsl * 1.5
+
+        half_width = (reference_ratio or 0.0) * tolerance_range / 2
+        return tolerance, center - half_width, center + half_width
+
+
+if __name__ == "__main__":
+    import sys
+    samples = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    surface = AcceptanceSurface.calibrate(samples_per_point=samples)
+    surface.save()
+    print(f"接受概率表已保存: {get_default_surface_path()}")
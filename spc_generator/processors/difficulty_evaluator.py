@@ -1,12 +1,36 @@
 """难度评估器"""
 
-from typing import Tuple
-from ..models.tolerance import Tolerance
+import math
+from typing import Tuple, Optional, Dict
+from ..models.tolerance import Tolerance, ToleranceType
+from ..models.control_limits import ControlLimits
+from ..models.difficulty_prediction import DifficultyPrediction
+from ..calculators.control_limits_calculator import ControlLimitsCalculator
+from .resolution_processor import ResolutionProcessor
+from .acceptance_surface import AcceptanceSurface, CALIBRATION_RESOLUTION
+from ..config.constants import (
+    REFERENCE_MAX_ATTEMPTS, STANDARD_MAX_ATTEMPTS,
+    MIN_GENERATION_ATTEMPTS, GENERATION_SUCCESS_CONFIDENCE, REDIRECT_CONFIDENCE
+)
 
 
 class DifficultyEvaluator:
     """难度评估器"""
     
+    def __init__(self, surface: Optional[AcceptanceSurface] = None):
+        self.calculator = ControlLimitsCalculator()
+        self.resolution_processor = ResolutionProcessor()
+        self._surface = surface
+        self._surface_loaded = surface is not None
+    
+    @property
+    def surface(self) -> Optional[AcceptanceSurface]:
+        """接受概率表（首次使用时加载）"""
+        if not self._surface_loaded:
+            self._surface = AcceptanceSurface.load()
+            self._surface_loaded = True
+        return self._surface
+    
     def evaluate(
         self,
         tolerance: Tolerance,
@@ -64,3 +88,142 @@ class DifficultyEvaluator:
             difficulty = "低"
         
         return cpk_lower, cpk_upper, difficulty
+
+    
+    def predict(
+        self,
+        tolerance: Tolerance,
+        control_limits: ControlLimits,
+        target_cpk: float,
+        resolution: Optional[float],
+        ref_lower: Optional[float] = None,
+        ref_upper: Optional[float] = None,
+        use_reference_range: bool = False
+    ) -> DifficultyPrediction:
+        """
+        根据接受概率表预测生成难度，并选择生成策略和尝试次数预算
+        
+        Args:
+            tolerance: 公差信息
+            control_limits: 控制限
+            target_cpk: 目标CPK
+            resolution: 分辨率
+            ref_lower: 参考范围下限
+            ref_upper: 参考范围上限
+            use_reference_range: 是否使用参考范围模式
+            
+        Returns:
+            DifficultyPrediction对象；没有接受概率表或特征超出标定网格时使用预算上限
+        """
+        use_reference = use_reference_range and ref_lower is not None and ref_upper is not None
+        features = self.get_features(tolerance, control_limits, target_cpk, resolution, ref_lower, ref_upper)
+        tolerance_type = self._get_effective_tolerance_type(tolerance)
+        
+        standard_stats = self._lookup('standard', tolerance_type, features)
+        if not use_reference:
+            return self._build_prediction('standard', standard_stats, STANDARD_MAX_ATTEMPTS)
+        
+        reference_stats = self._lookup('reference', tolerance_type, features)
+        
+        # 参考范围模式在预算内几乎不可能得到满足参考范围的候选数据时（按标定的置信上限判断，
+        # 而不是按可能只是抽样不足的0），直接改用标准模式
+        if (reference_stats is not None and standard_stats is not None and
+                reference_stats['candidate_upper'] * REFERENCE_MAX_ATTEMPTS < 1 and
+                standard_stats['acceptance'] > 0):
+            prediction = self._build_prediction('standard', standard_stats, STANDARD_MAX_ATTEMPTS)
+            prediction.redirect_reason = (
+                f"参考范围模式得到候选数据的概率不超过{reference_stats['candidate_upper']:.1e}"
+                f"（{REDIRECT_CONFIDENCE:.0%}置信上限），{REFERENCE_MAX_ATTEMPTS}次尝试内几乎不可能得到满足参考范围的数据"
+            )
+            return prediction
+        
+        return self._build_prediction('reference', reference_stats, REFERENCE_MAX_ATTEMPTS)
+    
+    def get_features(
+        self,
+        tolerance: Tolerance,
+        control_limits: ControlLimits,
+        target_cpk: float,
+        resolution: Optional[float],
+        ref_lower: Optional[float] = None,
+        ref_upper: Optional[float] = None
+    ) -> Dict[str, float]:
+        """
+        计算归一化特征
+        
+        Returns:
+            {'target_cpk': 目标CPK, 'reference_ratio': 参考范围宽度/公差范围,
+             'resolution_ratio': 分辨率/σ}
+        """
+        tolerance_range = self.calculator.calculate_tolerance_range(tolerance, control_limits.cl)
+        
+        reference_ratio = 1.0
+        if ref_lower is not None and ref_upper is not None and tolerance_range > 0:
+            reference_ratio = (ref_upper - ref_lower) / tolerance_range
+        
+        step = self.get_data_step(resolution)
+        resolution_ratio = step / control_limits.sigma if control_limits.sigma > 0 else float('inf')
+        
+        return {
+            'target_cpk': target_cpk,
+            'reference_ratio': reference_ratio,
+            'resolution_ratio': resolution_ratio,
+        }
+    
+    def get_data_step(self, resolution: Optional[float]) -> float:
+        """
+        获取生成数据的最小刻度
+        
+        生成器固定保留3位小数，分辨率更细或未指定时以0.001计
+        """
+        step = self.resolution_processor.get_resolution_step(resolution) or 0.0
+        return max(step, CALIBRATION_RESOLUTION)
+    
+    def _get_effective_tolerance_type(self, tolerance: Tolerance) -> str:
+        """按实际参与CPK计算的规格限确定公差类型"""
+        if tolerance.usl is not None and tolerance.lsl is not None:
+            return ToleranceType.DOUBLE.value
+        elif tolerance.usl is not None:
+            return ToleranceType.UPPER_ONLY.value
+        elif tolerance.lsl is not None:
+            return ToleranceType.LOWER_ONLY.value
+        return ToleranceType.NONE.value
+    
+    def _lookup(self, mode: str, tolerance_type: str, features: Dict[str, float]) -> Optional[Dict[str, float]]:
+        """查询接受概率表"""
+        if self.surface is None:
+            return None
+        return self.surface.lookup(mode, tolerance_type, features)
+    
+    def _build_prediction(
+        self,
+        strategy: str,
+        stats: Optional[Dict[str, float]],
+        max_budget: int
+    ) -> DifficultyPrediction:
+        """
+        按接受概率计算达到目标成功率所需的尝试次数，并限制在预算范围内
+        
+        按所在网格单元中最低的接受概率计算，只有标定数据支持时才少于预算上限；
+        没有接受概率表或特征超出标定网格时使用预算上限
+        """
+        if stats is None:
+            return DifficultyPrediction(strategy=strategy, max_attempts=max_budget)
+        
+        acceptance = stats['acceptance']
+        floor = stats['acceptance_floor']
+        if floor <= 0:
+            max_attempts = max_budget
+        elif floor >= 1:
+            max_attempts = MIN_GENERATION_ATTEMPTS
+        else:
+            needed = math.log(1 - GENERATION_SUCCESS_CONFIDENCE) / math.log(1 - floor)
+            max_attempts = int(min(max_budget, max(MIN_GENERATION_ATTEMPTS, math.ceil(needed))))
+        
+        return DifficultyPrediction(
+            strategy=strategy,
+            max_attempts=max_attempts,
+            acceptance_probability=acceptance,
+            candidate_probability=stats['candidate'],
+            attempts_per_second=stats['attempts_per_second']
+        )
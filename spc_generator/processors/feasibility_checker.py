@@ -0,0 +1,207 @@
+"""可行性检查器 - 生成前用闭式边界证明任务不可行"""
+
+import math
+from typing import Optional, Tuple, List
+from ..models.tolerance import Tolerance
+from ..models.control_limits import ControlLimits
+from ..models.feasibility import FeasibilityResult
+from ..calculators.control_limits_calculator import ControlLimitsCalculator
+from ..config.constants import D2_CONSTANT
+from .difficulty_evaluator import DifficultyEvaluator
+
+
+class FeasibilityChecker:
+    """
+    可行性检查器
+
+    只使用可以严格证明的边界：
+    - 参考范围超出公差
+    - 参考范围内不含任何分辨率刻度（没有原始数据能落在参考范围内）
+    - 参考范围完全落在C区内（25个Xbar全部在C区，必然违反准则4）
+    - Rbar至少为一个分辨率刻度、至多为UCLr，Xbar均值受参考范围/控制限约束，
+      由此得到的CPK上下界无法覆盖目标CPK±0.03
+    """
+
+    # 目标CPK允许偏差（与生成器的接受条件一致）
+    CPK_TOLERANCE = 0.03
+
+    def __init__(
+        self,
+        difficulty_evaluator: Optional[DifficultyEvaluator] = None,
+        calculator: Optional[ControlLimitsCalculator] = None
+    ):
+        self.difficulty_evaluator = difficulty_evaluator or DifficultyEvaluator()
+        self.calculator = calculator or ControlLimitsCalculator()
+
+    def check(
+        self,
+        tolerance: Tolerance,
+        target_cpk: float,
+        resolution: Optional[float],
+        ref_lower: Optional[float] = None,
+        ref_upper: Optional[float] = None,
+        use_reference_range: bool = False
+    ) -> FeasibilityResult:
+        """
+        检查任务是否可行
+
+        参考范围模式不可行时转为标准模式（redirect），标准模式也不可行时跳过（skip）。
+
+        Args:
+            tolerance: 公差信息
+            target_cpk: 目标CPK
+            resolution: 分辨率
+            ref_lower: 参考范围下限
+            ref_upper: 参考范围上限
+            use_reference_range: 是否使用参考范围模式
+
+        Returns:
+            FeasibilityResult对象
+        """
+        step = self.difficulty_evaluator.get_data_step(resolution)
+        result = FeasibilityResult()
+
+        if use_reference_range and ref_lower is not None and ref_upper is not None:
+            ref_center = (ref_lower + ref_upper) / 2
+            control_limits = self.calculator.calculate(
+                tolerance=tolerance, target_cpk=target_cpk, ref_center=ref_center
+            )
+
+            reasons = self._check_reference_range(
+                tolerance, control_limits, target_cpk, step, ref_lower, ref_upper
+            )
+            if not reasons:
+                return result
+
+            result.action = 'redirect'
+            result.reasons.extend(reasons)
+            # 转为标准模式后沿用以参考中心计算的控制限
+            standard_limits = control_limits
+        else:
+            standard_limits = self.calculator.calculate(tolerance=tolerance, target_cpk=target_cpk)
+
+        reasons = self._check_cpk_bounds(
+            tolerance, target_cpk, step, standard_limits,
+            standard_limits.lcl, standard_limits.ucl, "控制限"
+        )
+        if reasons:
+            result.action = 'skip'
+            result.reasons.extend(reasons)
+
+        return result
+
+    def _check_reference_range(
+        self,
+        tolerance: Tolerance,
+        control_limits: ControlLimits,
+        target_cpk: float,
+        step: float,
+        ref_lower: float,
+        ref_upper: float
+    ) -> List[str]:
+        """检查参考范围模式的不可行条件"""
+        reasons = []
+
+        if tolerance.usl is not None and ref_upper > tolerance.usl:
+            reasons.append(f"参考范围上限{ref_upper}超出公差上限{tolerance.usl}")
+        if tolerance.lsl is not None and ref_lower < tolerance.lsl:
+            reasons.append(f"参考范围下限{ref_lower}超出公差下限{tolerance.lsl}")
+        if reasons:
+            return reasons
+
+        # 参考范围内的分辨率刻度数
+        eps = 1e-9
+        grid_points = math.floor(ref_upper / step + eps) - math.ceil(ref_lower / step - eps) + 1
+        if grid_points < 1:
+            reasons.append(f"参考范围{ref_lower}-{ref_upper}内不含分辨率{step}的任何刻度")
+            return reasons
+
+        # 参考范围完全落在C区内时，25个Xbar全部在C区，必然违反准则4
+        if control_limits.lcl1 <= ref_lower and ref_upper <= control_limits.ucl1:
+            reasons.append(
+                f"参考范围{ref_lower}-{ref_upper}完全落在C区"
+                f"[{control_limits.lcl1}, {control_limits.ucl1}]内，必然违反准则4"
+            )
+            return reasons
+
+        # Xbar全部在参考范围和控制限内
+        avg_lower = max(ref_lower, control_limits.lcl)
+        avg_upper = min(ref_upper, control_limits.ucl)
+        if avg_lower > avg_upper:
+            reasons.append(f"参考范围{ref_lower}-{ref_upper}与控制限不相交")
+            return reasons
+
+        reasons.extend(self._check_cpk_bounds(
+            tolerance, target_cpk, step, control_limits, avg_lower, avg_upper, "参考范围"
+        ))
+        return reasons
+
+    def _check_cpk_bounds(
+        self,
+        tolerance: Tolerance,
+        target_cpk: float,
+        step: float,
+        control_limits: ControlLimits,
+        avg_lower: float,
+        avg_upper: float,
+        region_name: str
+    ) -> List[str]:
+        """
+        检查CPK可达范围
+
+        总平均值位于[avg_lower, avg_upper]内；Rbar ≥ 一个分辨率刻度（极差不能为0），
+        Rbar ≤ UCLr（R图不能超出上控制限）。
+        """
+        dist_min, dist_max = self._distance_bounds(tolerance, avg_lower, avg_upper)
+        if dist_max is None:
+            return []
+
+        reasons = []
+        cpk_max = dist_max * D2_CONSTANT / (3 * step)
+        if target_cpk - self.CPK_TOLERANCE > cpk_max:
+            reasons.append(
+                f"分辨率{step}下Rbar至少为{step}，Xbar均值在{region_name}内时"
+                f"CPK最高为{cpk_max:.4f}，无法达到目标cpk {target_cpk:.4f}"
+            )
+
+        if control_limits.uclr > 0:
+            cpk_min = dist_min * D2_CONSTANT / (3 * control_limits.uclr)
+            if target_cpk + self.CPK_TOLERANCE < cpk_min:
+                reasons.append(
+                    f"Rbar不超过UCLr={control_limits.uclr}，Xbar均值在{region_name}内时"
+                    f"CPK最低为{cpk_min:.4f}，无法达到目标cpk {target_cpk:.4f}"
+                )
+
+        return reasons
+
+    def _distance_bounds(
+        self,
+        tolerance: Tolerance,
+        avg_lower: float,
+        avg_upper: float
+    ) -> Tuple[Optional[float], Optional[float]]:
+        """
+        计算总平均值在区间内时到规格限距离（CPK分子）的最小值和最大值
+
+        Returns:
+            (最小距离, 最大距离)，无公差时返回(None, None)
+        """
+        def distance(avg: float) -> float:
+            distances = []
+            if tolerance.usl is not None:
+                distances.append(abs(tolerance.usl - avg))
+            if tolerance.lsl is not None:
+                distances.append(abs(avg - tolerance.lsl))
+            return min(distances)
+
+        if tolerance.usl is None and tolerance.lsl is None:
+            return None, None
+
+        # 距离函数分段线性，极值只可能出现在区间端点、规格限和规格中心
+        candidates = [avg_lower, avg_upper]
+        for point in (tolerance.usl, tolerance.lsl, tolerance.center):
+            if point is not None and avg_lower < point < avg_upper:
+                candidates.append(point)
+
+        values = [distance(x) for x in candidates]
+        return min(values), max(values)
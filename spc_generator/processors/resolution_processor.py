@@ -69,6 +69,34 @@ class ResolutionProcessor:
             print(f"分辨率处理警告: {e}, 使用原始值")
             return value
     
+    def get_resolution_step(self, resolution: Optional[float]) -> Optional[float]:
+        """
+        获取舍入后数据的最小刻度（两个不同舍入值之间的最小差）
+        
+        Args:
+            resolution: 分辨率
+            
+        Returns:
+            最小刻度，无分辨率或无法识别时返回None
+        """
+        if resolution is None:
+            return None
+        
+        try:
+            resolution_str = resolution.strip() if isinstance(resolution, str) else str(resolution)
+            resolution_float = float(resolution_str)
+            
+            if resolution_float in [0.1, 0.01, 0.001, 0.0001, 0.00001]:
+                return resolution_float
+            elif resolution_float == 0.02:
+                return 0.02
+            elif '.' in resolution_str:
+                return 10 ** -len(resolution_str.split('.')[1])
+            else:
+                return 1.0
+        except (TypeError, ValueError):
+            return None
+    
     def apply_resolution_to_matrix(
         self, 
         data_matrix: List[List[float]], 
@@ -3,5 +3,10 @@
 from .spc_service import SPCService
 from .file_organizer import FileOrganizer
 from .plan_updater import PlanUpdater
+from .result_journal import ResultJournal
+from .plan_checkpoint_writer import PlanCheckpointWriter
+from .rerun_manifest import RerunManifest
+from .plan_run import PlanRun
+from .spc_pipeline import SPCPipeline
 
-__all__ = ['SPCService', 'FileOrganizer', 'PlanUpdater']
+__all__ = ['SPCService', 'FileOrganizer', 'PlanUpdater', 'ResultJournal', 'PlanCheckpointWriter', 'RerunManifest', 'PlanRun', 'SPCPipeline']
@@ -1,51 +1,59 @@
 """文件组织服务"""
 
 import os
-import shutil
-from typing import List, Dict, Optional
+from typing import Dict, List
 
 
 class FileOrganizer:
     """文件组织服务"""
     
-    def organize_by_month(self, files_by_month: Dict[int, List[str]]):
+    def plan_month_folders(self, month_task_counts: Dict[int, int], root: str = ".") -> Dict[int, str]:
         """
-        按月份组织文件：创建月份文件夹并将对应文件移动进去
+        根据各月份的任务数预先确定输出目录：当月多个任务时为月份文件夹（并创建），否则为输出根目录，
+        生成的文件直接保存到最终位置，不再生成后移动
         
         Args:
-            files_by_month: 按月份分组的文件字典 {月份: [文件路径列表]}
-        """
-        try:
-            from ..config.constants import MONTH_NAME_MAP
+            month_task_counts: 各月份的任务数 {月份: 任务数}
+            root: 输出根目录（批量运行时为车间文件夹）
             
-            moved_files = 0
-            for month_num, file_list in files_by_month.items():
-                if len(file_list) > 1:  # 只有当月存在多个任务时才创建文件夹
-                    month_name = MONTH_NAME_MAP.get(month_num, f"{month_num}月")
-                    
-                    # 创建月份文件夹
-                    if not os.path.exists(month_name):
-                        os.makedirs(month_name)
-                    
-                    # 移动文件到对应文件夹
-                    for file_path in file_list:
-                        if os.path.exists(file_path):
-                            filename = os.path.basename(file_path)
-                            dst_file = os.path.join(month_name, filename)
-                            
-                            # 确保目标文件不存在
-                            if os.path.exists(dst_file):
-                                base_name, ext = os.path.splitext(filename)
-                                counter = 1
-                                while os.path.exists(os.path.join(month_name, f"{base_name}_{counter}{ext}")):
-                                    counter += 1
-                                dst_file = os.path.join(month_name, f"{base_name}_{counter}{ext}")
-                            
-                            shutil.move(file_path, dst_file)
-                            moved_files += 1
+        Returns:
+            各月份的输出目录 {月份: 目录}
+        """
+        from ..config.constants import MONTH_NAME_MAP
+        
+        output_dirs = {}
+        for month_num, count in month_task_counts.items():
+            if count > 1:  # 只有当月存在多个任务时才创建文件夹
+                month_name = MONTH_NAME_MAP.get(month_num, f"{month_num}月")
+                month_dir = os.path.join(root, month_name) if root != "." else month_name
+                os.makedirs(month_dir, exist_ok=True)
+                output_dirs[month_num] = month_dir
+            else:
+                output_dirs[month_num] = root
+        return output_dirs
+    
+    def plan_workshop_folders(self, workshop_names: List[str]) -> List[str]:
+        """
+        批量运行时为每个计划确定车间输出文件夹（并创建），车间名称相同时添加序号
+        
+        Args:
+            workshop_names: 各计划的车间名称（按计划顺序）
             
-            if moved_files > 0:
-                print(f"已移动 {moved_files} 个文件到月份文件夹")
+        Returns:
+            各计划的输出根目录（与workshop_names顺序相同）
+        """
+        from ..utils.file_utils import FileUtils
         
-        except Exception as e:
-            print(f"按月份组织文件时出错: {e}")
+        folders = []
+        used = set()
+        for workshop_name in workshop_names:
+            base = FileUtils.sanitize_filename(workshop_name, 50).strip() or "车间"
+            folder = base
+            counter = 2
+            while folder.lower() in used:
+                folder = f"{base}_{counter}"
+                counter += 1
+            used.add(folder.lower())
+            os.makedirs(folder, exist_ok=True)
+            folders.append(folder)
+        return folders
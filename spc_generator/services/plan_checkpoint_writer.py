@@ -0,0 +1,111 @@
+"""计划文件检查点写入器 - 后台线程按批把结果写入更新后的计划文件"""
+
+import queue
+import threading
+import time
+import traceback
+from typing import Dict, List, Optional
+from openpyxl import load_workbook
+from .plan_updater import PlanUpdater
+from ..config.constants import PLAN_CHECKPOINT_BATCH_SIZE, PLAN_CHECKPOINT_INTERVAL
+
+
+# 队列结束标记
+_STOP = object()
+
+
+class PlanCheckpointWriter:
+    """
+    计划文件检查点写入器
+
+    生成过程中的结果交给后台线程，累计PLAN_CHECKPOINT_BATCH_SIZE条或最早的未保存结果等待超过
+    PLAN_CHECKPOINT_INTERVAL秒时写入并保存一次 {原文件名}_已更新.xlsx。
+    计划工作簿在后台线程中只加载一次，之后每批只写入新结果的单元格。
+    写入失败只打印错误，不影响生成；最终的计划文件由结果日志合并生成。
+    """
+
+    def __init__(
+        self,
+        plan_file_path: str,
+        updater: Optional[PlanUpdater] = None,
+        batch_size: int = PLAN_CHECKPOINT_BATCH_SIZE,
+        interval: float = PLAN_CHECKPOINT_INTERVAL
+    ):
+        self.plan_file_path = plan_file_path
+        self.updater = updater or PlanUpdater()
+        self.batch_size = max(1, batch_size)
+        self.interval = interval
+        # 已保存的检查点次数
+        self.checkpoints = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._workbook = None
+
+    def start(self):
+        """启动后台线程"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def submit(self, result: Dict):
+        """
+        提交一条结果（不等待写入）
+
+        Args:
+            result: 结果字典（sheet_name, row_index, month_num, actual_cpk等）
+        """
+        self._queue.put(result)
+
+    def close(self, flush: bool = True):
+        """
+        停止后台线程
+
+        Args:
+            flush: 是否先保存尚未写入的结果
+        """
+        if self._thread is None:
+            return
+        self._queue.put((_STOP, flush))
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        """后台线程: 收集结果，满一批或超时后保存检查点"""
+        pending: List[Dict] = []
+        first_pending = 0.0
+        try:
+            while True:
+                timeout = max(0.0, self.interval - (time.monotonic() - first_pending)) if pending else None
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+
+                if isinstance(item, tuple) and item[0] is _STOP:
+                    if item[1] and pending:
+                        self._checkpoint(pending)
+                    return
+                if item is not None:
+                    if not pending:
+                        first_pending = time.monotonic()
+                    pending.append(item)
+
+                if len(pending) >= self.batch_size or (pending and time.monotonic() - first_pending >= self.interval):
+                    self._checkpoint(pending)
+                    pending = []
+        finally:
+            if self._workbook is not None:
+                self._workbook.close()
+                self._workbook = None
+
+    def _checkpoint(self, results: List[Dict]):
+        """把一批结果写入计划工作簿并保存"""
+        try:
+            if self._workbook is None:
+                self._workbook = load_workbook(self.plan_file_path)
+            self.updater.apply_results(self._workbook, results, verbose=False)
+            self.updater.save(self._workbook, self.plan_file_path)
+            self.checkpoints += 1
+        except Exception as e:
+            print(f"保存计划文件检查点时出错: {e}")
+            traceback.print_exc()
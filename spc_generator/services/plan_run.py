@@ -0,0 +1,248 @@
+"""计划运行状态 - 一个计划文件在一次运行中的任务分组、输出目录、结果日志、检查点和重新运行清单"""
+
+import logging
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
+from .file_organizer import FileOrganizer
+from .plan_updater import PlanUpdater
+from .result_journal import ResultJournal
+from .plan_checkpoint_writer import PlanCheckpointWriter
+from .rerun_manifest import RerunManifest
+from ..models.task import Task
+from ..utils.logger import get_logger
+from ..config.constants import MONTH_MAP, MONTH_NAME_MAP, PLAN_JOURNAL_SUFFIX, RERUN_MANIFEST_SUFFIX
+
+
+class PlanRun:
+    """
+    一个计划文件的运行状态
+
+    单个计划运行和批量运行（多个车间的计划共用一个生成流水线）都按计划各自保存：
+    按月份分组的任务、各月份输出目录、生成结果、结果日志、计划文件检查点和重新运行清单。
+    """
+
+    def __init__(
+        self,
+        plan_file: str,
+        tasks: List[Task],
+        sheet_approvers: Dict[str, Dict[str, str]],
+        workshop_name: str,
+        year: int,
+        output_root: str = "."
+    ):
+        """
+        Args:
+            plan_file: 计划文件路径
+            tasks: 计划中的任务（可以来自多个工作表）
+            sheet_approvers: 工作表名称 -> 审批人信息
+            workshop_name: 车间名称
+            year: 年份
+            output_root: 输出根目录（批量运行时为车间文件夹）
+        """
+        self.plan_file = plan_file
+        self.tasks = tasks
+        self.sheet_approvers = sheet_approvers
+        self.workshop_name = workshop_name
+        self.year = year
+        self.output_root = output_root
+        self.logger = get_logger() or logging.getLogger(__name__)
+
+        # 按月份分组任务
+        self.month_tasks: Dict[int, List[Task]] = {}
+        for task in tasks:
+            for month_name in task.month_status:
+                month_num = MONTH_MAP.get(month_name)
+                if month_num:
+                    self.month_tasks.setdefault(month_num, []).append(task)
+        # 需要生成的任务（使用重新运行清单时不含复用上次结果的任务）
+        self.pending_tasks: Dict[int, List[Task]] = self.month_tasks
+        self.output_dirs: Dict[int, str] = {}
+
+        # 生成的文件和用于更新计划文件的结果
+        self.generated_files: List[Dict] = []
+        self.all_results: List[Dict] = []
+
+        self.plan_updater = PlanUpdater()
+        self.journal = ResultJournal(os.path.splitext(plan_file)[0] + PLAN_JOURNAL_SUFFIX)
+        self.checkpoint_writer: Optional[PlanCheckpointWriter] = None
+        self.manifest: Optional[RerunManifest] = None
+
+    @property
+    def approver_info(self) -> Dict[str, str]:
+        """第一个计划工作表的审批人信息"""
+        return next(iter(self.sheet_approvers.values()), {})
+
+    def approver_for(self, task: Task) -> Dict[str, str]:
+        """
+        任务所在工作表的审批人信息
+
+        Args:
+            task: 任务
+
+        Returns:
+            审批人信息字典
+        """
+        return self.sheet_approvers.get(task.sheet_name, self.approver_info)
+
+    def iter_pending(self) -> Iterator[Tuple[int, Task]]:
+        """按月份顺序遍历需要生成的 (月份, 任务)"""
+        for month_num in sorted(self.pending_tasks.keys()):
+            for task in self.pending_tasks[month_num]:
+                yield month_num, task
+
+    def plan_output_dirs(self, organizer: FileOrganizer, output_mode: str):
+        """
+        预先规划输出目录：当月多个任务时直接保存到月份文件夹（月度工作簿每月只有一个文件，保存在输出根目录）
+
+        Args:
+            organizer: 文件组织服务
+            output_mode: 输出文件组织方式 ('files' / 'monthly')
+        """
+        if output_mode == 'files':
+            self.output_dirs = organizer.plan_month_folders(
+                {month_num: len(month_task_list) for month_num, month_task_list in self.month_tasks.items()},
+                self.output_root
+            )
+        else:
+            self.output_dirs = {month_num: self.output_root for month_num in self.month_tasks}
+
+    def start_journal(self, update_plan: bool):
+        """
+        开始结果日志：上次运行中断时留下的结果可以先合并到计划文件，然后开始新的日志；
+        选择更新计划文件时启动检查点写入器
+
+        Args:
+            update_plan: 是否更新计划文件
+        """
+        previous_results = self.journal.read()
+        if previous_results:
+            print(f"\n发现上次运行未合并的结果日志: {self.journal.path}（{len(previous_results)} 条结果）")
+            merge_choice = input("是否先合并到SPC推进计划文件? (Y=合并, N=丢弃, 默认Y): ").strip().upper()
+            self.logger.info(f"上次运行的结果日志 {len(previous_results)} 条，用户选择合并: {merge_choice}")
+            if merge_choice != 'N':
+                self.plan_updater.update_spc_plan_file(self.plan_file, previous_results)
+        self.journal.open(reset=True)
+        if update_plan:
+            self.checkpoint_writer = PlanCheckpointWriter(self.plan_file, self.plan_updater)
+            self.checkpoint_writer.start()
+
+    def apply_manifest(self, settings: Dict[str, object], use_reference_range: bool) -> int:
+        """
+        重新运行：计划行未修改且输出文件仍在的任务复用上次的结果，只生成修改过的行
+
+        Args:
+            settings: 影响输出文件内容的运行设置
+            use_reference_range: 是否使用参考分布范围模式（记录复用的结果）
+
+        Returns:
+            复用的任务数
+        """
+        plan_dir, plan_filename = os.path.split(self.plan_file)
+        self.manifest = RerunManifest(os.path.join(plan_dir, f".{plan_filename}{RERUN_MANIFEST_SUFFIX}"), settings)
+        self.pending_tasks = {}
+        reused_count = 0
+        for month_num in sorted(self.month_tasks.keys()):
+            for task in self.month_tasks[month_num]:
+                previous = self.manifest.lookup(task, month_num, self.output_dirs[month_num])
+                if previous is not None:
+                    self.record_result(task, month_num, previous, use_reference_range)
+                    reused_count += 1
+                else:
+                    self.manifest.discard(task, month_num)
+                    self.pending_tasks.setdefault(month_num, []).append(task)
+        self.manifest.flush()
+        return reused_count
+
+    @property
+    def pending_count(self) -> int:
+        """需要生成的任务数"""
+        return sum(len(month_task_list) for month_task_list in self.pending_tasks.values())
+
+    def record_result(
+        self,
+        task: Task,
+        month_num: int,
+        result: Tuple[str, float, str, float],
+        use_reference_range: bool
+    ):
+        """
+        记录生成的文件和用于更新原计划文件的结果（立即写入结果日志，并交给检查点写入器）
+
+        Args:
+            task: 任务
+            month_num: 月份
+            result: (文件路径, 调整后的目标CPK, 难度, 实际CPK)
+            use_reference_range: 是否使用参考分布范围模式
+        """
+        file_path, adjusted_target_cpk, difficulty, actual_cpk = result
+
+        # 记录生成的文件
+        self.generated_files.append({
+            'month': month_num,
+            'month_name': MONTH_NAME_MAP.get(month_num, f"{month_num}月"),
+            'filename': os.path.basename(file_path),
+            'full_path': os.path.abspath(file_path),
+            'workshop_name': self.workshop_name,
+            'product_model': task.product_model,
+            'process': task.process,
+            'inspection_item': task.inspection_item,
+            'target_cpk': adjusted_target_cpk,
+            'actual_cpk': actual_cpk,
+            'difficulty': difficulty,
+            'use_reference_range': use_reference_range
+        })
+
+        # 记录结果用于更新原计划文件
+        plan_result = {
+            'sheet_name': task.sheet_name,
+            'row_index': task.row_index,
+            'month_num': month_num,
+            'actual_cpk': actual_cpk,
+            'adjusted_target_cpk': adjusted_target_cpk,
+            'difficulty': difficulty,
+            'product_model': task.product_model,
+            'process': task.process
+        }
+        self.all_results.append(plan_result)
+        self.journal.append(plan_result)
+        if self.checkpoint_writer is not None:
+            self.checkpoint_writer.submit(plan_result)
+        if self.manifest is not None:
+            self.manifest.record(task, month_num, result)
+
+    def finish(self, update_plan: bool):
+        """
+        更新年度计划文件：由结果日志合并生成最终的计划文件，成功后删除日志
+
+        Args:
+            update_plan: 是否更新计划文件
+        """
+        if self.checkpoint_writer is not None:
+            self.checkpoint_writer.close(flush=False)
+            self.checkpoint_writer = None
+        if self.manifest is not None:
+            self.manifest.flush()
+        self.journal.close()
+        if self.all_results and update_plan:
+            print("\n" + "-" * 60)
+            self.logger.info(f"开始更新SPC推进计划文件: {self.plan_file}")
+            if self.plan_updater.update_spc_plan_file(self.plan_file, self.journal.read()):
+                self.journal.remove()
+                self.logger.info("SPC推进计划文件更新完成")
+            else:
+                print(f"结果保存在结果日志中，下次运行时可以合并: {self.journal.path}")
+                self.logger.warning(f"SPC推进计划文件更新失败，结果日志保留: {self.journal.path}")
+        else:
+            if self.all_results:
+                print(f"用户选择不更新SPC推进计划文件: {self.plan_file}")
+                self.logger.info(f"用户选择不更新SPC推进计划文件: {self.plan_file}")
+            self.journal.remove()
+
+    def abort(self):
+        """运行出错时保存尚未写入的检查点（已完成任务的结果在结果日志中）"""
+        if self.checkpoint_writer is not None:
+            self.checkpoint_writer.close()
+            self.checkpoint_writer = None
+        if self.manifest is not None:
+            self.manifest.flush()
+        self.journal.close()
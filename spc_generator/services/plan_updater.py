@@ -1,8 +1,9 @@
 """计划更新服务"""
 
 import os
-from typing import List, Dict
+from typing import Iterable, List, Dict, Optional
 from openpyxl import load_workbook
+from ..utils.output_registry import OutputRegistry
 
 
 class PlanUpdater:
@@ -12,60 +13,96 @@ class PlanUpdater:
         self,
         plan_file_path: str,
         results: List[Dict]
-    ):
+    ) -> Optional[str]:
         """
         更新SPC推进计划文件
         
         Args:
             plan_file_path: 计划文件路径
             results: 结果列表，每个结果包含row_index, month_num, actual_cpk等
+            
+        Returns:
+            更新后的文件路径，没有结果或出错时返回None
         """
         try:
             if not results:
                 print("没有需要更新的结果")
-                return
+                return None
             
-            # 加载原文件
+            # 加载原文件（所有工作表的结果一次写入、一次保存）
             wb = load_workbook(plan_file_path)
-            ws = wb.active
-            
-            # 实际cpk列（V列，第22列）
-            actual_cpk_col = 22
-            # 目标cpk列（U列，第21列）
-            target_cpk_col = 21
-            
-            # 更新数据
-            for result in results:
-                row_idx = result['row_index']
-                month_num = result['month_num']
-                
-                # 将N改为Y
-                month_col = 8 + month_num  # I列是9，对应索引9
-                ws.cell(row=row_idx, column=month_col).value = 'Y'
-                
-                # 填入实际cpk（V列，第22列）
-                ws.cell(row=row_idx, column=actual_cpk_col).value = result['actual_cpk']
-                
-                # 更新目标cpk（U列，第21列）为调整后的值
-                adjusted_target_cpk = result.get('adjusted_target_cpk')
-                if adjusted_target_cpk is not None:
-                    ws.cell(row=row_idx, column=target_cpk_col).value = adjusted_target_cpk
-                    print(f"  更新行{row_idx}: {result['product_model']} - {result['process']}, "
-                          f"目标cpk: {adjusted_target_cpk:.3f}, 实际cpk: {result['actual_cpk']:.3f}, "
-                          f"难度: {result.get('difficulty', '未知')}")
-                else:
-                    print(f"  更新行{row_idx}: {result['product_model']} - {result['process']}, "
-                          f"实际cpk: {result['actual_cpk']:.3f}, 难度: {result.get('difficulty', '未知')}")
-            
-            # 保存更新后的文件
-            base_name = os.path.splitext(plan_file_path)[0]
-            updated_filename = f"{base_name}_已更新.xlsx"
-            wb.save(updated_filename)
+            self.apply_results(wb, results)
+            updated_filename = self.save(wb, plan_file_path)
             wb.close()
             
             print(f"\n已更新SPC推进计划文件: {updated_filename}")
+            return updated_filename
         
         except Exception as e:
             print(f"更新SPC推进计划文件时出错: {e}")
             import traceback
             traceback.print_exc()
+            return None
+    
+    def apply_results(self, wb, results: Iterable[Dict], verbose: bool = True):
+        """
+        把结果写入任务所在的计划工作表（月份列改为Y，填入实际CPK和调整后的目标CPK）
+        
+        Args:
+            wb: 计划工作簿
+            results: 结果列表（sheet_name为任务所在工作表，没有或工作表已不存在时写入活动工作表）
+            verbose: 是否打印每一行的更新内容
+        """
+        # 实际cpk列（V列，第22列）
+        actual_cpk_col = 22
+        # 目标cpk列（U列，第21列）
+        target_cpk_col = 21
+        
+        multiple_sheets = len(wb.sheetnames) > 1
+        for result in results:
+            row_idx = result['row_index']
+            month_num = result['month_num']
+            sheet_name = result.get('sheet_name')
+            ws = wb[sheet_name] if sheet_name in wb.sheetnames else wb.active
+            row_label = f"{ws.title}!行{row_idx}" if multiple_sheets else f"行{row_idx}"
+            
+            # 将N改为Y
+            month_col = 8 + month_num  # I列是9，对应索引9
+            ws.cell(row=row_idx, column=month_col).value = 'Y'
+            
+            # 填入实际cpk（V列，第22列）
+            ws.cell(row=row_idx, column=actual_cpk_col).value = result['actual_cpk']
+            
+            # 更新目标cpk（U列，第21列）为调整后的值
+            adjusted_target_cpk = result.get('adjusted_target_cpk')
+            if adjusted_target_cpk is not None:
+                ws.cell(row=row_idx, column=target_cpk_col).value = adjusted_target_cpk
+                if verbose:
+                    print(f"  更新{row_label}: {result['product_model']} - {result['process']}, "
+                          f"目标cpk: {adjusted_target_cpk:.3f}, 实际cpk: {result['actual_cpk']:.3f}, "
+                          f"难度: {result.get('difficulty', '未知')}")
+            elif verbose:
+                print(f"  更新{row_label}: {result['product_model']} - {result['process']}, "
+                      f"实际cpk: {result['actual_cpk']:.3f}, 难度: {result.get('difficulty', '未知')}")
+    
+    def save(self, wb, plan_file_path: str) -> str:
+        """
+        保存更新后的计划文件（先写入临时文件再原子替换，中途出错不会损坏上次更新的文件）
+        
+        Args:
+            wb: 已写入结果的计划工作簿
+            plan_file_path: 原计划文件路径
+            
+        Returns:
+            更新后的文件路径
+        """
+        updated_filename = self.get_updated_path(plan_file_path)
+        with OutputRegistry().write(updated_filename) as temp_path:
+            wb.save(temp_path)
+        return updated_filename
+    
+    @staticmethod
+    def get_updated_path(plan_file_path: str) -> str:
+        """更新后的计划文件路径: {原文件名}_已更新.xlsx"""
+        base_name = os.path.splitext(plan_file_path)[0]
+        return f"{base_name}_已更新.xlsx"
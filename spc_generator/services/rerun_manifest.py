@@ -0,0 +1,170 @@
+"""重新运行清单 - 记录每个计划行的内容哈希和生成结果，再次运行时只重新生成修改过的行"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from ..models.task import Task
+from ..utils.output_registry import OutputRegistry
+from ..config.constants import RERUN_MANIFEST_SAVE_INTERVAL
+
+
+class RerunManifest:
+    """
+    重新运行清单
+
+    以JSON保存在计划文件旁，按工作表和行号记录该行相关字段（B..H列、U列和月份标记）的哈希，
+    以及各月份生成的文件、调整后的目标CPK、难度和实际CPK。
+    再次运行时行哈希未变、输出文件仍在且输出目录相同的任务直接复用上次的结果；
+    模板、审批人或运行选项（参考范围模式、输出方式等）变化时清单整体失效。
+    记录结果后距上次保存超过RERUN_MANIFEST_SAVE_INTERVAL秒时保存一次清单（运行结束时调用flush保存），
+    中途中断后已生成的文件下次仍可复用。
+    """
+
+    def __init__(self, path: str, settings: Dict[str, object]):
+        """
+        Args:
+            path: 清单文件路径
+            settings: 影响输出文件内容的运行设置（与上次不同时不复用任何结果）
+        """
+        self.path = path
+        self.settings = settings
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_save = time.monotonic()
+        # "工作表!行号" -> {'hash': 行哈希, 'months': {月份(字符串): 结果}}
+        self._rows: Dict[str, Dict] = self._load()
+
+    @staticmethod
+    def row_key(task: Task) -> str:
+        """清单中计划行的键: 工作表!行号"""
+        return f"{task.sheet_name}!{task.row_index}"
+
+    @staticmethod
+    def row_hash(task: Task) -> str:
+        """
+        计划行相关字段的哈希
+
+        Args:
+            task: 任务
+
+        Returns:
+            十六进制哈希字符串
+        """
+        fields = [
+            task.product_model, task.process, task.theory, task.reference_range,
+            task.inspection_item, task.resolution, task.equipment_no, task.target_cpk,
+            sorted(month for month, flag in task.month_status.items() if flag),
+        ]
+        payload = json.dumps(fields, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def lookup(
+        self,
+        task: Task,
+        month_num: int,
+        output_dir: str = "."
+    ) -> Optional[Tuple[str, float, str, float]]:
+        """
+        查找可以复用的上次结果
+
+        Args:
+            task: 任务
+            month_num: 月份
+            output_dir: 本次的输出目录
+
+        Returns:
+            (文件路径, 调整后的目标CPK, 难度, 实际CPK)，行已修改、文件不存在或输出目录变化时返回None
+        """
+        with self._lock:
+            row = self._rows.get(self.row_key(task))
+            if row is None or row['hash'] != self.row_hash(task):
+                return None
+            entry = row['months'].get(str(month_num))
+        if entry is None or not os.path.isfile(entry['file']):
+            return None
+        if os.path.normpath(os.path.dirname(entry['file'])) != os.path.normpath(output_dir):
+            return None
+        return entry['file'], entry['adjusted_target_cpk'], entry['difficulty'], entry['actual_cpk']
+
+    def discard(self, task: Task, month_num: int):
+        """
+        删除不能复用的上次输出文件（重新生成时沿用原文件名，不会产生带序号的新文件）
+
+        Args:
+            task: 任务
+            month_num: 月份
+        """
+        with self._lock:
+            row = self._rows.get(self.row_key(task))
+            entry = row['months'].pop(str(month_num), None) if row else None
+            if entry is None:
+                return
+            self._dirty = True
+        try:
+            os.remove(entry['file'])
+        except OSError:
+            pass
+
+    def record(self, task: Task, month_num: int, result: Tuple[str, float, str, float]):
+        """
+        记录一个任务的生成结果（距上次保存超过保存间隔时保存清单）
+
+        Args:
+            task: 任务
+            month_num: 月份
+            result: (文件路径, 调整后的目标CPK, 难度, 实际CPK)
+        """
+        file_path, adjusted_target_cpk, difficulty, actual_cpk = result
+        row_hash = self.row_hash(task)
+        with self._lock:
+            row = self._rows.get(self.row_key(task))
+            if row is None or row['hash'] != row_hash:
+                row = {'hash': row_hash, 'months': {}}
+                self._rows[self.row_key(task)] = row
+            row['months'][str(month_num)] = {
+                'file': file_path,
+                'adjusted_target_cpk': float(adjusted_target_cpk),
+                'difficulty': difficulty,
+                'actual_cpk': float(actual_cpk),
+            }
+            self._dirty = True
+            if time.monotonic() - self._last_save >= RERUN_MANIFEST_SAVE_INTERVAL:
+                self._save()
+
+    def flush(self):
+        """保存尚未保存的记录"""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def _load(self) -> Dict[str, Dict]:
+        """读取上次的清单，不存在、无法读取或运行设置不同时返回空清单"""
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"警告: 重新运行清单无法读取，全部任务重新生成: {e}")
+            return {}
+        if not isinstance(data, dict) or data.get('settings') != self.settings:
+            return {}
+        return data.get('rows', {})
+
+    def _save(self):
+        """原子写入清单（调用方持有锁），失败时只打印警告"""
+        temp_path = None
+        try:
+            temp_path = OutputRegistry.create_temp_file(self.path)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'settings': self.settings, 'rows': self._rows}, f, ensure_ascii=False, indent=1)
+            OutputRegistry.commit(temp_path, self.path)
+            self._dirty = False
+            self._last_save = time.monotonic()
+        except Exception as e:
+            if temp_path is not None:
+                OutputRegistry.discard(temp_path)
+            print(f"警告: 重新运行清单无法保存: {e}")
@@ -0,0 +1,79 @@
+"""结果日志 - 每个任务完成时立即追加一行JSON并落盘，程序中断后仍可据此更新计划文件"""
+
+import json
+import os
+import threading
+from typing import Dict, List
+
+
+class ResultJournal:
+    """
+    结果日志（JSONL，每行一个任务结果）
+
+    每条结果写入后立即flush并fsync，运行中途崩溃或被中断时已完成任务的结果不会丢失。
+    读取时忽略最后一行写到一半的记录。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def open(self, reset: bool = True):
+        """
+        打开日志
+
+        Args:
+            reset: 是否清空已有记录（新的一次运行）
+        """
+        self.close()
+        self._file = open(self.path, 'w' if reset else 'a', encoding='utf-8')
+
+    def append(self, result: Dict):
+        """
+        追加一条结果并落盘
+
+        Args:
+            result: 结果字典（sheet_name, row_index, month_num, actual_cpk等）
+        """
+        line = json.dumps(result, ensure_ascii=False, default=float) + '\n'
+        with self._lock:
+            if self._file is None:
+                raise RuntimeError("结果日志未打开")
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        """关闭日志"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def read(self) -> List[Dict]:
+        """
+        读取全部结果（按写入顺序）
+
+        Returns:
+            结果列表，日志不存在时为空列表
+        """
+        if not os.path.exists(self.path):
+            return []
+        results = []
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    results.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # 中断时写到一半的最后一行
+                    continue
+        return results
+
+    def remove(self):
+        """关闭并删除日志（结果已全部写入计划文件后）"""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
@@ -0,0 +1,218 @@
+"""SPC生成流水线 - 准备、数据生成、渲染保存、结果汇总四个阶段通过有界队列并行执行"""
+
+import os
+import queue
+import random
+import threading
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple
+import numpy as np
+from .spc_service import SPCService
+from .plan_run import PlanRun
+from ..models.spc_job import SPCJob
+from ..models.spc_data import SPCData
+from ..generators.strategy_chain import GenerationStrategyChain
+from ..config.constants import PIPELINE_GENERATE_WORKERS, PIPELINE_RENDER_THREADS, PIPELINE_QUEUE_SIZE
+
+
+# 生成子进程中的策略链（进程启动时传入一次，不随每个任务序列化）
+_worker_chain: Optional[GenerationStrategyChain] = None
+
+
+def _init_generate_worker(strategy_chain: GenerationStrategyChain):
+    """生成子进程初始化"""
+    global _worker_chain
+    _worker_chain = strategy_chain
+    # fork启动的子进程继承父进程的随机数状态，重新播种以免各进程生成相同的数据
+    random.seed()
+    np.random.seed()
+
+
+def _generate_in_worker(job: SPCJob) -> Tuple[Optional[SPCData], Dict[str, int]]:
+    """在生成子进程中运行策略链"""
+    spc_data = SPCService.run_strategy_chain(_worker_chain, job)
+    return spc_data, dict(_worker_chain.attempts_used)
+
+
+# 队列结束标记
+_STOP = object()
+
+# 结果回调: (生成任务, (文件路径, 调整后的目标CPK, 难度, 实际CPK))
+ResultCallback = Callable[[SPCJob, Tuple[str, float, str, float]], None]
+
+
+class SPCPipeline:
+    """
+    SPC生成流水线
+
+    1. 准备：在调用线程中解析公差、检查目标CPK（可能询问用户）、计算控制限、确定生成策略
+       （询问用户时持有服务的控制台输出锁，其他阶段的输出等询问结束后再打印）
+    2. 数据生成：进程池（CPU密集），每个进程一个调度线程，同时只有进程数个任务在生成
+    3. 渲染保存：线程池，填充工作表、压缩并写入文件（I/O密集）
+    4. 结果汇总：单个线程按完成顺序调用结果回调
+
+    各阶段之间是有界队列，上游快于下游时阻塞等待，内存中的任务数不超过队列容量之和。
+    """
+
+    def __init__(
+        self,
+        service: SPCService,
+        generate_workers: Optional[int] = PIPELINE_GENERATE_WORKERS,
+        render_threads: int = PIPELINE_RENDER_THREADS,
+        queue_size: int = PIPELINE_QUEUE_SIZE
+    ):
+        self.service = service
+        self.generate_workers = generate_workers or os.cpu_count() or 1
+        self.render_threads = max(1, render_threads)
+        self.queue_size = max(1, queue_size)
+        # 未生成文件的任务数（跳过、生成失败或出错）
+        self.failed_jobs = 0
+        self._failed_lock = threading.Lock()
+
+    def run_plans(
+        self,
+        plan_runs: Sequence[PlanRun],
+        template_path: str,
+        on_result: ResultCallback,
+        use_reference_range: bool = False,
+        search_engine: str = 'auto'
+    ):
+        """
+        批量运行：多个计划的待生成任务共用一个进程池和模板缓存，全部任务处理完后返回
+
+        Args:
+            plan_runs: 各计划的运行状态（使用其中的待生成任务、车间、年份、审批人和输出目录）
+            template_path: 模板文件路径
+            on_result: 结果回调（在汇总线程中调用，job.plan_file为任务所属的计划文件）
+            use_reference_range: 是否使用参考分布范围模式
+            search_engine: 参考范围模式搜索引擎
+        """
+        self._run(
+            (
+                (f"{plan.workshop_name} {task.product_model} - {task.process} - {task.inspection_item}", partial(
+                    self.service.prepare_job, task, month_num, plan.year, plan.workshop_name, template_path,
+                    plan.approver_for(task), use_reference_range, search_engine, plan.output_dirs[month_num],
+                    plan.plan_file
+                ))
+                for plan in plan_runs
+                for month_num, task in plan.iter_pending()
+            ),
+            on_result
+        )
+
+    def _run(self, prepare_items: Iterable[Tuple[str, Callable[[], Optional[SPCJob]]]], on_result: ResultCallback):
+        """
+        运行流水线
+
+        Args:
+            prepare_items: (任务描述, 准备函数) 序列，准备函数在调用线程中执行并返回生成任务
+            on_result: 结果回调
+        """
+        self.failed_jobs = 0
+        generate_queue: queue.Queue = queue.Queue(self.queue_size)
+        render_queue: queue.Queue = queue.Queue(self.queue_size)
+        result_queue: queue.Queue = queue.Queue(self.queue_size)
+
+        with ProcessPoolExecutor(
+            max_workers=self.generate_workers,
+            initializer=_init_generate_worker,
+            initargs=(self.service.strategy_chain,)
+        ) as pool:
+            generate_threads = self._start_threads(
+                self.generate_workers, self._generate_stage, pool, generate_queue, render_queue
+            )
+            render_threads = self._start_threads(
+                self.render_threads, self._render_stage, render_queue, result_queue
+            )
+            collector = self._start_threads(1, self._collect_stage, result_queue, on_result)
+
+            try:
+                # 阶段1: 准备（主线程）
+                for label, prepare in prepare_items:
+                    try:
+                        job = prepare()
+                    except Exception as e:
+                        self._report_error(label, e)
+                        continue
+                    if job is None:
+                        self._count_failure()
+                        continue
+                    generate_queue.put(job)
+            finally:
+                # 按阶段顺序结束各线程
+                self._stop_threads(generate_threads, generate_queue)
+                self._stop_threads(render_threads, render_queue)
+                self._stop_threads(collector, result_queue)
+
+    @staticmethod
+    def _start_threads(count: int, target, *args):
+        """启动阶段线程"""
+        threads = [threading.Thread(target=target, args=args, daemon=True) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    @staticmethod
+    def _stop_threads(threads, input_queue: queue.Queue):
+        """发送结束标记并等待阶段线程退出"""
+        for _ in threads:
+            input_queue.put(_STOP)
+        for thread in threads:
+            thread.join()
+
+    def _generate_stage(self, pool: ProcessPoolExecutor, input_queue: queue.Queue, output_queue: queue.Queue):
+        """阶段2: 数据生成（调度线程把任务交给进程池并等待结果）"""
+        while True:
+            job = input_queue.get()
+            if job is _STOP:
+                return
+            try:
+                spc_data, attempts_used = pool.submit(_generate_in_worker, job).result()
+                with self.service.console_lock:
+                    print(f"  [{job.label}]")
+                    generated = SPCService.report_generation(attempts_used, spc_data)
+                if not generated:
+                    self._count_failure()
+                    continue
+                output_queue.put((job, spc_data))
+            except Exception as e:
+                self._report_error(job.label, e)
+
+    def _render_stage(self, input_queue: queue.Queue, output_queue: queue.Queue):
+        """阶段3: 渲染保存"""
+        while True:
+            item = input_queue.get()
+            if item is _STOP:
+                return
+            job, spc_data = item
+            try:
+                output_queue.put((job, self.service.render_job(job, spc_data)))
+            except Exception as e:
+                self._report_error(job.label, e)
+
+    def _collect_stage(self, input_queue: queue.Queue, on_result: ResultCallback):
+        """阶段4: 结果汇总"""
+        while True:
+            item = input_queue.get()
+            if item is _STOP:
+                return
+            job, result = item
+            try:
+                with self.service.console_lock:
+                    on_result(job, result)
+            except Exception as e:
+                self._report_error(job.label, e)
+
+    def _count_failure(self):
+        """记录一个未生成文件的任务"""
+        with self._failed_lock:
+            self.failed_jobs += 1
+
+    def _report_error(self, label: str, error: Exception):
+        """打印阶段中的错误（单个任务失败不影响其他任务）"""
+        self._count_failure()
+        with self.service.console_lock:
+            print(f"    错误: {label}: {error}")
+            traceback.print_exc()
@@ -2,22 +2,40 @@
 
 import os
 import re
-from typing import Optional, Dict, List, Tuple
+import threading
+from typing import TYPE_CHECKING, Optional, Dict, List, Tuple
 from ..models.task import Task
 from ..models.tolerance import Tolerance
 from ..models.control_limits import ControlLimits
 from ..models.spc_data import SPCData
+from ..models.spc_job import SPCJob
+from ..models.difficulty_prediction import DifficultyPrediction
 from ..parsers.theoretical_value_parser import TheoreticalValueParser
 from ..parsers.reference_range_parser import ReferenceRangeParser
 from ..calculators.control_limits_calculator import ControlLimitsCalculator
 from ..generators.standard_generator import StandardGenerator
 from ..generators.reference_range_generator import ReferenceRangeGenerator
+from ..generators.annealing_generator import AnnealingGenerator
+from ..generators.strategy_chain import GenerationStrategyChain
 from ..processors.difficulty_evaluator import DifficultyEvaluator
+from ..processors.feasibility_checker import FeasibilityChecker
+from ..models.feasibility import FeasibilityResult
 from ..excel.template_handler import TemplateHandler
 from ..excel.formula_restorer import FormulaRestorer
 from ..excel.chart_adjuster import ChartAdjuster
 from ..excel.worksheet_writer import WorksheetWriter
+from ..excel.xml_cell_patcher import XmlCellPatcher, CellMap
 from ..utils.file_utils import FileUtils
+from ..utils.output_registry import OutputRegistry
+from ..config.constants import (
+    REFERENCE_STRATEGY_ORDER, STANDARD_STRATEGY_ORDER, ANNEALING_STRATEGY_ORDER, FALLBACK_STRATEGIES,
+    OUTPUT_WRITER, OUTPUT_MODE, MONTH_NAME_MAP
+)
+
+if TYPE_CHECKING:
+    # xlsxwriter为可选依赖，只在使用xlsxwriter写入方式或月度工作簿时导入
+    from ..excel.xlsxwriter_backend import XlsxWriterBackend
+    from ..excel.monthly_workbook_writer import MonthlyWorkbookWriter
 
 
 class SPCService:
@@ -34,7 +52,14 @@ class SPCService:
         formula_restorer: FormulaRestorer,
         chart_adjuster: ChartAdjuster,
         worksheet_writer: WorksheetWriter,
-        difficulty_evaluator: DifficultyEvaluator
+        difficulty_evaluator: DifficultyEvaluator,
+        feasibility_checker: Optional[FeasibilityChecker] = None,
+        strategy_chain: Optional[GenerationStrategyChain] = None,
+        xml_patcher: Optional[XmlCellPatcher] = None,
+        xlsx_backend: Optional['XlsxWriterBackend'] = None,
+        output_registry: Optional[OutputRegistry] = None,
+        output_writer: str = OUTPUT_WRITER,
+        output_mode: str = OUTPUT_MODE
     ):
         self.parser = parser
         self.ref_range_parser = ref_range_parser
@@ -46,7 +71,41 @@ class SPCService:
         self.chart_adjuster = chart_adjuster
         self.worksheet_writer = worksheet_writer
         self.difficulty_evaluator = difficulty_evaluator
+        self.feasibility_checker = feasibility_checker or FeasibilityChecker(difficulty_evaluator, calculator)
+        self.strategy_chain = strategy_chain or GenerationStrategyChain({
+            'reference': reference_range_generator,
+            'annealing': AnnealingGenerator(),
+            'standard': standard_generator,
+        })
+        self.xml_patcher = xml_patcher or XmlCellPatcher()
+        self._xlsx_backend = xlsx_backend
+        self._xlsx_backend_lock = threading.Lock()
+        self.output_writer = output_writer
+        self.output_mode = output_mode
+        
+        # 输出文件名分配（渲染线程共享）
+        self.output_registry = output_registry or OutputRegistry()
+        
+        # 月度工作簿（按输出目录和月份，批量运行时每个车间各有一组）及其访问锁
+        self._monthly_writers: Dict[Tuple[str, int], 'MonthlyWorkbookWriter'] = {}
+        self._monthly_lock = threading.Lock()
+        # 控制台输出锁：准备任务（可能询问用户）时持有，流水线其他线程的输出等待询问结束，
+        # 不会与提示和用户输入交错
+        self.console_lock = threading.RLock()
         self.file_utils = FileUtils()
+        
+        # 可行性预检查判定不可行（跳过或转为标准模式）或难度预测改用标准模式的任务，用于运行汇总
+        self.infeasible_tasks: List[Dict] = []
+    
+    @property
+    def xlsx_backend(self) -> 'XlsxWriterBackend':
+        """xlsxwriter写入后端（首次使用时导入xlsxwriter并创建，渲染线程共用）"""
+        if self._xlsx_backend is None:
+            with self._xlsx_backend_lock:
+                if self._xlsx_backend is None:
+                    from ..excel.xlsxwriter_backend import XlsxWriterBackend
+                    self._xlsx_backend = XlsxWriterBackend()
+        return self._xlsx_backend
     
     def generate_spc_file(
         self,
@@ -56,10 +115,12 @@ class SPCService:
         workshop_name: str,
         template_path: str,
         approver_info: Dict[str, str],
-        use_reference_range: bool = False
+        use_reference_range: bool = False,
+        search_engine: str = 'auto',
+        output_dir: str = "."
     ) -> Optional[Tuple[str, float, str, float]]:
         """
-        为单个任务生成SPC文件
+        为单个任务生成SPC文件（依次执行准备、数据生成、渲染保存三个阶段）
         
         Args:
             task: 任务信息
@@ -69,33 +130,88 @@ class SPCService:
             template_path: 模板文件路径
             approver_info: 审批人信息
             use_reference_range: 是否使用参考分布范围模式
+            search_engine: 参考范围模式搜索引擎 ('auto' / 'sampling' / 'annealing')
+            output_dir: 输出目录
             
         Returns:
-            (文件路径, 调整后的目标CPK, 难度) 元组，失败返回None
+            (文件路径, 调整后的目标CPK, 难度, 实际CPK) 元组，失败返回None
         """
         try:
+            job = self.prepare_job(
+                task, month_num, year, workshop_name, template_path, approver_info,
+                use_reference_range, search_engine, output_dir
+            )
+            if job is None:
+                return None
+            
+            spc_data = self.generate_data(job)
+            if spc_data is None:
+                return None
+            
+            return self.render_job(job, spc_data)
+            
+        except Exception as e:
+            print(f"    错误: {e}")
+            import traceback
+            traceback.print_exc()
+            return None
+    
+    def prepare_job(
+        self,
+        task: Task,
+        month_num: int,
+        year: int,
+        workshop_name: str,
+        template_path: str,
+        approver_info: Dict[str, str],
+        use_reference_range: bool = False,
+        search_engine: str = 'auto',
+        output_dir: str = ".",
+        plan_file: str = ""
+    ) -> Optional[SPCJob]:
+        """
+        准备阶段：解析公差和参考范围、检查目标CPK、计算控制限并确定生成策略
+        （可能询问用户调整目标CPK，因此在主线程中执行）
+        
+        Args:
+            task: 任务信息
+            month_num: 月份
+            year: 年份
+            workshop_name: 车间名称
+            template_path: 模板文件路径
+            approver_info: 审批人信息
+            use_reference_range: 是否使用参考分布范围模式
+            search_engine: 参考范围模式搜索引擎 ('auto' / 'sampling' / 'annealing')
+            output_dir: 输出目录
+            plan_file: 任务所属的计划文件（批量运行时区分各计划的结果）
+            
+        Returns:
+            生成任务，公差无效或任务不可行时返回None
+        """
+        # 任务信息和目标CPK检查（可能询问用户）连续输出
+        with self.console_lock:
             print(f"  处理: {task.product_model} - {task.process} - {task.inspection_item}")
             print(f"  目标cpk: {task.target_cpk}")
-            
+        
             if task.resolution:
                 print(f"  分辨率: {task.resolution}")
-            
+        
             if task.reference_range:
                 print(f"  参考分布范围: {task.reference_range}")
-            
+        
             # 步骤1: 解析理论值
             tolerance = self.parser.parse(task.theory)
             if not tolerance.is_valid():
                 print(f"    警告: 公差无效")
                 return None
-            
+        
             print(f"    公差类型: {tolerance.tolerance_type.value}")
-            
+        
             # 步骤2: 解析参考分布范围
             ref_lower, ref_upper = None, None
             if task.reference_range:
                 ref_lower, ref_upper = self.ref_range_parser.parse(task.reference_range)
-            
+        
             # 步骤3: 检查并调整目标cpk（如果开启了参考范围模式）
             adjusted_target_cpk, difficulty = self._check_and_adjust_target_cpk(
                 task.target_cpk,
@@ -106,118 +222,329 @@ class SPCService:
                 task.process,
                 use_reference_range
             )
-            
-            # 步骤4: 计算控制限
-            ref_center = None
-            if use_reference_range and ref_lower is not None and ref_upper is not None:
-                ref_center = (ref_lower + ref_upper) / 2
-            
-            control_limits = self.calculator.calculate(
-                tolerance=tolerance,
-                target_cpk=adjusted_target_cpk,
-                ref_center=ref_center
-            )
-            
-            # 步骤5: 生成SPC数据
-            spc_data = None
-            
-            # 根据难度评估动态设置尝试次数
-            if use_reference_range and ref_lower is not None and ref_upper is not None:
-                max_attempts = 20000  # 参考范围模式统一使用20000次
-                print(f"    难度评估: {difficulty}, 设置尝试次数: {max_attempts}")
-                
-                spc_data = self.reference_range_generator.generate(
-                    tolerance=tolerance,
-                    control_limits=control_limits,
-                    target_cpk=adjusted_target_cpk,
-                    resolution=task.resolution,
-                    ref_lower=ref_lower,
-                    ref_upper=ref_upper,
-                    max_attempts=max_attempts
-                )
-                
-                # 如果参考范围模式失败，自动尝试标准模式作为后备
-                if spc_data is None:
-                    print(f"    参考范围模式失败，自动尝试标准模式...")
-                    spc_data = self.standard_generator.generate(
-                        tolerance=tolerance,
-                        control_limits=control_limits,
-                        target_cpk=adjusted_target_cpk,
-                        resolution=task.resolution,
-                        max_attempts=max_attempts // 2
-                    )
-            else:
-                spc_data = self.standard_generator.generate(
-                    tolerance=tolerance,
-                    control_limits=control_limits,
-                    target_cpk=adjusted_target_cpk,
-                    resolution=task.resolution,
-                    max_attempts=4000
-                )
-            
-            if spc_data is None:
-                print(f"    警告: 未能生成SPC数据")
+        
+        # 可行性预检查：用闭式边界证明不可行的任务不进入生成循环
+        feasibility = self.feasibility_checker.check(
+            tolerance=tolerance,
+            target_cpk=adjusted_target_cpk,
+            resolution=task.resolution,
+            ref_lower=ref_lower,
+            ref_upper=ref_upper,
+            use_reference_range=use_reference_range
+        )
+        if not feasibility.feasible:
+            self._record_infeasible_task(task, month_num, workshop_name, feasibility)
+            if feasibility.action == 'skip':
+                print(f"    跳过: 任务不可行，不进行生成")
                 return None
+            print(f"    参考范围模式不可行，直接使用标准模式")
+        
+        # 步骤4: 计算控制限
+        ref_center = None
+        if use_reference_range and ref_lower is not None and ref_upper is not None:
+            ref_center = (ref_lower + ref_upper) / 2
+        
+        control_limits = self.calculator.calculate(
+            tolerance=tolerance,
+            target_cpk=adjusted_target_cpk,
+            ref_center=ref_center
+        )
+        
+        # 步骤5: 确定生成策略
+        # 根据接受概率表预测难度，选择生成策略和尝试次数
+        prediction = self.difficulty_evaluator.predict(
+            tolerance=tolerance,
+            control_limits=control_limits,
+            target_cpk=adjusted_target_cpk,
+            resolution=task.resolution,
+            ref_lower=ref_lower,
+            ref_upper=ref_upper,
+            use_reference_range=use_reference_range and feasibility.feasible
+        )
+        self._print_prediction(difficulty, prediction)
+        
+        # 模拟退火引擎：手动选择，或自动模式下难度为"高"时使用
+        use_annealing = (
+            use_reference_range and feasibility.feasible and
+            ref_lower is not None and ref_upper is not None and
+            (search_engine == 'annealing' or (search_engine == 'auto' and difficulty == "高"))
+        )
+        
+        if use_annealing:
+            print(f"    使用模拟退火搜索引擎")
+            strategy_order = ANNEALING_STRATEGY_ORDER
+        elif prediction.strategy == 'reference':
+            strategy_order = REFERENCE_STRATEGY_ORDER
+        else:
+            if prediction.redirect_reason is not None:
+                # 与可行性预检查转为标准模式的任务一样打印并记录，运行结束时汇总
+                self._record_infeasible_task(
+                    task, month_num, workshop_name,
+                    FeasibilityResult(action='redirect', reasons=[prediction.redirect_reason])
+                )
+                print(f"    参考范围模式几乎无法生成满足要求的数据，直接使用标准模式")
+            strategy_order = STANDARD_STRATEGY_ORDER
+        
+        return SPCJob(
+            task=task,
+            month_num=month_num,
+            year=year,
+            workshop_name=workshop_name,
+            template_path=template_path,
+            approver_info=approver_info,
+            tolerance=tolerance,
+            control_limits=control_limits,
+            adjusted_target_cpk=adjusted_target_cpk,
+            difficulty=difficulty,
+            max_attempts=prediction.max_attempts,
+            strategy_order=list(strategy_order),
+            use_reference_range=use_reference_range,
+            ref_lower=ref_lower,
+            ref_upper=ref_upper,
+            ref_center=ref_center,
+            output_dir=output_dir,
+            plan_file=plan_file
+        )
+    
+    def generate_data(self, job: SPCJob) -> Optional[SPCData]:
+        """
+        数据生成阶段：在当前进程中运行生成策略链
+        
+        Args:
+            job: 生成任务
             
-            print(f"    实际CPK: {spc_data.actual_cpk:.4f}")
-            
-            # 步骤6: 生成Excel文件
-            wb = self.excel_handler.load_template(template_path)
-            ws = wb.active
-            
-            # 填充基本信息
-            self.excel_handler.fill_basic_info(
-                ws, workshop_name, task.product_model, task.process,
-                task.theory, task.inspection_item, task.equipment_no,
-                tolerance, year, month_num
-            )
-            
-            # 设置参考中心（如果需要）
-            if use_reference_range and ref_center is not None:
-                self.worksheet_writer.set_reference_center(ws, ref_center, use_reference_range)
-            
-            # 填充测量数据
-            self.worksheet_writer.fill_measurement_data(ws, spc_data)
-            
-            # 填充审批人信息
-            from ..config.constants import MONTH_NAME_MAP
-            month_name = MONTH_NAME_MAP.get(month_num, f"{month_num}月")
-            self.worksheet_writer.fill_approver_info(ws, approver_info, year, month_num)
+        Returns:
+            生成的SPC数据，失败返回None
+        """
+        spc_data = self.run_strategy_chain(self.strategy_chain, job)
+        return spc_data if self.report_generation(self.strategy_chain.attempts_used, spc_data) else None
+    
+    @staticmethod
+    def run_strategy_chain(strategy_chain: GenerationStrategyChain, job: SPCJob) -> Optional[SPCData]:
+        """
+        运行生成策略链（也由流水线的生成子进程调用）
+        
+        Args:
+            strategy_chain: 生成策略链
+            job: 生成任务
             
-            # 恢复公式
-            self.formula_restorer.restore_formulas(
-                ws, tolerance, use_reference_range, ref_center
-            )
+        Returns:
+            生成的SPC数据，没有候选数据时返回None
+        """
+        # 所有策略共用一个尝试次数预算，参考范围模式失败时由策略链自动后备到标准模式
+        return strategy_chain.run(
+            order=job.strategy_order,
+            budget=job.max_attempts,
+            tolerance=job.tolerance,
+            control_limits=job.control_limits,
+            target_cpk=job.adjusted_target_cpk,
+            resolution=job.task.resolution,
+            ref_lower=job.ref_lower,
+            ref_upper=job.ref_upper,
+            fallback_strategies=FALLBACK_STRATEGIES
+        )
+    
+    @staticmethod
+    def report_generation(attempts_used: Dict[str, int], spc_data: Optional[SPCData]) -> bool:
+        """
+        打印数据生成结果
+        
+        Args:
+            attempts_used: 各策略已用尝试次数
+            spc_data: 生成的SPC数据
             
-            # 调整图表
-            self.chart_adjuster.adjust_chart_axes(ws, control_limits)
+        Returns:
+            是否生成了数据
+        """
+        attempts_text = ", ".join(
+            f"{name} {attempts}次" for name, attempts in attempts_used.items()
+        )
+        print(f"    已用尝试次数: {attempts_text}")
+        
+        if spc_data is None:
+            print(f"    警告: 未能生成SPC数据")
+            return False
+        
+        print(f"    实际CPK: {spc_data.actual_cpk:.4f}")
+        return True
+    
+    def render_job(self, job: SPCJob, spc_data: SPCData) -> Tuple[str, float, str, float]:
+        """
+        渲染保存阶段：填充工作表并保存文件（可在多个线程中同时执行）
+        
+        Args:
+            job: 生成任务
+            spc_data: 生成的SPC数据
             
-            # 生成文件名
-            output_filename = self._generate_filename(
-                task, month_name, use_reference_range and ref_lower is not None and ref_upper is not None
+        Returns:
+            (文件路径, 调整后的目标CPK, 难度, 实际CPK) 元组
+        """
+        task = job.task
+        
+        # 步骤6: 生成Excel文件
+        # 公式已预编译到模板变体中（按公差类型和中心来源），任务只写入数据
+        variant = self.formula_restorer.get_variant(job.tolerance, job.use_reference_range, job.ref_center)
+        variant_formulas = self.formula_restorer.get_formulas(variant)
+        
+        # xml/xlsxwriter写入方式和月度工作簿只记录单元格，保存时修改模板XML或按模板版式重新生成；
+        # openpyxl方式加载模板变体副本
+        wb = None
+        if self.output_mode == 'monthly' or self.output_writer in ('xml', 'xlsxwriter'):
+            ws = CellMap()
+        else:
+            wb = self.excel_handler.load_template(job.template_path, variant, variant_formulas)
+            ws = wb.active
+        
+        # 填充基本信息
+        self.excel_handler.fill_basic_info(
+            ws, job.workshop_name, task.product_model, task.process,
+            task.theory, task.inspection_item, task.equipment_no,
+            job.tolerance, job.year, job.month_num
+        )
+        
+        # 设置参考中心（如果需要）
+        if job.use_reference_range and job.ref_center is not None:
+            self.worksheet_writer.set_reference_center(ws, job.ref_center, job.use_reference_range)
+        
+        # 填充测量数据
+        self.worksheet_writer.fill_measurement_data(ws, spc_data)
+        
+        # 填充审批人信息
+        month_name = MONTH_NAME_MAP.get(job.month_num, f"{job.month_num}月")
+        self.worksheet_writer.fill_approver_info(ws, job.approver_info, job.year, job.month_num)
+        
+        # 调整图表（xml/xlsxwriter写入方式在保存时设置坐标轴范围）
+        if wb is not None:
+            self.chart_adjuster.adjust_chart_axes(ws, job.control_limits)
+        
+        result_tail = (job.adjusted_target_cpk, job.difficulty, spc_data.actual_cpk)
+        
+        # 月度工作簿：写入当月工作簿的一个工作表
+        if self.output_mode == 'monthly':
+            output_filename = self._add_to_monthly_workbook(
+                task, job.month_num, month_name, job.workshop_name, job.template_path,
+                job.use_reference_range, job.output_dir, ws,
+                self.chart_adjuster.calculate_axis_ranges(job.control_limits), variant_formulas
             )
-            
-            # 保存文件
-            wb.save(output_filename)
-            wb.close()
-            
+            return (output_filename,) + result_tail
+        
+        # 生成文件名
+        output_filename = self._generate_filename(
+            task, month_name, job.use_reference_range and job.ref_lower is not None and job.ref_upper is not None,
+            job.output_dir
+        )
+        
+        # 保存文件（先写入临时文件，完成后原子替换）
+        with self.output_registry.write(output_filename) as temp_path:
+            if wb is not None:
+                wb.save(temp_path)
+                wb.close()
+            else:
+                writer = self.xlsx_backend if self.output_writer == 'xlsxwriter' else self.xml_patcher
+                writer.save(
+                    job.template_path, ws, temp_path,
+                    axis_ranges=self.chart_adjuster.calculate_axis_ranges(job.control_limits),
+                    variant=variant,
+                    variant_cells=variant_formulas
+                )
+        
+        with self.console_lock:
             print(f"    已保存: {output_filename}")
+        
+        return (output_filename,) + result_tail
+    
+    def close_monthly_workbook(self, month_num: Optional[int] = None) -> List[str]:
+        """
+        保存月度工作簿（每个月份处理完后调用）
+        
+        Args:
+            month_num: 月份（各输出目录中该月份的工作簿），None表示保存全部已打开的月度工作簿
+        
+        Returns:
+            保存的文件路径列表
+        """
+        with self._monthly_lock:
+            keys = sorted(key for key in self._monthly_writers if month_num is None or key[1] == month_num)
+            saved = []
+            for key in keys:
+                writer = self._monthly_writers.pop(key)
+                output_path = writer.close()
+                if output_path:
+                    print(f"  已保存月度工作簿: {output_path} ({writer.sheet_count}个工作表)")
+                    saved.append(output_path)
+            return saved
+    
+    def _add_to_monthly_workbook(
+        self,
+        task: Task,
+        month_num: int,
+        month_name: str,
+        workshop_name: str,
+        template_path: str,
+        use_reference_range: bool,
+        output_dir: str,
+        cell_map: CellMap,
+        axis_ranges: Dict[str, Tuple[float, float]],
+        variant_cells: Dict[str, object]
+    ) -> str:
+        """将任务写入当月工作簿（当月第一个任务时新建，各月份工作簿可同时打开）"""
+        with self._monthly_lock:
+            writer = self._monthly_writers.get((output_dir, month_num))
+            if writer is None:
+                safe_workshop = self.file_utils.sanitize_filename(workshop_name, 20)
+                mode_suffix = "_参考范围" if use_reference_range else ""
+                from ..excel.monthly_workbook_writer import MonthlyWorkbookWriter
+                writer = MonthlyWorkbookWriter(self.xlsx_backend)
+                writer.open(template_path, self.output_registry.reserve(
+                    f"{month_name}{safe_workshop}{mode_suffix}_SPC.xlsx", output_dir
+                ))
+                self._monthly_writers[(output_dir, month_num)] = writer
             
-            return output_filename, adjusted_target_cpk, difficulty, spc_data.actual_cpk
-            
-        except Exception as e:
-            print(f"    错误: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
+            sheet_name = writer.add_sheet(
+                f"{task.product_model}{task.process}{task.inspection_item}",
+                cell_map, axis_ranges, variant_cells
+            )
+        with self.console_lock:
+            print(f"    已写入工作表: {sheet_name} ({writer.output_path})")
+        return writer.output_path
+    
+    def _record_infeasible_task(self, task: Task, month_num: int, workshop_name: str, feasibility: FeasibilityResult):
+        """打印并记录不可行（可行性预检查或难度预测判定）的任务"""
+        for reason in feasibility.reasons:
+            print(f"    不可行: {reason}")
+        
+        self.infeasible_tasks.append({
+            'month': month_num,
+            'workshop_name': workshop_name,
+            'product_model': task.product_model,
+            'process': task.process,
+            'inspection_item': task.inspection_item,
+            'action': feasibility.action,
+            'reasons': list(feasibility.reasons)
+        })
+    
+    def _print_prediction(self, difficulty: str, prediction: DifficultyPrediction):
+        """打印难度预测结果"""
+        if prediction.acceptance_probability is None:
+            print(f"    难度评估: {difficulty}, 设置尝试次数: {prediction.max_attempts}")
+            return
+        
+        expected_attempts = prediction.expected_attempts
+        expected_seconds = prediction.expected_seconds
+        expected_text = f"{expected_attempts:.0f}次" if expected_attempts is not None else "无法估计"
+        seconds_text = f"{expected_seconds:.2f}秒" if expected_seconds is not None else "无法估计"
+        print(f"    难度评估: {difficulty}, 接受概率: {prediction.acceptance_probability:.4f}, "
+              f"预计尝试: {expected_text}, 预计耗时: {seconds_text}")
+        print(f"    生成策略: {prediction.strategy}, 设置尝试次数: {prediction.max_attempts}")
     
     def _generate_filename(
         self,
         task: Task,
         month_name: str,
-        use_reference_range: bool
+        use_reference_range: bool,
+        output_dir: str = "."
     ) -> str:
-        """生成文件名"""
+        """生成输出文件路径（输出目录中不重复的文件名）"""
         safe_product_model = self.file_utils.sanitize_filename(task.product_model, 50)
         safe_process = self.file_utils.sanitize_filename(task.process, 20)
         safe_inspection_item = self.file_utils.sanitize_filename(task.inspection_item, 20)
@@ -232,7 +559,8 @@ class SPCService:
         mode_suffix = "_参考范围" if use_reference_range else ""
         base_filename = f"{month_name}{safe_product_model}{safe_process}{safe_inspection_item}{mode_suffix}_SPC.xlsx"
         
-        return self.file_utils.ensure_unique_filename(base_filename)
+        # 多个渲染线程同时保存时，已分配但尚未写入磁盘的文件名也视为已存在
+        return self.output_registry.reserve(base_filename, output_dir)
     
     def _check_and_adjust_target_cpk(
         self,
@@ -1,12 +1,14 @@
 """工具模块"""
 
 from .file_utils import FileUtils
+from .output_registry import OutputRegistry
 from .date_utils import DateUtils
 from .validation_utils import ValidationUtils
 from .logger import SPCLogger, setup_logging, get_logger, get_log_file_path
 
 __all__ = [
     'FileUtils',
+    'OutputRegistry',
     'DateUtils',
     'ValidationUtils',
     'SPCLogger',
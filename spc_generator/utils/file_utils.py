@@ -1,5 +1,6 @@
 """文件工具"""
 
+import glob
 import os
 import sys
 import re
@@ -77,8 +78,34 @@ class FileUtils:
         spc_plan_files = [f for f in files if 'spc推进计划' in f.lower() and f.endswith('.xlsx')]
         if not spc_plan_files:
             spc_plan_files = [f for f in files if '推进计划' in f.lower() and f.endswith('.xlsx')]
+        # 优先使用原计划文件（更新后的计划文件在生成过程中就会写出）
+        spc_plan_files.sort(key=lambda f: '_已更新' in f)
         return spc_plan_files[0] if spc_plan_files else None
     
+    @staticmethod
+    def find_plan_files(patterns: List[str]) -> List[str]:
+        """
+        按目录或通配符查找多个计划文件（批量运行）
+        
+        Args:
+            patterns: 目录（查找其中的推进计划文件）或文件通配符，如 "计划/*.xlsx"
+            
+        Returns:
+            计划文件路径列表（去重、排序，不含更新后的计划文件和Excel临时文件）
+        """
+        plan_files = []
+        for pattern in patterns:
+            if os.path.isdir(pattern):
+                matches = [os.path.join(pattern, f) for f in os.listdir(pattern) if '推进计划' in f.lower()]
+            else:
+                matches = glob.glob(pattern)
+            for path in matches:
+                filename = os.path.basename(path)
+                if (os.path.isfile(path) and filename.endswith('.xlsx')
+                        and '_已更新' not in filename and not filename.startswith('~$')):
+                    plan_files.append(os.path.normpath(path))
+        return sorted(set(plan_files))
+    
     @staticmethod
     def find_spc_template_file(directory: str = ".") -> Optional[str]:
         """查找SPC模板文件"""
@@ -135,25 +162,3 @@ class FileUtils:
         if len(safe_text) > max_length:
             safe_text = safe_text[:max_length]
         return safe_text
-    
-    @staticmethod
-    def ensure_unique_filename(base_filename: str, directory: str = ".") -> str:
-        """
-        确保文件名唯一（如果存在则添加序号）
-        
-        Args:
-            base_filename: 基础文件名
-            directory: 目录路径
-            
-        Returns:
-            唯一的文件名
-        """
-        if not os.path.exists(os.path.join(directory, base_filename)):
-            return base_filename
-        
-        base_name, ext = os.path.splitext(base_filename)
-        counter = 1
-        while os.path.exists(os.path.join(directory, f"{base_name}_{counter}{ext}")):
-            counter += 1
-        
-        return f"{base_name}_{counter}{ext}"
@@ -0,0 +1,149 @@
+"""输出文件名登记 - 进程内分配不重复的文件名，并以临时文件+原子替换的方式写入"""
+
+import os
+import stat
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Set
+
+
+def _read_umask() -> int:
+    """读取进程的umask（os.umask只能在设置的同时读取，读取后立即恢复）"""
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# 进程的umask（导入时读取一次，之后不再修改umask，避免与其他线程创建文件时冲突）
+_UMASK = _read_umask()
+
+class OutputRegistry:
+    """
+    输出文件名登记
+
+    每个输出目录只在第一次使用时列出一次已有文件，之后在内存中分配不重复的文件名
+    （不再逐个序号检查文件是否存在），多个线程同时分配时由锁保证不会得到相同的文件名。
+    文件先写入同目录下独占创建的临时文件，写完后用os.replace原子替换为目标文件，
+    中途出错或程序中断不会留下不完整的输出文件。
+    """
+
+    TEMP_SUFFIX = '.tmp'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # 目录绝对路径 -> 已存在或已分配的文件名（小写，Windows文件名不区分大小写）
+        self._names: Dict[str, Set[str]] = {}
+
+    def reserve(self, base_filename: str, directory: str = ".") -> str:
+        """
+        分配不重复的输出文件路径（重名时添加序号）
+
+        Args:
+            base_filename: 基础文件名
+            directory: 输出目录
+
+        Returns:
+            输出文件路径
+        """
+        with self._lock:
+            names = self._directory_names(directory)
+            filename = base_filename
+            base_name, ext = os.path.splitext(base_filename)
+            counter = 1
+            while filename.lower() in names:
+                filename = f"{base_name}_{counter}{ext}"
+                counter += 1
+            names.add(filename.lower())
+        return os.path.join(directory, filename)
+
+    def release(self, output_path: str):
+        """
+        释放已分配但未写入的文件名
+
+        Args:
+            output_path: reserve返回的输出文件路径
+        """
+        directory, filename = os.path.split(output_path)
+        with self._lock:
+            self._directory_names(directory or ".").discard(filename.lower())
+
+    @contextmanager
+    def write(self, output_path: str) -> Iterator[str]:
+        """
+        原子写入：提供临时文件路径，正常结束时替换为目标文件，出错时删除临时文件并释放文件名
+
+        Args:
+            output_path: 输出文件路径
+
+        Yields:
+            临时文件路径
+        """
+        temp_path = self.create_temp_file(output_path)
+        try:
+            yield temp_path
+            self.commit(temp_path, output_path)
+        except BaseException:
+            self.discard(temp_path)
+            self.release(output_path)
+            raise
+
+    @classmethod
+    def create_temp_file(cls, output_path: str) -> str:
+        """
+        在目标文件所在目录中独占创建临时文件（同一文件系统，保证可以原子替换）
+
+        Args:
+            output_path: 输出文件路径
+
+        Returns:
+            临时文件路径
+        """
+        directory, filename = os.path.split(output_path)
+        fd, temp_path = tempfile.mkstemp(prefix=f".{filename}.", suffix=cls.TEMP_SUFFIX, dir=directory or ".")
+        os.close(fd)
+        return temp_path
+
+    @staticmethod
+    def commit(temp_path: str, output_path: str):
+        """
+        将写完的临时文件原子替换为目标文件
+
+        mkstemp创建的临时文件权限为0600，替换前改为与直接创建文件相同的权限（0666去掉umask），
+        覆盖已有文件时保留原文件的权限。
+
+        Args:
+            temp_path: 临时文件路径
+            output_path: 输出文件路径
+        """
+        try:
+            mode = stat.S_IMODE(os.stat(output_path).st_mode)
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, output_path)
+
+    @staticmethod
+    def discard(temp_path: str):
+        """
+        删除临时文件
+
+        Args:
+            temp_path: 临时文件路径
+        """
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+    def _directory_names(self, directory: str) -> Set[str]:
+        """目录中已存在或已分配的文件名（第一次使用时列出目录）"""
+        key = os.path.abspath(directory)
+        names = self._names.get(key)
+        if names is None:
+            try:
+                names = {name.lower() for name in os.listdir(key)}
+            except FileNotFoundError:
+                names = set()
+            self._names[key] = names
+        return names
@@ -2,11 +2,16 @@
 
 import re
 from typing import Optional
+import numpy as np
+import pandas as pd
 
 
 class ValidationUtils:
     """验证工具类"""
     
+    # 普通数值写法（可选正负号、最多一个小数点的ASCII数字）
+    PLAIN_NUMBER_PATTERN = re.compile(r'[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)')
+    
     @staticmethod
     def safe_float_convert(value) -> Optional[float]:
         """
@@ -63,6 +68,25 @@ class ValidationUtils:
         except ValueError:
             return None
     
+    @classmethod
+    def plain_float_column(cls, values: pd.Series) -> np.ndarray:
+        """
+        把一列数值字符串转换为浮点数数组（批量解析用）
+        
+        只转换普通数值写法，这些值的结果与safe_float_convert相同；
+        其他写法（多个小数点、全角数字等）和缺失值为NaN，由调用方按逐个解析的方式处理。
+        
+        Args:
+            values: 字符串列（可以含NaN）
+            
+        Returns:
+            浮点数数组
+        """
+        result = np.full(len(values), np.nan)
+        plain = values.str.fullmatch(cls.PLAIN_NUMBER_PATTERN, na=False).to_numpy(dtype=bool)
+        result[plain] = values[plain].astype(float).to_numpy()
+        return result
+    
     @staticmethod
     def is_valid_name(text: str) -> bool:
         """